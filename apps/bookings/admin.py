@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+from apps.common.admin import SoftDeleteAdminMixin
 from .models import Booking
 
 
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
+class BookingAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
     """Admin interface for managing Booking instances.
 
     Provides list display with tenant/listing info, filtering by status and dates,
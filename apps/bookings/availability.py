@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils.translation import gettext_lazy as _
+
+from apps.common.cache import invalidate_cache_versions
+from apps.listings.cache import AVAILABILITY_VERSION
+from .models import BookedNight
+
+# Booking statuses that occupy the listing's calendar
+# Статусы бронирования, занимающие календарь объявления
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+# Booking fields whose change requires re-syncing its nights
+# Поля бронирования, изменение которых требует пересчёта занятых ночей
+CALENDAR_FIELDS = {"listing", "start_date", "end_date", "status", "is_deleted"}
+
+
+def booking_nights(start_date, end_date):
+    """Return the nights of a stay: from check-in up to, not including, check-out."""
+    # Возвращает ночи проживания: от даты заезда до даты выезда (не включая её)
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days)]
+
+
+def sync_booked_nights(booking):
+    """Make the booking's rows in the availability calendar match its current state.
+
+    Raises ``ValidationError`` if another booking already holds one of the
+    nights (the unique constraint caught a race the overlap check missed).
+    """
+    # Приводит занятые ночи бронирования в соответствие с его текущим состоянием
+    invalidate_cache_versions(AVAILABILITY_VERSION)
+    BookedNight.objects.filter(booking=booking).delete()
+    if booking.status in ACTIVE_STATUSES and not booking.is_deleted:
+        try:
+            with transaction.atomic():
+                BookedNight.objects.bulk_create([
+                    BookedNight(listing_id=booking.listing_id, night=night, booking=booking)
+                    for night in booking_nights(booking.start_date, booking.end_date)
+                ])
+        except IntegrityError as e:
+            raise ValidationError(
+                _("This property is already booked for the selected dates.")  # Это жильё уже забронировано на выбранные даты.
+            ) from e
+
+
+def rebuild_booked_nights(bookings, batch_size=1000):
+    """Re-create the calendar rows of a booking queryset in bulk (no signals).
+
+    One ``DELETE`` drops the bookings' nights, then the nights of the active
+    ones are inserted in batches. Raises ``ValidationError`` if another
+    booking holds one of the nights.
+    """
+    # Массово пересоздаёт занятые ночи бронирований из queryset (без сигналов)
+    invalidate_cache_versions(AVAILABILITY_VERSION)
+    BookedNight.objects.filter(booking_id__in=bookings.values("pk")).delete()
+    active = bookings.filter(status__in=ACTIVE_STATUSES, is_deleted=False).order_by().values_list(
+        "pk", "listing_id", "start_date", "end_date"
+    )
+    try:
+        with transaction.atomic():
+            nights = []
+            for booking_id, listing_id, start_date, end_date in active.iterator(chunk_size=batch_size):
+                nights.extend(
+                    BookedNight(listing_id=listing_id, night=night, booking_id=booking_id)
+                    for night in booking_nights(start_date, end_date)
+                )
+                if len(nights) >= batch_size:
+                    BookedNight.objects.bulk_create(nights)
+                    nights = []
+            BookedNight.objects.bulk_create(nights)
+    except IntegrityError as e:
+        raise ValidationError(
+            _("This property is already booked for the selected dates.")  # Это жильё уже забронировано на выбранные даты.
+        ) from e
+
+
+def release_booked_nights(booking_ids):
+    """Free the nights of bookings moved out of an active status in bulk (no signals).
+
+    ``booking_ids`` is a list of ids or a ``values("pk")`` subquery.
+    """
+    # Освобождает ночи бронирований, массово переведённых в неактивный статус (без сигналов)
+    invalidate_cache_versions(AVAILABILITY_VERSION)
+    return BookedNight.objects.filter(booking_id__in=booking_ids).delete()[0]
+
+
+def occupied_nights(listing, start_date, end_date, exclude_booking_id=None):
+    """Return booked nights of a listing within [start_date, end_date)."""
+    # Возвращает занятые ночи объявления в интервале [start_date, end_date)
+    nights = BookedNight.objects.filter(listing=listing, night__gte=start_date, night__lt=end_date)
+    if exclude_booking_id:
+        nights = nights.exclude(booking_id=exclude_booking_id)
+    return nights
+
+
+def exclude_occupied(queryset, start_date, end_date):
+    """Filter a listing queryset down to listings free for the whole stay (one anti-join)."""
+    # Оставляет объявления, свободные на весь период (один анти-джойн)
+    return queryset.exclude(Exists(occupied_nights(OuterRef("pk"), start_date, end_date)))
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:10
+
+import django.db.models.deletion
+from datetime import timedelta
+from django.db import migrations, models
+
+
+def backfill_booked_nights(apps, schema_editor):
+    """Fill the calendar from existing pending and confirmed bookings."""
+    # Заполняет календарь по существующим ожидающим и подтверждённым бронированиям
+    Booking = apps.get_model("bookings", "Booking")
+    BookedNight = apps.get_model("bookings", "BookedNight")
+    bookings = Booking.objects.filter(status__in=["pending", "confirmed"], is_deleted=False)
+    nights = []
+    for booking in bookings.iterator():
+        for offset in range((booking.end_date - booking.start_date).days):
+            nights.append(BookedNight(
+                listing_id=booking.listing_id,
+                night=booking.start_date + timedelta(days=offset),
+                booking_id=booking.pk,
+            ))
+    # Legacy data may contain overlaps: the first booking keeps the night
+    # Старые данные могут пересекаться: ночь остаётся за первым бронированием
+    BookedNight.objects.bulk_create(nights, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0004_alter_booking_total_price"),
+        ("listings", "0007_listing_city_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookedNight",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("night", models.DateField(verbose_name="Night")),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="nights",
+                        to="bookings.booking",
+                        verbose_name="Booking",
+                    ),
+                ),
+                (
+                    "listing",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="booked_nights",
+                        to="listings.listing",
+                        verbose_name="Listing",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Booked night",
+                "verbose_name_plural": "Booked nights",
+                "constraints": [
+                    models.UniqueConstraint(fields=("listing", "night"), name="unique_listing_night"),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_booked_nights, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_bookednight"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(fields=["tenant", "is_deleted", "-created_at"], name="booking_tenant_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(fields=["listing", "is_deleted", "-created_at"], name="booking_listing_created_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_booking_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(fields=["status", "end_date"], name="booking_status_end_idx"),
+        ),
+    ]
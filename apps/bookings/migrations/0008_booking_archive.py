@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:30
+
+import apps.common.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0007_booking_status_end_idx"),
+        ("listings", "0009_listing_archive"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["tenant", "-created_at"],
+                name="booking_live_tenant_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["listing", "-created_at"],
+                name="booking_live_listing_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["updated_at"],
+                name="booking_deleted_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="BookingArchive",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(verbose_name="Created at")),
+                ("updated_at", models.DateTimeField(verbose_name="Updated at")),
+                ("is_deleted", models.BooleanField(default=False, verbose_name="Soft deleted")),
+                ("listing", models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name="+", to="listings.listing", verbose_name="Listing")),
+                ("tenant", models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name="+", to=settings.AUTH_USER_MODEL, verbose_name="Tenant")),
+                ("start_date", models.DateField(validators=[apps.common.validators.validate_future_date], verbose_name="Start date")),
+                ("end_date", models.DateField(verbose_name="End date")),
+                ("check_in_time", models.TimeField(default="14:00", verbose_name="Check-in time")),
+                ("check_out_time", models.TimeField(default="12:00", verbose_name="Check-out time")),
+                ("total_price", models.DecimalField(decimal_places=2, editable=False, max_digits=10, verbose_name="Total price")),
+                ("status", models.CharField(choices=[("pending", "Pending"), ("confirmed", "Confirmed"), ("cancelled", "Cancelled"), ("completed", "Completed")], default="pending", max_length=20, verbose_name="Status")),
+            ],
+            options={
+                "db_table": "bookings_booking_archive",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0008_booking_archive"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="booking",
+            name="booking_tenant_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="booking",
+            name="booking_listing_created_idx",
+        ),
+    ]
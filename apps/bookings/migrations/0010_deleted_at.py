@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:15
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_deleted_at(apps, schema_editor):
+    """Take the deletion time of already deleted rows from their updated_at."""
+    # Заполняет время удаления уже удалённых строк из updated_at
+    for name in ("Booking", "BookingArchive"):
+        model = apps.get_model("bookings", name)
+        model.objects.filter(is_deleted=True).update(deleted_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0009_remove_duplicate_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="booking",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Deleted at"),
+        ),
+        migrations.AddField(
+            model_name="bookingarchive",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Deleted at"),
+        ),
+        migrations.RunPython(fill_deleted_at, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="booking",
+            name="booking_deleted_idx",
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["deleted_at"],
+                name="booking_deleted_idx",
+            ),
+        ),
+    ]
@@ -1,9 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
-from apps.common.models import BaseModel
+from apps.common.models import BaseModel, make_archive_model
 from apps.listings.models import Listing
 from apps.bookings.choices import BOOKING_STATUS_CHOICES
 from apps.common.validators import (
@@ -63,6 +63,8 @@ class Booking(BaseModel):
         default='pending'
     )
 
+    soft_delete_cascade = ('review',)
+
     def clean(self):
         """Performs business logic validation before saving the booking.
 
@@ -107,6 +109,11 @@ class Booking(BaseModel):
         Automatically recalculates total_price if start_date or end_date changes.
         Runs full_clean() unless skip_validation=True is passed.
 
+        Validation, the insert and the booked-nights calendar update run in one
+        transaction. A new booking first locks its listing row, so concurrent
+        bookings of one listing are checked for overlaps one at a time; the
+        unique (listing, night) constraint is the final guard.
+
         Args:
             skip_validation (bool): if True, skips model validation (default: False).
             *args: positional arguments passed to parent save().
@@ -115,25 +122,93 @@ class Booking(BaseModel):
         # Сохраняет бронирование; пересчитывает total_price при изменении дат; запускает валидацию
 
         skip_validation = kwargs.pop('skip_validation', False)
-        if not skip_validation:
-            self.full_clean()
-
-        should_recalculate = (
-            self.pk is None or
-            (kwargs.get('update_fields') and
-             any(f in kwargs['update_fields'] for f in ['start_date', 'end_date']))
-        )
-        if should_recalculate:
-            days = (self.end_date - self.start_date).days
-            self.total_price = self.listing.price * days
-
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if self.pk is None:
+                # Serialize bookings of the same listing: overlap check and insert under one row lock
+                # Бронирования одного объявления идут по очереди: проверка пересечений и вставка под блокировкой строки
+                self.listing = Listing.all_objects.select_for_update().get(pk=self.listing_id)
+            if not skip_validation:
+                self.full_clean()
+
+            should_recalculate = (
+                self.pk is None or
+                (kwargs.get('update_fields') and
+                 any(f in kwargs['update_fields'] for f in ['start_date', 'end_date']))
+            )
+            if should_recalculate:
+                days = (self.end_date - self.start_date).days
+                self.total_price = self.listing.price * days
+
+            super().save(*args, **kwargs)
 
     class Meta:
         verbose_name = _('Booking')  # Бронирование
         verbose_name_plural = _('Bookings')  # Бронирования
         ordering = ['-created_at']
+        indexes = [
+            # Completion sweep: confirmed bookings by end date
+            # Автозавершение: подтверждённые бронирования по дате окончания
+            models.Index(fields=['status', 'end_date'], name='booking_status_end_idx'),
+            # Booking lists of a tenant and of a landlord's listings, newest first, live rows only
+            # Списки бронирований арендатора и объявлений арендодателя, сначала новые, без удалённых
+            models.Index(
+                fields=['tenant', '-created_at'],
+                condition=models.Q(is_deleted=False),
+                name='booking_live_tenant_idx',
+            ),
+            models.Index(
+                fields=['listing', '-created_at'],
+                condition=models.Q(is_deleted=False),
+                name='booking_live_listing_idx',
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(is_deleted=True),
+                name='booking_deleted_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Booking by {self.tenant.email} for {self.listing.title} ({self.start_date}–{self.end_date})"
-        # Бронь {self.tenant.email} на {self.listing.title} ({self.start_date}–{self.end_date})
\ No newline at end of file
+        # Бронь {self.tenant.email} на {self.listing.title} ({self.start_date}–{self.end_date})
+
+
+class BookedNight(models.Model):
+    """One occupied night of a listing, held by a pending or confirmed booking.
+
+    A denormalized availability calendar kept in sync with ``Booking`` by
+    signals; the unique (listing, night) index answers "is this listing free
+    from X to Y" with a single index probe.
+    """
+    # Занятая ночь объявления (по ожидающему или подтверждённому бронированию) — календарь доступности
+
+    listing = models.ForeignKey(
+        Listing,
+        on_delete=models.CASCADE,
+        verbose_name=_('Listing'),  # Объявление
+        related_name='booked_nights'
+    )
+    night = models.DateField(
+        _('Night')  # Ночь
+    )
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.CASCADE,
+        verbose_name=_('Booking'),  # Бронирование
+        related_name='nights'
+    )
+
+    class Meta:
+        verbose_name = _('Booked night')  # Занятая ночь
+        verbose_name_plural = _('Booked nights')  # Занятые ночи
+        constraints = [
+            models.UniqueConstraint(fields=['listing', 'night'], name='unique_listing_night'),
+        ]
+
+    def __str__(self):
+        return f"{self.listing_id} @ {self.night}: {self.booking_id}"
+
+
+# Long soft-deleted bookings, moved out by the archive_deleted command
+# Давно мягко удалённые бронирования, переносятся командой archive_deleted
+BookingArchive = make_archive_model(Booking)
@@ -1,12 +1,12 @@
 from typing import Any, Dict
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from .models import Booking
 from apps.common.validators import (
     validate_not_own_listing,
-    validate_no_overlapping_booking,
     validate_end_date_after_start,
     validate_booking_duration,
 )
@@ -54,8 +54,10 @@ class BookingSerializer(serializers.ModelSerializer):
         - user is authenticated,
         - end date > start date,
         - booking duration within limits,
-        - user is not booking own listing,
-        - no overlapping bookings exist.
+        - user is not booking own listing.
+
+        Overlapping bookings are checked once, by ``Booking.save()``, under a
+        lock on the listing (see ``create``).
 
         Args:
             data: validated input data.
@@ -66,7 +68,7 @@ class BookingSerializer(serializers.ModelSerializer):
         Raises:
             serializers.ValidationError: if any rule is violated.
         """
-        # Валидация бронирования: авторизация, даты, длительность, запрет бронирования своего жилья, отсутствие пересечений
+        # Валидация бронирования: авторизация, даты, длительность, запрет бронирования своего жилья
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             raise serializers.ValidationError(_("Authentication required."))  # Требуется авторизация.
@@ -79,7 +81,6 @@ class BookingSerializer(serializers.ModelSerializer):
         validate_end_date_after_start(start, end)
         validate_booking_duration(start, end)
         validate_not_own_listing(user, listing)
-        validate_no_overlapping_booking(listing, start, end)
 
         return data
 
@@ -87,4 +88,29 @@ class BookingSerializer(serializers.ModelSerializer):
         """Create a new booking with tenant set from the current request user."""
         # Создаёт новое бронирование с арендатором из контекста запроса
         validated_data["tenant"] = self.context["request"].user
-        return super().create(validated_data)
\ No newline at end of file
+        try:
+            return super().create(validated_data)
+        except DjangoValidationError as e:
+            # Overlap found by the model under the listing lock
+            # Пересечение найдено моделью под блокировкой объявления
+            raise serializers.ValidationError(serializers.as_serializer_error(e))
+
+
+class BookingBulkActionSerializer(serializers.Serializer):
+    """Input for bulk confirm/reject: a list of booking IDs."""
+    # Входные данные для массового подтверждения/отклонения: список ID бронирований
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=100,
+    )
+
+
+class BookingBulkResultSerializer(serializers.Serializer):
+    """Per-booking outcome of a bulk action: the new status or an error."""
+    # Результат массового действия по каждому бронированию: новый статус или ошибка
+
+    id = serializers.IntegerField()
+    status = serializers.CharField(required=False)
+    error = serializers.CharField(required=False)
@@ -0,0 +1,32 @@
+from typing import Any
+from django.db.models import QuerySet
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.common.models import soft_delete_changed
+from .availability import CALENDAR_FIELDS, rebuild_booked_nights, release_booked_nights, sync_booked_nights
+from .models import Booking
+
+
+@receiver(post_save, sender=Booking)
+def sync_availability_calendar(sender: Any, instance: Booking, **kwargs: Any) -> None:
+    """Keep the booked-nights calendar in sync with booking dates and status."""
+    # Синхронизирует календарь занятых ночей с датами и статусом бронирования
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not CALENDAR_FIELDS.intersection(update_fields):
+        return
+    sync_booked_nights(instance)
+
+
+@receiver(soft_delete_changed, sender=Booking)
+def sync_calendar_on_bulk_soft_delete(sender: Any, queryset: QuerySet, deleted: bool, **kwargs: Any) -> None:
+    """Free the nights of bulk-deleted bookings, take them again for restored active ones.
+
+    Restoring a booking whose nights were taken in the meantime raises
+    ``ValidationError`` and rolls the whole restore back.
+    """
+    # Освобождает ночи массово удалённых бронирований и снова занимает их при восстановлении
+    if deleted:
+        release_booked_nights(queryset.values("pk"))
+    else:
+        rebuild_booked_nights(queryset)
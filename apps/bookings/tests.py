@@ -1,11 +1,21 @@
-from django.test import TestCase
+import threading
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth.models import Group
+from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
+from apps.common.models import OutboxEmail
+from apps.common.testing import QueryCountAssertionsMixin
 from apps.users.models import User
 from apps.listings.models import Listing
-from .models import Booking
+from .models import BookedNight, Booking
 
 
 class BookingTests(APITestCase):
@@ -82,4 +92,401 @@ class BookingTests(APITestCase):
         response = self.client.post('/api/v1/bookings/', data)
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertEqual(Booking.objects.count(), 0)
\ No newline at end of file
+        self.assertEqual(Booking.objects.count(), 0)
+
+
+class BookingListTests(APITestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        self.listing = Listing.objects.create(
+            owner=self.landlord, title="Уютная квартира", description="Рядом с парком",
+            city="Berlin", price=1200.00, rooms=2, housing_type='apartment'
+        )
+
+    def test_list_bookings_paginated_for_both_roles(self):
+        """Список бронирований доступен арендатору и арендодателю, с курсорной пагинацией."""
+        booking = Booking(
+            listing=self.listing,
+            tenant=self.tenant,
+            start_date=timezone.now().date() + timezone.timedelta(days=5),
+            end_date=timezone.now().date() + timezone.timedelta(days=7),
+        )
+        booking.save()
+
+        for user in (self.tenant, self.landlord):
+            self.client.force_authenticate(user=user)
+            response = self.client.get(reverse('booking-list'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([item['id'] for item in response.data['results']], [booking.id])
+
+
+class BookingListFilterTests(QueryCountAssertionsMixin, APITestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        self.own = Listing.objects.create(
+            owner=self.landlord, title="Own", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+        # The landlord also travels: a booking of someone else's listing
+        self.other = Listing.objects.create(
+            owner=self.tenant, title="Other", description="У озера",
+            city="Potsdam", price=100, rooms=1, housing_type='studio'
+        )
+        self.today = timezone.now().date()
+        self.incoming = self.book(self.own, self.tenant, 10)
+        self.outgoing = self.book(self.other, self.landlord, 30)
+        self.incoming_count = 1
+
+    def book(self, listing, tenant, offset, nights=2):
+        booking = Booking(
+            listing=listing, tenant=tenant,
+            start_date=self.today + timezone.timedelta(days=offset),
+            end_date=self.today + timezone.timedelta(days=offset + nights),
+        )
+        booking.save()
+        return booking
+
+    def ids(self, **params):
+        self.client.force_authenticate(user=self.landlord)
+        response = self.client.get(reverse('booking-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['id'] for item in response.data['results']}
+
+    def test_role_filter(self):
+        self.assertEqual(self.ids(), {self.incoming.id, self.outgoing.id})
+        self.assertEqual(self.ids(role='landlord'), {self.incoming.id})
+        self.assertEqual(self.ids(role='tenant'), {self.outgoing.id})
+
+    def test_status_and_date_filters(self):
+        self.incoming.status = 'confirmed'
+        self.incoming.save(update_fields=['status'])
+        self.assertEqual(self.ids(status='confirmed'), {self.incoming.id})
+        self.assertEqual(self.ids(start_date=(self.today + timezone.timedelta(days=20)).isoformat()), {self.outgoing.id})
+        self.assertEqual(self.ids(end_date=(self.today + timezone.timedelta(days=11)).isoformat()), {self.incoming.id})
+
+    def test_invalid_filters_rejected(self):
+        self.client.force_authenticate(user=self.landlord)
+        for params in ({'role': 'admin'}, {'status': 'lost'}, {'start_date': 'tomorrow'}):
+            response = self.client.get(reverse('booking-list'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_query_count_is_constant(self):
+        def add_bookings(n):
+            for _ in range(n):
+                self.book(self.own, self.tenant, 100 + 3 * self.incoming_count)
+                self.incoming_count += 1
+
+        def request():
+            self.assertEqual(len(self.ids(role='landlord')), self.incoming_count)
+        self.assertConstantQueryCount(add_bookings, request, sizes=(1, 6))
+
+
+class BookingBulkActionTests(APITestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.landlord.groups.add(Group.objects.get_or_create(name='Landlords')[0])
+        self.stranger = User.objects.create_user(
+            email="stranger@test.com", first_name="Stranger", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        own = Listing.objects.create(
+            owner=self.landlord, title="Own", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+        foreign = Listing.objects.create(
+            owner=self.stranger, title="Foreign", description="У озера",
+            city="Potsdam", price=100, rooms=1, housing_type='studio'
+        )
+        today = timezone.now().date()
+        self.pending = []
+        for offset in (10, 20, 30):
+            booking = Booking(
+                listing=own, tenant=self.tenant,
+                start_date=today + timezone.timedelta(days=offset),
+                end_date=today + timezone.timedelta(days=offset + 2),
+            )
+            booking.save()
+            self.pending.append(booking)
+        self.done = self.pending.pop()
+        self.done.status = 'confirmed'
+        self.done.save(update_fields=['status'])
+        self.foreign = Booking(
+            listing=foreign, tenant=self.tenant,
+            start_date=today + timezone.timedelta(days=10),
+            end_date=today + timezone.timedelta(days=12),
+        )
+        self.foreign.save()
+        OutboxEmail.objects.all().delete()
+        self.client.force_authenticate(user=self.landlord)
+
+    def bulk(self, action, ids):
+        return self.client.post(reverse('booking-bulk-action', args=[action]), {'ids': ids}, format='json')
+
+    def test_reject_reports_per_id_results(self):
+        ids = [b.id for b in self.pending] + [self.done.id, self.foreign.id, 999999]
+        response = self.bulk('reject', ids)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {item['id']: item for item in response.data}
+        self.assertEqual([results[b.id]['status'] for b in self.pending], ['cancelled', 'cancelled'])
+        for booking_id in (self.done.id, self.foreign.id, 999999):
+            self.assertIn('error', results[booking_id])
+        # Another landlord's booking is indistinguishable from a missing one
+        self.assertEqual(results[self.foreign.id]['error'], results[999999]['error'])
+        self.assertEqual(Booking.objects.get(pk=self.foreign.pk).status, 'pending')
+
+        self.assertEqual(
+            set(Booking.objects.filter(status='cancelled').values_list('id', flat=True)),
+            {b.id for b in self.pending},
+        )
+        self.assertFalse(BookedNight.objects.filter(booking__in=self.pending).exists())
+        self.assertEqual(OutboxEmail.objects.count(), 4)
+
+    def test_confirm_uses_constant_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.bulk('confirm', [b.id for b in self.pending])
+        self.assertEqual([item['status'] for item in response.data], ['confirmed', 'confirmed'])
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+    def test_invalid_action_and_tenant_forbidden(self):
+        self.assertEqual(self.bulk('cancel', [self.pending[0].id]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.tenant)
+        self.assertEqual(self.bulk('confirm', [self.pending[0].id]).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AvailabilityCalendarTests(APITestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        self.busy, self.free = [
+            Listing.objects.create(
+                owner=self.landlord, title=title, description="Рядом с парком",
+                city="Berlin", price=100, rooms=2, housing_type='apartment'
+            )
+            for title in ("Busy", "Free")
+        ]
+        self.start = timezone.now().date() + timezone.timedelta(days=10)
+        self.booking = Booking(
+            listing=self.busy, tenant=self.tenant,
+            start_date=self.start, end_date=self.start + timezone.timedelta(days=3),
+        )
+        self.booking.save()
+
+    def available(self, start_offset, end_offset):
+        response = self.client.get(reverse('listing-list'), {
+            'start_date': (self.start + timezone.timedelta(days=start_offset)).isoformat(),
+            'end_date': (self.start + timezone.timedelta(days=end_offset)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['title'] for item in response.data['results']}
+
+    def test_nights_follow_booking_status(self):
+        nights = BookedNight.objects.filter(booking=self.booking).values_list('night', flat=True)
+        self.assertEqual(sorted(nights), [self.start + timezone.timedelta(days=d) for d in range(3)])
+
+        self.booking.status = 'cancelled'
+        self.booking.save(update_fields=['status'])
+        self.assertFalse(BookedNight.objects.exists())
+
+    def test_date_filter_excludes_occupied_listings(self):
+        self.assertEqual(self.available(1, 2), {"Free"})
+        self.assertEqual(self.available(-2, 1), {"Free"})
+        # Check-out day is free for the next guest
+        self.assertEqual(self.available(3, 5), {"Busy", "Free"})
+
+    def test_overlapping_create_is_rejected(self):
+        other = User.objects.create_user(
+            email="other@test.com", first_name="Other", password="securepassword123"
+        )
+        other.groups.add(Group.objects.get_or_create(name='Tenants')[0])
+        self.client.force_authenticate(user=other)
+        response = self.client.post(reverse('booking-list'), {
+            'listing': self.busy.id,
+            'start_date': (self.start + timezone.timedelta(days=2)).isoformat(),
+            'end_date': (self.start + timezone.timedelta(days=4)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_date_filter_validates_dates(self):
+        response = self.client.get(reverse('listing-list'), {'start_date': 'soon'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    """Parallel creates for the same dates must leave exactly one booking."""
+
+    THREADS = 6
+
+    def setUp(self):
+        landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenants = [
+            User.objects.create_user(email=f"tenant{i}@test.com", first_name="Tenant", password="securepassword123")
+            for i in range(self.THREADS)
+        ]
+        self.listing = Listing.objects.create(
+            owner=landlord, title="Уютная квартира", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+
+    def test_parallel_creates_for_same_nights(self):
+        start = timezone.now().date() + timezone.timedelta(days=10)
+        barrier = threading.Barrier(self.THREADS)
+        outcomes = []
+
+        def book(tenant, offset):
+            try:
+                barrier.wait()
+                Booking(
+                    listing_id=self.listing.id, tenant=tenant,
+                    start_date=start + timezone.timedelta(days=offset),
+                    end_date=start + timezone.timedelta(days=offset + 3),
+                ).save()
+                outcomes.append("created")
+            except (ValidationError, DatabaseError) as e:
+                outcomes.append(type(e).__name__)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=book, args=(tenant, i % 2))
+            for i, tenant in enumerate(self.tenants)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count("created"), 1, outcomes)
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(BookedNight.objects.count(), 3)
+
+
+class CompleteBookingsCommandTests(TestCase):
+    def setUp(self):
+        landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        self.listing = Listing.objects.create(
+            owner=landlord, title="Уютная квартира", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+        self.today = timezone.now().date()
+
+    def book(self, start_offset, nights, booking_status):
+        start = self.today + timezone.timedelta(days=start_offset)
+        booking = Booking(
+            listing=self.listing, tenant=self.tenant, status=booking_status,
+            start_date=start, end_date=start + timezone.timedelta(days=nights),
+        )
+        booking.save(skip_validation=True)
+        return booking
+
+    def test_completes_past_confirmed_bookings_in_chunks(self):
+        past = [self.book(-30 + 3 * i, 2, 'confirmed') for i in range(5)]
+        ends_today = self.book(-2, 2, 'confirmed')
+        pending = self.book(-10, 1, 'pending')
+
+        call_command('complete_bookings', '--chunk-size', '2', stdout=StringIO())
+        self.assertEqual(
+            set(Booking.objects.filter(status='completed').values_list('id', flat=True)),
+            {b.id for b in past},
+        )
+        self.assertEqual(Booking.objects.get(pk=ends_today.pk).status, 'confirmed')
+        self.assertEqual(Booking.objects.get(pk=pending.pk).status, 'pending')
+        self.assertFalse(BookedNight.objects.filter(booking__in=past).exists())
+
+        # Safe to re-run: nothing left to do
+        out = StringIO()
+        call_command('complete_bookings', stdout=out)
+        self.assertIn(': 0 ', out.getvalue())
+
+    def test_rejects_future_date_and_empty_chunks(self):
+        current = self.book(-1, 3, 'confirmed')
+        tomorrow = self.today + timezone.timedelta(days=1)
+        for args in (('--date', tomorrow.isoformat()), ('--chunk-size', '0')):
+            with self.assertRaises(CommandError):
+                call_command('complete_bookings', *args, stdout=StringIO())
+        self.assertEqual(Booking.objects.get(pk=current.pk).status, 'confirmed')
+
+
+class BookingConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        listing = Listing.objects.create(
+            owner=self.landlord, title="Уютная квартира", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+        start = timezone.now().date() + timezone.timedelta(days=10)
+        self.booking = Booking(listing=listing, tenant=self.tenant, start_date=start,
+                               end_date=start + timezone.timedelta(days=3))
+        self.booking.save()
+        self.url = reverse('booking-detail', args=[self.booking.id])
+
+    def test_unchanged_booking_answers_not_modified(self):
+        self.client.force_authenticate(user=self.tenant)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_status_change_returns_full_body(self):
+        self.client.force_authenticate(user=self.landlord)
+        etag = self.client.get(self.url)['ETag']
+        self.booking.status = 'confirmed'
+        self.booking.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'confirmed')
+
+    def test_listing_change_returns_full_body(self):
+        self.client.force_authenticate(user=self.tenant)
+        etag = self.client.get(self.url)['ETag']
+        listing = self.booking.listing
+        listing.title = "Светлая квартира"
+        listing.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['listing_title'], "Светлая квартира")
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_outsider_never_gets_not_modified(self):
+        self.client.force_authenticate(user=self.tenant)
+        etag = self.client.get(self.url)['ETag']
+        outsider = User.objects.create_user(email="x@test.com", first_name="X", password="securepassword123")
+        self.client.force_authenticate(user=outsider)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
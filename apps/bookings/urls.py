@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import BookingListView, BookingDetailView, BookingActionView
+from .views import BookingListView, BookingDetailView, BookingActionView, BookingBulkActionView
 
 
 # Booking API endpoints: list, detail, and action (e.g., confirm/cancel)
@@ -8,4 +8,5 @@ urlpatterns = [
     path("", BookingListView.as_view(), name="booking-list"),  # Список и создание бронирований
     path("<int:pk>/", BookingDetailView.as_view(), name="booking-detail"),  # Получение бронирования
     path("<int:pk>/<str:action>/", BookingActionView.as_view(), name="booking-action"), # Действия с бронированием (cancel/confirm/reject)
+    path("bulk/<str:action>/", BookingBulkActionView.as_view(), name="booking-bulk-action"),  # Массовое подтверждение/отклонение бронирований
 ]
\ No newline at end of file
@@ -1,13 +1,26 @@
 from logging import getLogger
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from .availability import release_booked_nights
+from .choices import BOOKING_STATUS_CHOICES
 from .models import Booking
-from .serializers import BookingSerializer
-from apps.common.permissions import IsTenant, IsBookingOwnerOrLandlord
+from .serializers import BookingBulkActionSerializer, BookingBulkResultSerializer, BookingSerializer
+from apps.common.notifications import booking_cancelled_messages, booking_confirmed_messages
+from apps.common.outbox import enqueue_emails
+from apps.common.pagination import CreatedAtCursorPagination
+from apps.common.permissions import IsLandlord, IsTenant, IsBookingOwnerOrLandlord
 from apps.common.validators import validate_booking_cancellation
+from apps.common.views import ConditionalGetMixin
+from apps.listings.models import Listing
 
 logger = getLogger(__name__)
 
@@ -16,6 +29,12 @@ logger = getLogger(__name__)
     get=extend_schema(
         summary=_("List bookings"),  # Список бронирований
         description=_("Returns user's bookings (tenant) or bookings for their listings (landlord)."),  # Возвращает бронирования пользователя (как арендатора) или бронирования его объявлений (как арендодателя)
+        parameters=[
+            ("role", _("Only bookings as tenant or landlord"), "query", str, False),  # Только бронирования как арендатора или арендодателя
+            ("status", _("Booking status: pending, confirmed, cancelled, completed"), "query", str, False),  # Статус бронирования
+            ("start_date", _("Stays ending after this date (YYYY-MM-DD)"), "query", str, False),  # Проживания, заканчивающиеся после этой даты
+            ("end_date", _("Stays starting before this date (YYYY-MM-DD)"), "query", str, False),  # Проживания, начинающиеся до этой даты
+        ],
         responses={200: BookingSerializer(many=True)},
     ),
     post=extend_schema(
@@ -33,19 +52,70 @@ class BookingListView(generics.ListCreateAPIView):
     """List and create bookings for authenticated users.
 
     Tenants can create new bookings.
-    Both tenants and landlords can view their related bookings.
+    Both tenants and landlords can view their related bookings (cursor-paginated),
+    filtered by ``role``, ``status`` and a ``start_date``/``end_date`` range.
     """
     # Получение и создание бронирований: арендаторы — создают, все — просматривают свои
 
     serializer_class = BookingSerializer
+    pagination_class = CreatedAtCursorPagination
+
+    roles = ("tenant", "landlord")
+    statuses = {value for value, _label in BOOKING_STATUS_CHOICES}
 
     def get_queryset(self):
-        """Return bookings related to the current user (as tenant or landlord)."""
-        # Возвращает бронирования текущего пользователя (как арендатора или арендодателя)
+        """Return bookings related to the current user (as tenant or landlord) with optional filters."""
+        # Возвращает бронирования текущего пользователя (как арендатора или арендодателя) с фильтрами
         user = self.request.user
-        tenant_bookings = Booking.objects.filter(is_deleted=False, tenant=user)
-        landlord_bookings = Booking.objects.filter(is_deleted=False, listing__owner=user)
-        return tenant_bookings.union(landlord_bookings)
+        params = self.request.query_params
+
+        # Each branch hits its own index: bookings by tenant, bookings by the owner's listing ids
+        # Каждая ветка использует свой индекс: по арендатору и по id объявлений владельца
+        as_tenant = Q(tenant=user)
+        as_landlord = Q(listing__in=Listing.all_objects.filter(owner=user).values("pk"))
+        role = params.get("role")
+        if role and role not in self.roles:
+            raise ValidationError({"role": _("Use tenant or landlord.")})  # Используйте tenant или landlord.
+        if role == "tenant":
+            condition = as_tenant
+        elif role == "landlord":
+            condition = as_landlord
+        else:
+            # Single OR-filter instead of UNION: cursor pagination must filter the queryset further
+            # Один OR-фильтр вместо UNION: курсорной пагинации нужно дополнительно фильтровать queryset
+            condition = as_tenant | as_landlord
+        queryset = Booking.objects.filter(condition).select_related("listing")
+
+        booking_status = params.get("status")
+        if booking_status:
+            if booking_status not in self.statuses:
+                raise ValidationError({"status": _("Unknown booking status.")})  # Неизвестный статус бронирования.
+            queryset = queryset.filter(status=booking_status)
+
+        # Bookings overlapping the [start_date, end_date) range
+        # Бронирования, пересекающиеся с интервалом [start_date, end_date)
+        start_date = self.parse_date_param("start_date")
+        if start_date:
+            queryset = queryset.filter(end_date__gt=start_date)
+        end_date = self.parse_date_param("end_date")
+        if end_date:
+            queryset = queryset.filter(start_date__lt=end_date)
+
+        return queryset
+
+    def parse_date_param(self, name):
+        """Return a date query parameter, or None if it is absent."""
+        # Возвращает дату из параметра запроса или None, если параметр не передан
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: _("Use the YYYY-MM-DD format.")})  # Используйте формат ГГГГ-ММ-ДД.
+        return parsed
 
     def get_permissions(self):
         """Apply IsTenant permission for POST, IsAuthenticated for GET."""
@@ -68,14 +138,30 @@ class BookingListView(generics.ListCreateAPIView):
         responses={200: BookingSerializer},
     )
 )
-class BookingDetailView(generics.RetrieveAPIView):
-    """Retrieve a single booking by ID with ownership validation."""
-    # Получение одного бронирования с проверкой прав доступа
+class BookingDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """Retrieve a single booking by ID with ownership validation.
 
-    queryset = Booking.objects.filter(is_deleted=False)
+    Clients polling for status changes get ``304 Not Modified`` while
+    neither the booking nor its listing (``listing_title``) has changed.
+    """
+    # Получение одного бронирования с проверкой прав доступа; 304, если не менялись ни бронирование, ни объявление
+
+    queryset = Booking.objects.select_related("listing")
     serializer_class = BookingSerializer
     permission_classes = [IsBookingOwnerOrLandlord]
 
+    def get_conditional_queryset(self):
+        """Same rule as IsBookingOwnerOrLandlord: only the tenant and the listing owner."""
+        # То же правило, что и в IsBookingOwnerOrLandlord: только арендатор и владелец объявления
+        user_id = self.request.user.pk
+        return Booking.objects.filter(Q(tenant_id=user_id) | Q(listing__owner_id=user_id))
+
+    def get_last_modified_expression(self):
+        return Greatest("updated_at", "listing__updated_at")
+
+    def get_object_last_modified(self, obj):
+        return max(obj.updated_at, obj.listing.updated_at)
+
 
 @extend_schema_view(
     patch=extend_schema(
@@ -92,7 +178,7 @@ class BookingActionView(generics.UpdateAPIView):
     """Handle booking status changes via URL actions (cancel/confirm/reject)."""
     # Обработка изменений статуса бронирования через действия в URL
 
-    queryset = Booking.objects.filter(is_deleted=False)
+    queryset = Booking.objects.all()
     serializer_class = BookingSerializer
     permission_classes = [IsBookingOwnerOrLandlord]
 
@@ -148,4 +234,83 @@ class BookingActionView(generics.UpdateAPIView):
             return Response(
                 {"error": _("An internal error occurred while processing the request.")},  # Произошла внутренняя ошибка при обработке запроса
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary=_("Bulk booking action"),  # Массовое действие с бронированиями
+        description=_("Confirm or reject several pending bookings at once. URL: /bulk/{action}/ with action confirm or reject."),  # Подтвердить или отклонить несколько ожидающих бронирований. URL: /bulk/{action}/, действие confirm или reject
+        request=BookingBulkActionSerializer,
+        responses={
+            200: BookingBulkResultSerializer(many=True),
+            400: OpenApiResponse(description=_("Invalid action or input")),  # Недопустимое действие или данные
+            403: OpenApiResponse(description=_("Only landlords allowed")),  # Разрешено только арендодателям
+        },
+    )
+)
+class BookingBulkActionView(generics.GenericAPIView):
+    """Confirm or reject a batch of pending bookings of the landlord's listings.
+
+    All bookings are loaded and locked with one query, checked in memory,
+    updated with a single ``bulk_update``, and their notifications are
+    queued to the email outbox with one insert in the same transaction.
+    The response reports the outcome for every requested ID.
+    """
+    # Массовое подтверждение/отклонение ожидающих бронирований арендодателем
+
+    serializer_class = BookingBulkActionSerializer
+    permission_classes = [IsLandlord]
+
+    # URL action → new booking status
+    # Действие из URL → новый статус бронирования
+    transitions = {"confirm": "confirmed", "reject": "cancelled"}
+
+    def post(self, request, *args, **kwargs):
+        """Apply the action to every ID and return per-ID results."""
+        # Применяет действие к каждому ID и возвращает результат по каждому
+        action = self.kwargs.get("action")
+        new_status = self.transitions.get(action)
+        if new_status is None:
+            return Response(
+                {"error": _("Invalid action. Use: confirm, reject.")},  # Недопустимое действие. Используйте: confirm, reject
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+        user = request.user
+
+        results = {}
+        with transaction.atomic():
+            bookings = {
+                booking.pk: booking
+                # Other landlords' bookings are not even locked: they look the same as missing ones
+                # Чужие бронирования не блокируются и выглядят так же, как несуществующие
+                for booking in Booking.objects.select_for_update(of=("self",))
+                .filter(pk__in=ids, listing__owner=user)
+                .select_related("listing__owner", "tenant")
+            }
+            changed = []
+            now = timezone.now()
+            for booking_id in ids:
+                booking = bookings.get(booking_id)
+                if booking is None:
+                    results[booking_id] = {"id": booking_id, "error": _("Booking not found.")}  # Бронирование не найдено.
+                elif booking.status != "pending":
+                    results[booking_id] = {"id": booking_id, "error": _("Only pending bookings can be confirmed or rejected.")}  # Подтвердить или отклонить можно только ожидающие бронирования.
+                else:
+                    booking.status = new_status
+                    booking.updated_at = now
+                    changed.append(booking)
+                    results[booking_id] = {"id": booking_id, "status": new_status}
+
+            Booking.objects.bulk_update(changed, ["status", "updated_at"])
+            if new_status == "cancelled":
+                release_booked_nights([booking.pk for booking in changed])
+
+            build_messages = booking_confirmed_messages if new_status == "confirmed" else booking_cancelled_messages
+            enqueue_emails([message for booking in changed for message in build_messages(booking)])
+
+        logger.info(f"Bulk {action} of {len(changed)}/{len(ids)} bookings by landlord {user.id}")
+        return Response(BookingBulkResultSerializer([results[booking_id] for booking_id in ids], many=True).data)
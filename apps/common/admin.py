@@ -1,3 +1,65 @@
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _, ngettext
 
-# Register your models here.
+from .models import OutboxEmail
+
+
+class SoftDeleteAdminMixin:
+    """Admin for ``BaseModel`` subclasses: shows deleted rows, deletes softly, restores in bulk.
+
+    Deleting (one object or the "delete selected" action) goes through
+    ``soft_delete()``, so it cascades to dependent rows in a few statements.
+    """
+    # Админка моделей BaseModel: показывает удалённые строки, удаляет мягко, восстанавливает массово
+
+    actions = ['restore_selected']
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_deleted_objects(self, objs, request):
+        """Related rows are kept, so PROTECT references do not block a soft delete."""
+        # Связанные строки сохраняются, поэтому ссылки PROTECT не мешают мягкому удалению
+        deleted_objects, model_count, perms_needed, protected = super().get_deleted_objects(objs, request)
+        return deleted_objects, model_count, perms_needed, []
+
+    def delete_model(self, request, obj):
+        self.model.all_objects.filter(pk=obj.pk).soft_delete()
+
+    def delete_queryset(self, request, queryset):
+        queryset.soft_delete()
+
+    @admin.action(description=_('Restore selected'))  # Восстановить выбранные
+    def restore_selected(self, request, queryset):
+        restored = queryset.restore()
+        self.message_user(
+            request,
+            ngettext("%(count)d object restored.", "%(count)d objects restored.", restored) % {"count": restored},  # Восстановлено объектов: %(count)d
+        )
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """Read-only admin for the email outbox (delivery status and errors)."""
+    # Админка (только чтение) очереди писем: статус отправки и ошибки
+
+    list_display = ('subject', 'recipient_list', 'status', 'attempts', 'available_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = (
+        'subject', 'body', 'from_email', 'recipients', 'status', 'attempts',
+        'last_error', 'available_at', 'created_at', 'sent_at'
+    )
+
+    @admin.display(description=_('Recipients'))  # Получатели
+    def recipient_list(self, obj):
+        """Display recipients as a comma-separated list."""
+        # Отображает получателей через запятую
+        return ", ".join(obj.recipients)
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,64 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models import CASCADE, Exists, OuterRef
+
+
+def archived_models():
+    """Return the models with an archive table, dependents before the models they reference."""
+    # Возвращает модели с архивной таблицей: зависимые раньше тех, на которые они ссылаются
+    pending = [model for model in apps.get_models() if getattr(model, "archive_model", None)]
+    ordered = []
+    while pending:
+        for model in pending:
+            dependents = {relation.related_model for relation in model._meta.related_objects}
+            if not dependents.intersection(pending):
+                ordered.append(model)
+                pending.remove(model)
+                break
+        else:
+            ordered += pending
+            break
+    return ordered
+
+
+def blocking_relations(model):
+    """Reverse relations whose rows keep a deleted row of ``model`` in the hot table.
+
+    Rows of archived models must be archived first, and PROTECT / SET_NULL
+    references must be gone; other CASCADE dependents (calendars, counters,
+    raw history) are deleted together with the row.
+    """
+    # Обратные связи, строки которых не дают перенести удалённую строку в архив
+    return [
+        relation for relation in model._meta.related_objects
+        if relation.on_delete is not CASCADE or getattr(relation.related_model, "archive_model", None)
+    ]
+
+
+def archivable(model, cutoff):
+    """Return soft-deleted rows of ``model`` deleted before ``cutoff`` that can be archived."""
+    # Возвращает мягко удалённые до cutoff строки, которые можно перенести в архив
+    queryset = model._base_manager.filter(is_deleted=True, deleted_at__lt=cutoff)
+    for relation in blocking_relations(model):
+        references = relation.related_model._base_manager.filter(**{relation.field.name: OuterRef("pk")})
+        queryset = queryset.exclude(Exists(references))
+    return queryset.order_by("pk")
+
+
+def archive_batch(model, cutoff, batch_size):
+    """Move one batch of long soft-deleted rows to the archive table; return the number moved.
+
+    Copy and delete run in one transaction, so a row is never in both
+    tables or in neither.
+    """
+    # Переносит одну пачку давно удалённых строк в архивную таблицу; возвращает число строк
+    archive = model.archive_model
+    fields = [field.attname for field in model._meta.concrete_fields]
+    with transaction.atomic():
+        pks = list(archivable(model, cutoff).select_for_update().values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return 0
+        rows = model._base_manager.filter(pk__in=pks).values_list(*fields)
+        archive._default_manager.bulk_create([archive(**dict(zip(fields, row))) for row in rows])
+        model._base_manager.filter(pk__in=pks).delete()
+    return len(pks)
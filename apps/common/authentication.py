@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class ClaimsUser(TokenUser):
+    """User built from access token claims (id, email, roles).
+
+    Claims are answered from the token; any other attribute loads the
+    ``User`` row once, on first access.
+    """
+    # Пользователь из claims токена; строка User загружается только при обращении к другим полям
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def user(self):
+        """The full ``User`` instance, loaded on first access."""
+        # Полный объект User, загружается при первом обращении
+        try:
+            return get_user_model()._default_manager.get(pk=self.id)
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")  # Пользователь не найден
+
+    @property
+    def groups(self):
+        return self.user.groups
+
+    @property
+    def user_permissions(self):
+        return self.user.user_permissions
+
+    def __str__(self):
+        return self.token.get("email") or super().__str__()
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.user, attr)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT authentication that trusts the token claims instead of selecting the user.
+
+    Only safe (read) requests are answered from the claims: the user's
+    existence and ``is_active`` flag are not re-checked there, so a
+    deactivated account can still read until its access token expires.
+    Writes go through ``JWTAuthentication``, which loads and checks the user.
+    """
+    # JWT-аутентификация без запроса пользователя к БД для чтения; запись проверяет пользователя в БД
+
+    def authenticate(self, request):
+        if request.method not in SAFE_METHODS:
+            return JWTAuthentication().authenticate(request)
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))  # В токене нет идентификатора пользователя
+        return ClaimsUser(validated_token)
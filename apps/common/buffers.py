@@ -0,0 +1,139 @@
+import atexit
+import os
+import threading
+from collections import deque
+from logging import getLogger
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Bounded in-process buffer that writes items to the database in batches.
+
+    Producers call ``add()`` on the request path, which only appends to a
+    deque. A daemon worker thread flushes pending items when ``BATCH_SIZE``
+    items are waiting or every ``FLUSH_INTERVAL`` seconds and once more at
+    interpreter exit; ``drain()`` flushes synchronously (tests, or when
+    ``BACKGROUND`` is disabled).
+
+    The buffer is per process: only the process that queued an item can
+    write it, so every web worker flushes its own events and no other
+    process (e.g. a management command) can drain them.
+
+    Backpressure: once ``MAX_SIZE`` items are pending, new items are dropped
+    and counted instead of blocking the request.
+
+    Subclasses set ``settings_name`` (a dict in settings overriding
+    ``defaults``) and implement ``flush_batch(items)``.
+    """
+    # Ограниченный буфер в памяти процесса с пакетной записью в БД фоновым потоком
+
+    settings_name = None
+    defaults = {
+        "MAX_SIZE": 10000,
+        "BATCH_SIZE": 500,
+        "FLUSH_INTERVAL": 2.0,
+        "BACKGROUND": True,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._reset()
+        # Flush what is left when the process exits, with or without the worker thread
+        # Записываем остаток при завершении процесса — с фоновым потоком или без него
+        atexit.register(self.drain)
+
+    def _reset(self):
+        """Initialise per-process state (also used after a fork)."""
+        # Инициализирует состояние процесса (в том числе после fork)
+        self._pid = os.getpid()
+        self._items = deque()
+        self._worker = None
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+
+    @property
+    def config(self):
+        return {**self.defaults, **getattr(settings, self.settings_name, {})}
+
+    @property
+    def pending(self):
+        return len(self._items)
+
+    def stats(self):
+        """Return buffer counters for monitoring."""
+        # Возвращает счётчики буфера для мониторинга
+        return {
+            "pending": self.pending,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def add(self, item):
+        """Queue an item; return False if it was dropped because the buffer is full."""
+        # Добавляет элемент в очередь; возвращает False, если буфер переполнен
+        config = self.config
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            if len(self._items) >= config["MAX_SIZE"]:
+                self.dropped += 1
+                return False
+            self._items.append(item)
+            pending = len(self._items)
+        if config["BACKGROUND"]:
+            self._ensure_worker()
+            if pending >= config["BATCH_SIZE"]:
+                self._wakeup.set()
+        return True
+
+    def drain(self):
+        """Flush every pending item synchronously; return the number of items written."""
+        # Синхронно записывает все ожидающие элементы; возвращает количество записанных
+        batch_size = self.config["BATCH_SIZE"]
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._items.popleft() for _ in range(min(batch_size, len(self._items)))]
+                if not batch:
+                    return written
+                try:
+                    self.flush_batch(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.error(f"{type(self).__name__}: failed to flush {len(batch)} items: {e}", exc_info=True)
+                else:
+                    self.flushed += len(batch)
+                    written += len(batch)
+
+    def flush_batch(self, items):
+        raise NotImplementedError
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name=f"{type(self).__name__}-worker", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(timeout=self.config["FLUSH_INTERVAL"])
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.drain()
+            finally:
+                close_old_connections()
@@ -0,0 +1,63 @@
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+# Cache alias holding version stamps. Stamps must live next to the entries they
+# version: with a shared backend (file, Redis) a bump made by one worker is then
+# seen by all of them.
+# Алиас кэша с версиями; версии хранятся там же, где и записи, которые они версионируют
+VERSION_CACHE_ALIAS = "responses"
+
+
+def version_key(name):
+    return f"version:{name}"
+
+
+def get_cache_versions(names, alias=VERSION_CACHE_ALIAS):
+    """Return ``{name: stamp}`` for a group of version stamps, in one cache round trip.
+
+    Entries embed the stamp in their keys, so bumping it invalidates the
+    whole group at once without tracking the individual keys. A missing
+    stamp starts from the current time, so it never repeats a value that
+    older entries may still be stored under; ``add()`` lets the first
+    worker's value win, and everyone then reads it back.
+    """
+    # Возвращает текущие версии групп записей кэша одним обращением; смена версии инвалидирует группу
+    cache = caches[alias]
+    keys = {version_key(name): name for name in names}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: version for key, version in found.items()}
+
+
+def get_cache_version(name, alias=VERSION_CACHE_ALIAS):
+    """Return the current version stamp of a group of cache entries."""
+    # Возвращает текущую версию группы записей кэша
+    return get_cache_versions([name], alias)[name]
+
+
+def bump_cache_version(name, alias=VERSION_CACHE_ALIAS):
+    """Invalidate every cache entry stored under the group's current version."""
+    # Инвалидирует все записи кэша, сохранённые под текущей версией группы
+    cache = caches[alias]
+    try:
+        cache.incr(version_key(name))
+    except ValueError:
+        cache.set(version_key(name), time.time_ns(), None)
+
+
+def invalidate_cache_versions(*names):
+    """Bump version stamps now and once more after the current transaction commits.
+
+    The first bump makes this transaction's own reads miss; the second drops
+    entries that concurrent requests cached from pre-commit data in between.
+    """
+    # Меняет версии сразу и ещё раз после коммита: второй раз сбрасывает записи, закэшированные до коммита
+    for name in names:
+        bump_cache_version(name)
+    transaction.on_commit(lambda: [bump_cache_version(name) for name in names])
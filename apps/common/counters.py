@@ -0,0 +1,63 @@
+from django.db import connection, transaction
+
+
+def bulk_increment(model, key_fields, counts, count_field="count", batch_size=500):
+    """Add ``counts`` to counter rows of ``model`` in bulk, inserting missing rows.
+
+    ``counts`` maps tuples of ``key_fields`` values to increments. ``key_fields``
+    must be covered by a unique constraint. Uses a single INSERT ... ON CONFLICT
+    (SQLite/PostgreSQL) or ON DUPLICATE KEY UPDATE (MySQL) statement per batch,
+    so concurrent writers never lose increments.
+    """
+    # Пакетно увеличивает счётчики модели, создавая недостающие строки (upsert)
+    if not counts:
+        return
+    if connection.vendor not in ("sqlite", "postgresql", "mysql"):
+        _increment_fallback(model, key_fields, counts, count_field)
+        return
+
+    opts = model._meta
+    qn = connection.ops.quote_name
+    fields = [opts.get_field(name) for name in key_fields]
+    count_column = qn(opts.get_field(count_field).column)
+    columns = ", ".join([qn(field.column) for field in fields] + [count_column])
+    placeholders = "(" + ", ".join(["%s"] * (len(fields) + 1)) + ")"
+    table = qn(opts.db_table)
+
+    if connection.vendor == "mysql":
+        conflict = f"ON DUPLICATE KEY UPDATE {count_column} = {count_column} + VALUES({count_column})"
+    else:
+        key_columns = ", ".join(qn(field.column) for field in fields)
+        conflict = (
+            f"ON CONFLICT ({key_columns}) DO UPDATE SET "
+            f"{count_column} = {table}.{count_column} + excluded.{count_column}"
+        )
+
+    items = list(counts.items())
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            params = []
+            for key, increment in batch:
+                params.extend(
+                    field.get_db_prep_value(value, connection) for field, value in zip(fields, key)
+                )
+                params.append(increment)
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES {', '.join([placeholders] * len(batch))} {conflict}",
+                params,
+            )
+
+
+def _increment_fallback(model, key_fields, counts, count_field):
+    """Portable read-modify-write variant for backends without upsert support."""
+    # Переносимый вариант (чтение-изменение-запись) для СУБД без upsert
+    with transaction.atomic():
+        for key, increment in counts.items():
+            lookup = dict(zip(key_fields, key))
+            row, created = model.objects.select_for_update().get_or_create(
+                **lookup, defaults={count_field: increment}
+            )
+            if not created:
+                setattr(row, count_field, getattr(row, count_field) + increment)
+                row.save(update_fields=[count_field])
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEmail",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("subject", models.CharField(max_length=255, verbose_name="Subject")),
+                ("body", models.TextField(verbose_name="Body")),
+                ("from_email", models.CharField(max_length=255, verbose_name="From")),
+                ("recipients", models.JSONField(verbose_name="Recipients")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("sent", "Sent"), ("failed", "Failed")],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0, verbose_name="Attempts")),
+                ("last_error", models.TextField(blank=True, verbose_name="Last error")),
+                ("available_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="Available at")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created at")),
+                ("sent_at", models.DateTimeField(blank=True, null=True, verbose_name="Sent at")),
+            ],
+            options={
+                "verbose_name": "Outbox email",
+                "verbose_name_plural": "Outbox emails",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(fields=["status", "available_at"], name="outbox_email_due_idx"),
+                ],
+            },
+        ),
+    ]
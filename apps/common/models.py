@@ -1,11 +1,157 @@
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import F, Value
+from django.dispatch import Signal
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from django.db import models
-from django.utils.translation import gettext_lazy as _
+# Sent per model by SoftDeleteQuerySet.soft_delete()/restore(), inside their transaction,
+# with ``queryset`` (the changed rows, selected by primary key) and ``deleted``
+# (the new flag). Per-instance save signals are not sent for these bulk updates.
+# Отправляется для каждой модели при массовом удалении/восстановлении: queryset изменённых строк и новое значение deleted
+soft_delete_changed = Signal()
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """QuerySet with set-based soft delete and restore.
+
+    Both cascade along the model's ``soft_delete_cascade`` relations (e.g.
+    listing → bookings → reviews). The primary keys of every level are
+    collected before anything changes, then each level is updated by those
+    keys: a few statements per level, whatever the number of rows.
+    """
+    # QuerySet с массовым мягким удалением и восстановлением, каскадно по зависимым моделям
+
+    def soft_delete(self):
+        """Soft-delete the rows and their dependents; return the number of rows deleted."""
+        # Мягко удаляет строки и зависимые от них; возвращает число удалённых строк
+        return self._set_deleted(True)
+
+    def restore(self):
+        """Restore the rows and the dependents deleted together with them; return the number restored."""
+        # Восстанавливает строки и зависимые, удалённые вместе с ними; возвращает число строк
+        return self._set_deleted(False)
+
+    def _pk_chunks(self, pks):
+        """Split primary keys into chunks that fit the backend's query parameter limit."""
+        # Делит первичные ключи на части в пределах лимита параметров запроса СУБД
+        size = connections[self.db].features.max_query_params or len(pks) or 1
+        return [pks[start:start + size] for start in range(0, len(pks), size)]
 
+    def _cascade(self, deleted):
+        """Return ``[(model, pks)]`` for the rows to change, parents before dependents.
 
-class ActiveManager(models.Manager):
+        Dependents already in the target state are left alone. On restore
+        only dependents deleted in the same cascade as their parent (same
+        ``deleted_at``) come back, not those deleted on their own earlier.
+        """
+        # Возвращает [(модель, первичные ключи)] изменяемых строк: сначала родители, затем зависимые
+        levels = [(self.model, list(self.filter(is_deleted=not deleted).values_list('pk', flat=True)))]
+        for model, pks in levels:
+            for name in model.soft_delete_cascade:
+                relation = model._meta.get_field(name)
+                parent = relation.field.name
+                dependents = relation.related_model._base_manager.using(self.db).filter(is_deleted=not deleted)
+                if not deleted:
+                    dependents = dependents.filter(deleted_at=F(f'{parent}__deleted_at'))
+                dependent_pks = []
+                for chunk in self._pk_chunks(pks):
+                    dependent_pks += dependents.filter(**{f'{parent}__in': chunk}).values_list('pk', flat=True)
+                levels.append((relation.related_model, dependent_pks))
+        return levels
+
+    def _set_deleted(self, deleted):
+        now = timezone.now()
+        with transaction.atomic(using=self.db):
+            # Every level is read before the first update, so the cascade sees the state before the change
+            # Все уровни читаются до первого обновления: каскад видит состояние до изменения
+            levels = self._cascade(deleted)
+            changed = []
+            for model, pks in levels:
+                querysets = [model._base_manager.using(self.db).filter(pk__in=chunk) for chunk in self._pk_chunks(pks)]
+                for queryset in querysets:
+                    queryset.update(is_deleted=deleted, deleted_at=now if deleted else None, updated_at=now)
+                changed.append((model, querysets))
+            for model, querysets in changed:
+                for queryset in querysets:
+                    soft_delete_changed.send(sender=model, queryset=queryset, deleted=deleted)
+        return len(levels[0][1])
+
+
+class ArchiveQuerySet(SoftDeleteQuerySet):
+    """QuerySet that can also reach rows moved to the model's archive table.
+
+    ``with_archived()`` is the way to read both tables: it returns instances
+    of this model whose ``is_archived`` tells which table they came from.
+    ``get()`` also falls back to the archive when the row is no longer in
+    the hot table. Archived instances are read-only: ``save()`` and
+    ``delete()`` raise ``ValueError`` instead of re-inserting the row.
+
+    Filters applied before ``with_archived()``/``archived()`` are remembered
+    and replayed against the archive table. Limits of that replay:
+
+    - only the model's own columns and forward relations (``owner``,
+      ``listing__city``) can be used; the archive has no reverse relations;
+    - ``annotate()``, ``order_by()`` and slicing are not replayed: filter
+      first, then order or slice the combined result;
+    - ``F()`` expressions must reference columns of the model itself.
+    """
+    # QuerySet, который видит и строки, перенесённые в архивную таблицу модели
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._archive_lookups = ()
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._archive_lookups = self._archive_lookups
+        return clone
+
+    def _filter_or_exclude(self, negate, args, kwargs):
+        clone = super()._filter_or_exclude(negate, args, kwargs)
+        clone._archive_lookups = (*self._archive_lookups, (negate, args, kwargs))
+        return clone
+
+    def archived(self):
+        """Return the matching rows of the archive table (archive model instances)."""
+        # Возвращает подходящие строки архивной таблицы
+        archive = self.model.archive_model
+        if archive is None:
+            return self.none()
+        queryset = archive._default_manager.using(self.db)
+        for negate, args, kwargs in self._archive_lookups:
+            queryset = queryset.exclude(*args, **kwargs) if negate else queryset.filter(*args, **kwargs)
+        return queryset
+
+    def with_archived(self):
+        """Return hot and archived rows together (``UNION ALL``), as instances of this model.
+
+        Instances read from the archive have ``is_archived=True`` and cannot be saved.
+        """
+        # Возвращает строки основной и архивной таблиц вместе (UNION ALL); архивные помечены is_archived
+        if self.model.archive_model is None:
+            return self
+        hot = self.order_by().annotate(is_archived=Value(False, output_field=models.BooleanField()))
+        archived = self.archived().order_by().annotate(is_archived=Value(True, output_field=models.BooleanField()))
+        return hot.union(archived, all=True)
+
+    def get(self, *args, **kwargs):
+        try:
+            return super().get(*args, **kwargs)
+        except self.model.DoesNotExist:
+            # Archived rows cannot be locked or written back through this model
+            # Архивные строки нельзя заблокировать или сохранить через эту модель
+            if self.model.archive_model is None or self.query.select_for_update:
+                raise
+            row = self.archived().filter(*args, **kwargs).first()
+            if row is None:
+                raise
+            fields = [field.attname for field in self.model._meta.concrete_fields]
+            instance = self.model.from_db(self.db, fields, [getattr(row, name) for name in fields])
+            instance.is_archived = True
+            return instance
+
+
+class ActiveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
     """Manager that returns only non-deleted (active) instances."""
     # Менеджер, возвращающий только неудалённые (активные) объекты
     def get_queryset(self):
@@ -17,9 +163,12 @@ class BaseModel(models.Model):
 
     Provides:
     - created_at / updated_at auto timestamps,
-    - is_deleted flag for soft deletion,
+    - is_deleted flag for soft deletion, deleted_at recording when it happened,
     - ActiveManager as default (excludes deleted),
-    - all_objects manager to access all records.
+    - set-based ``soft_delete()`` / ``restore()`` on querysets, cascading
+      along ``soft_delete_cascade``,
+    - all_objects manager to access all records, including rows moved
+      to the archive table (see ``make_archive_model``).
     """
     # Абстрактная базовая модель с мягким удалением и временными метками
 
@@ -35,16 +184,162 @@ class BaseModel(models.Model):
         _('Soft deleted'),  # Мягко удалено
         default=False
     )
+    deleted_at = models.DateTimeField(
+        _('Deleted at'),  # Дата удаления
+        null=True,
+        blank=True,
+        editable=False
+    )
 
     objects = ActiveManager()
-    all_objects = models.Manager()
+    all_objects = ArchiveQuerySet.as_manager()
+
+    # Set by make_archive_model() for models with an archive table
+    # Задаётся make_archive_model() для моделей с архивной таблицей
+    archive_model = None
+
+    # Reverse relations whose rows are soft-deleted and restored with this row
+    # Обратные связи, строки которых удаляются и восстанавливаются вместе с этой строкой
+    soft_delete_cascade = ()
+
+    # True on read-only instances loaded from the archive table by all_objects
+    # True у экземпляров, прочитанных из архивной таблицы через all_objects (только для чтения)
+    is_archived = False
 
     class Meta:
         abstract = True
         ordering = ['-created_at']
 
+    def check_writable(self):
+        """Refuse to write archived instances: the hot table no longer has the row, saving would re-insert it."""
+        # Запрещает запись архивных экземпляров: иначе строка снова появилась бы в основной таблице
+        if self.is_archived:
+            raise ValueError(_("Archived rows are read-only."))  # Архивные строки доступны только для чтения.
+
+    def save(self, *args, **kwargs):
+        self.check_writable()
+        # Keep deleted_at in step with is_deleted, e.g. when the flag is toggled in the admin
+        # deleted_at следует за is_deleted, например при смене флага в админке
+        if self.is_deleted != (self.deleted_at is not None):
+            self.deleted_at = timezone.now() if self.is_deleted else None
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'is_deleted' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'deleted_at'}
+        super().save(*args, **kwargs)
+
     def delete(self, *args, **kwargs):
-        """Performs soft delete by setting is_deleted=True instead of removing from DB."""
+        """Performs soft delete by setting is_deleted=True instead of removing from DB.
+
+        ``deleted_at`` records the deletion time, which decides when the
+        row is moved to the archive table.
+        """
         # Выполняет мягкое удаление: устанавливает is_deleted=True вместо физического удаления
+        self.check_writable()
         self.is_deleted = True
-        self.save(update_fields=['is_deleted'])
\ No newline at end of file
+        self.save(update_fields=['is_deleted', 'deleted_at', 'updated_at'])
+
+
+def make_archive_model(model):
+    """Create the archive table model of a ``BaseModel`` subclass.
+
+    The archive table ``<table>_archive`` has the same columns in the same
+    order, so it can be combined with the hot table in a ``UNION``. Rows are
+    copied as is: timestamps are not auto-filled and foreign keys carry no
+    database constraint or reverse accessor. Call it in the model's module
+    and assign the result to a module-level name.
+    """
+    # Создаёт модель архивной таблицы с теми же столбцами, что и у основной
+    attrs = {
+        '__module__': model.__module__,
+        'Meta': type('Meta', (), {
+            'db_table': f'{model._meta.db_table}_archive',
+            'ordering': model._meta.ordering,
+        }),
+    }
+    for field in model._meta.concrete_fields:
+        if field.is_relation:
+            # Relations are rebuilt by hand: deconstruct() needs the app registry to be ready
+            # Связи создаются вручную: deconstruct() требует готового реестра приложений
+            attrs[field.name] = type(field)(
+                field.remote_field.model,
+                on_delete=models.DO_NOTHING,
+                db_constraint=False,
+                related_name='+',
+                verbose_name=field.verbose_name,
+            )
+            continue
+        name, path, args, kwargs = field.deconstruct()
+        kwargs.pop('auto_now', None)
+        kwargs.pop('auto_now_add', None)
+        attrs[name] = type(field)(*args, **kwargs)
+    archive = type(f'{model.__name__}Archive', (models.Model,), attrs)
+    model.archive_model = archive
+    return archive
+
+
+class OutboxEmail(models.Model):
+    """Email queued in the same transaction as the change it reports.
+
+    Rows are delivered later, in batches over one mail connection, by the
+    ``send_outbox_emails`` command; failed sends are retried with backoff.
+    """
+    # Письмо, поставленное в очередь в той же транзакции, что и изменение; отправляется отдельной командой
+
+    STATUS_CHOICES = [
+        ('pending', _('Pending')),  # Ожидает отправки
+        ('sent', _('Sent')),  # Отправлено
+        ('failed', _('Failed')),  # Не удалось отправить
+    ]
+
+    subject = models.CharField(
+        _('Subject'),  # Тема
+        max_length=255
+    )
+    body = models.TextField(
+        _('Body')  # Текст
+    )
+    from_email = models.CharField(
+        _('From'),  # Отправитель
+        max_length=255
+    )
+    recipients = models.JSONField(
+        _('Recipients')  # Получатели
+    )
+    status = models.CharField(
+        _('Status'),  # Статус
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        _('Attempts'),  # Попытки
+        default=0
+    )
+    last_error = models.TextField(
+        _('Last error'),  # Последняя ошибка
+        blank=True
+    )
+    available_at = models.DateTimeField(
+        _('Available at'),  # Доступно для отправки с
+        default=timezone.now
+    )
+    created_at = models.DateTimeField(
+        _('Created at'),  # Дата создания
+        auto_now_add=True
+    )
+    sent_at = models.DateTimeField(
+        _('Sent at'),  # Дата отправки
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = _('Outbox email')  # Письмо в очереди
+        verbose_name_plural = _('Outbox emails')  # Очередь писем
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.recipients)} ({self.status})"
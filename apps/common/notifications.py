@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+# Builders return (subject, message, from_email, recipient_list) tuples for the email outbox
+# Функции возвращают кортежи (тема, текст, отправитель, получатели) для очереди писем
+
+
+def booking_created_messages(booking):
+    """Messages for a new booking: confirmation to the tenant, notice to the landlord."""
+    # Письма о новом бронировании: арендатору — подтверждение, арендодателю — уведомление
+    return [
+        (
+            _("Your booking is confirmed — %(title)s") % {"title": booking.listing.title},  # Ваше бронирование подтверждено — %(title)s
+            _("Hello, %(first_name)s!\n\n"
+              "You have successfully booked \"%(title)s\" "
+              "from %(start_date)s to %(end_date)s.\n\n"
+              "Thank you for using %(site_name)s!") % {
+                "first_name": booking.tenant.first_name,
+                "title": booking.listing.title,
+                "start_date": booking.start_date,
+                "end_date": booking.end_date,
+                "site_name": getattr(settings, 'SITE_NAME', 'our platform'),
+            },
+            settings.DEFAULT_FROM_EMAIL,
+            [booking.tenant.email],
+        ),
+        (
+            _("New booking — %(title)s") % {"title": booking.listing.title},  # Новое бронирование — %(title)s
+            _("Hello, %(first_name)s!\n\n"
+              "User %(tenant_email)s has booked your listing "
+              "\"%(title)s\" from %(start_date)s to %(end_date)s.\n\n"
+              "Please confirm the booking in your dashboard.") % {
+                "first_name": booking.listing.owner.first_name,
+                "tenant_email": booking.tenant.email,
+                "title": booking.listing.title,
+                "start_date": booking.start_date,
+                "end_date": booking.end_date,
+            },
+            settings.DEFAULT_FROM_EMAIL,
+            [booking.listing.owner.email],
+        ),
+    ]
+
+
+def booking_confirmed_messages(booking):
+    """Message to the tenant when the landlord confirms the booking."""
+    # Письмо арендатору о подтверждении бронирования арендодателем
+    return [
+        (
+            _("Booking confirmed — %(title)s") % {"title": booking.listing.title},  # Бронирование подтверждено — %(title)s
+            _("Hello, %(first_name)s!\n\n"
+              "The landlord has confirmed your booking "
+              "\"%(title)s\" from %(start_date)s to %(end_date)s.\n\n"
+              "Welcome!") % {
+                "first_name": booking.tenant.first_name,
+                "title": booking.listing.title,
+                "start_date": booking.start_date,
+                "end_date": booking.end_date,
+            },
+            settings.DEFAULT_FROM_EMAIL,
+            [booking.tenant.email],
+        ),
+    ]
+
+
+def booking_cancelled_messages(booking):
+    """Messages to both parties when a booking is cancelled or rejected."""
+    # Письма обеим сторонам об отмене или отклонении бронирования
+    return [
+        (
+            _("Booking cancelled"),  # Бронирование отменено
+            _("Your booking for \"%(title)s\" has been cancelled.") % {"title": booking.listing.title},  # Ваше бронирование для "%(title)s" отменено.
+            settings.DEFAULT_FROM_EMAIL,
+            [booking.tenant.email],
+        ),
+        (
+            _("Booking cancelled"),  # Бронирование отменено
+            _("The booking for your listing \"%(title)s\" has been cancelled.") % {"title": booking.listing.title},  # Бронирование для вашего объявления "%(title)s" отменено.
+            settings.DEFAULT_FROM_EMAIL,
+            [booking.listing.owner.email],
+        ),
+    ]
+
+
+def review_created_messages(review):
+    """Message to the landlord when a new review is posted."""
+    # Письмо арендодателю о новом отзыве
+    return [
+        (
+            _("New review — %(title)s") % {"title": review.listing.title},  # Новый отзыв — %(title)s
+            _("Hello, %(first_name)s!\n\n"
+              "A tenant has left a review for your listing \"%(title)s\":\n\n"
+              "Rating: %(rating)s ★\n"
+              "Comment: %(comment)s\n\n"
+              "Thank you for your work!") % {
+                "first_name": review.listing.owner.first_name,
+                "title": review.listing.title,
+                "rating": review.rating,
+                "comment": review.comment,
+            },
+            settings.DEFAULT_FROM_EMAIL,
+            [review.listing.owner.email],
+        ),
+    ]
+
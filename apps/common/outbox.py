@@ -0,0 +1,98 @@
+from datetime import timedelta
+from logging import getLogger
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = getLogger(__name__)
+
+# Delay before the n-th retry: 1, 2, 4, 8... minutes, capped at one hour
+# Задержка перед n-й повторной попыткой: 1, 2, 4, 8... минут, не более часа
+RETRY_BASE = timedelta(minutes=1)
+RETRY_MAX = timedelta(hours=1)
+
+# How long a worker owns claimed emails before others may pick them up again
+# Сколько захваченные письма принадлежат обработчику, прежде чем их смогут взять другие
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def enqueue_emails(messages):
+    """Store (subject, message, from_email, recipient_list) tuples in the outbox.
+
+    Call inside the transaction that makes the change, so the email exists
+    if and only if the change is committed.
+    """
+    # Сохраняет письма в очередь; вызывать внутри транзакции, вносящей изменение
+    return OutboxEmail.objects.bulk_create([
+        OutboxEmail(subject=str(subject), body=str(body), from_email=from_email, recipients=list(recipients))
+        for subject, body, from_email, recipients in messages
+    ])
+
+
+def retry_delay(attempts):
+    """Return the backoff before the next attempt after ``attempts`` failures."""
+    # Возвращает задержку перед следующей попыткой после attempts неудач
+    return min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+
+
+def claim_batch(batch_size, lease=CLAIM_LEASE):
+    """Claim due pending emails by pushing their ``available_at`` past the lease.
+
+    The claim is a short transaction, so no lock is held while talking to
+    the mail server; if the worker dies mid-batch, the emails become due
+    again when the lease expires (at-least-once delivery).
+    """
+    # Захватывает письма к отправке, сдвигая available_at на время аренды; блокировки при отправке не держатся
+    now = timezone.now()
+    with transaction.atomic():
+        due = OutboxEmail.objects.filter(status="pending", available_at__lte=now)
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        emails = list(due.order_by("id")[:batch_size])
+        for email in emails:
+            email.available_at = now + lease
+        OutboxEmail.objects.bulk_update(emails, ["available_at"])
+    return emails
+
+
+def deliver_batch(batch_size=100, max_attempts=5):
+    """Send one batch of due emails over a single mail connection.
+
+    Returns ``(sent, failed)``. A failed email is retried with exponential
+    backoff until it has been tried ``max_attempts`` times.
+    """
+    # Отправляет одну пачку писем через одно соединение; возвращает (отправлено, с ошибкой)
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+        for email in emails:
+            email.attempts += 1
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, email.recipients, connection=mail_connection
+            )
+            try:
+                message.send(fail_silently=False)
+            except Exception as e:
+                failed += 1
+                email.last_error = str(e)
+                if email.attempts >= max_attempts:
+                    email.status = "failed"
+                    logger.error(f"Giving up on outbox email {email.pk} after {email.attempts} attempts: {e}")
+                else:
+                    email.available_at = timezone.now() + retry_delay(email.attempts)
+            else:
+                sent += 1
+                email.status = "sent"
+                email.sent_at = timezone.now()
+    finally:
+        mail_connection.close()
+        OutboxEmail.objects.bulk_update(emails, ["status", "attempts", "last_error", "available_at", "sent_at"])
+    return sent, failed
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Keyset pagination ordered by ``(-created_at, id)``.
+
+    Cursors point at a position in the ordering instead of an offset, so
+    rows inserted concurrently never shift pages, and no COUNT(*) is issued.
+    Page size defaults to ``REST_FRAMEWORK['PAGE_SIZE']`` and can be changed
+    per request with ``?page_size=`` up to ``max_page_size``.
+    """
+    # Курсорная (keyset) пагинация по (-created_at, id): стабильна при вставках, без COUNT(*)
+
+    ordering = ("-created_at", "id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
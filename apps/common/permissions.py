@@ -1,6 +1,8 @@
 from django.utils.translation import gettext_lazy as _
 from rest_framework import permissions
 
+from .roles import LANDLORD, TENANT, get_request_roles
+
 
 class IsLandlord(permissions.BasePermission):
     """Allow access only to landlords."""
@@ -11,10 +13,9 @@ class IsLandlord(permissions.BasePermission):
     def has_permission(self, request, view):
         """Check if user is authenticated and belongs to the 'Landlords' group."""
         # Проверяет, авторизован ли пользователь и состоит ли в группе арендодателей
-        return (
-            request.user.is_authenticated
-            and request.user.groups.filter(name="Landlords").exists()
-        )
+        # Roles come from the token claim or the per-user cache, not a query per request
+        # Роли берутся из claim токена или кэша пользователя, а не запросом на каждый вызов
+        return LANDLORD in get_request_roles(request)
 
 
 class IsTenant(permissions.BasePermission):
@@ -26,10 +27,7 @@ class IsTenant(permissions.BasePermission):
     def has_permission(self, request, view):
         """Check if user is authenticated and belongs to the 'Tenants' group."""
         # Проверяет, авторизован ли пользователь и состоит ли в группе арендаторов
-        return (
-            request.user.is_authenticated
-            and request.user.groups.filter(name="Tenants").exists()
-        )
+        return TENANT in get_request_roles(request)
 
 
 class IsOwner(permissions.BasePermission):
@@ -43,7 +41,9 @@ class IsOwner(permissions.BasePermission):
         # Проверяет, является ли пользователь владельцем объекта
         if not request.user.is_authenticated:
             return False
-        return obj.owner == request.user
+        # Compare ids: request.user may be a token-backed user, not a User instance
+        # Сравниваем id: request.user может быть пользователем из токена, а не User
+        return obj.owner_id == request.user.pk
 
 
 class IsBookingOwnerOrLandlord(permissions.BasePermission):
@@ -57,4 +57,4 @@ class IsBookingOwnerOrLandlord(permissions.BasePermission):
         # Проверяет, является ли пользователь арендатором бронирования или владельцем объявления
         if not request.user.is_authenticated:
             return False
-        return obj.tenant == request.user or obj.listing.owner == request.user.tenant == request.user or obj.listing.owner == request.userser
\ No newline at end of file
+        return request.user.pk in (obj.tenant_id, obj.listing.owner_id)
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+
+# Role name -> auth group that grants it
+# Название роли -> группа, которая её даёт
+LANDLORD = "landlord"
+TENANT = "tenant"
+ROLE_GROUPS = {
+    LANDLORD: "Landlords",
+    TENANT: "Tenants",
+}
+GROUP_ROLES = {group: role for role, group in ROLE_GROUPS.items()}
+
+# Roles are cached where every worker sees the same entries and invalidations
+# Роли кэшируются там, где все воркеры видят одни и те же записи и их сброс
+ROLE_CACHE_ALIAS = "shared"
+
+# JWT claim carrying the user's roles
+# Claim JWT-токена с ролями пользователя
+ROLES_CLAIM = "roles"
+
+
+def user_roles_cache_key(user_id):
+    return f"roles:user:{user_id}"
+
+
+def group_id_cache_key(group_name):
+    return f"roles:group:{group_name}"
+
+
+def get_user_roles(user):
+    """Return the set of role names of ``user``.
+
+    Resolved at most once per user object (i.e. once per request) and
+    cached per user in the shared cache alias; the cache entry is dropped
+    when the user's group membership changes.
+    """
+    # Возвращает роли пользователя: один раз на объект пользователя, с кэшем на пользователя
+    if not user.is_authenticated:
+        return frozenset()
+    roles = getattr(user, "_roles", None)
+    if roles is not None:
+        return roles
+
+    cache = caches[ROLE_CACHE_ALIAS]
+    key = user_roles_cache_key(user.pk)
+    cached = cache.get(key)
+    if cached is None:
+        cached = sorted(
+            GROUP_ROLES[name]
+            for name in user.groups.filter(name__in=GROUP_ROLES).values_list("name", flat=True)
+        )
+        cache.set(key, cached, settings.ROLE_CACHE_TIMEOUT)
+    user._roles = roles = frozenset(cached)
+    return roles
+
+
+def get_request_roles(request):
+    """Return the roles of the requesting user, preferring the access token claim."""
+    # Возвращает роли пользователя запроса; сначала берёт их из claim токена, без обращения к БД
+    if not request.user.is_authenticated:
+        return frozenset()
+    claims = getattr(request.auth, "payload", None)
+    if claims and ROLES_CLAIM in claims:
+        return frozenset(claims[ROLES_CLAIM])
+    return get_user_roles(request.user)
+
+
+def invalidate_user_roles(user_ids):
+    """Forget the cached roles of the given users."""
+    # Сбрасывает закэшированные роли пользователей
+    caches[ROLE_CACHE_ALIAS].delete_many([user_roles_cache_key(user_id) for user_id in user_ids])
+
+
+def get_role_group_id(role):
+    """Return the id of the group granting ``role``, creating the group on first use."""
+    # Возвращает id группы для роли; группа создаётся при первом обращении
+    cache = caches[ROLE_CACHE_ALIAS]
+    group_name = ROLE_GROUPS[role]
+    key = group_id_cache_key(group_name)
+    group_id = cache.get(key)
+    if group_id is None:
+        group_id = Group.objects.get_or_create(name=group_name)[0].pk
+        cache.set(key, group_id, settings.ROLE_CACHE_TIMEOUT)
+    return group_id
+
+
+def invalidate_role_groups():
+    """Forget the cached group ids (after groups are created, renamed or deleted)."""
+    # Сбрасывает закэшированные id групп
+    caches[ROLE_CACHE_ALIAS].delete_many([group_id_cache_key(name) for name in GROUP_ROLES])
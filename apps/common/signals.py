@@ -1,128 +1,59 @@
 from logging import getLogger
 from typing import Any
-from django.conf import settings
-from django.core.mail import send_mail
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.utils.translation import gettext_lazy as _
 
 from apps.bookings.models import Booking
 from apps.reviews.models import Review
+from .notifications import (
+    booking_cancelled_messages,
+    booking_confirmed_messages,
+    booking_created_messages,
+    review_created_messages,
+)
+from .outbox import enqueue_emails
 
 logger = getLogger(__name__)
 
 
 @receiver(post_save, sender=Booking)
 def send_booking_notifications(sender: Any, instance: Booking, created: bool, **kwargs: Any) -> None:
-    """Send email notifications when a booking is created or status is updated.
+    """Queue email notifications when a booking is created or status is updated.
 
     Triggers:
     - On creation: notify tenant and landlord.
     - On status change to 'confirmed': notify tenant.
     - On status change to 'cancelled': notify both parties.
+
+    Emails go to the outbox in the booking's own transaction and are sent
+    later by ``send_outbox_emails``, so SMTP latency never hits the request.
     """
-    # Отправляет email-уведомления при создании или обновлении статуса бронирования
+    # Ставит email-уведомления в очередь при создании или обновлении статуса бронирования
 
     try:
         if created:
-            # Notify tenant: "Your booking is confirmed"
-            send_mail(
-                subject=_("Your booking is confirmed — %(title)s") % {"title": instance.listing.title},  # Ваше бронирование подтверждено — %(title)s
-                message=_("Hello, %(first_name)s!\n\n"
-                          "You have successfully booked \"%(title)s\" "
-                          "from %(start_date)s to %(end_date)s.\n\n"
-                          "Thank you for using %(site_name)s!") % {
-                    "first_name": instance.tenant.first_name,
-                    "title": instance.listing.title,
-                    "start_date": instance.start_date,
-                    "end_date": instance.end_date,
-                    "site_name": getattr(settings, 'SITE_NAME', 'our platform'),
-                },
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[instance.tenant.email],
-                fail_silently=False,
-            )
-
-            # Notify landlord: "Your listing has been booked"
-            send_mail(
-                subject=_("New booking — %(title)s") % {"title": instance.listing.title},  # Новое бронирование — %(title)s
-                message=_("Hello, %(first_name)s!\n\n"
-                          "User %(tenant_email)s has booked your listing "
-                          "\"%(title)s\" from %(start_date)s to %(end_date)s.\n\n"
-                          "Please confirm the booking in your dashboard.") % {
-                    "first_name": instance.listing.owner.first_name,
-                    "tenant_email": instance.tenant.email,
-                    "title": instance.listing.title,
-                    "start_date": instance.start_date,
-                    "end_date": instance.end_date,
-                },
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[instance.listing.owner.email],
-                fail_silently=False,
-            )
-
+            messages = booking_created_messages(instance)
         elif instance.status == "confirmed" and "status" in (kwargs.get("update_fields") or []):
-            # Notify tenant: "Booking confirmed"
-            send_mail(
-                subject=_("Booking confirmed — %(title)s") % {"title": instance.listing.title},  # Бронирование подтверждено — %(title)s
-                message=_("Hello, %(first_name)s!\n\n"
-                          "The landlord has confirmed your booking "
-                          "\"%(title)s\" from %(start_date)s to %(end_date)s.\n\n"
-                          "Welcome!") % {
-                    "first_name": instance.tenant.first_name,
-                    "title": instance.listing.title,
-                    "start_date": instance.start_date,
-                    "end_date": instance.end_date,
-                },
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[instance.tenant.email],
-                fail_silently=False,
-            )
-
+            messages = booking_confirmed_messages(instance)
         elif instance.status == "cancelled" and "status" in (kwargs.get("update_fields") or []):
-            # Notify tenant: "Booking cancelled"
-            send_mail(
-                subject=_("Booking cancelled"),  # Бронирование отменено
-                message=_("Your booking for \"%(title)s\" has been cancelled.") % {"title": instance.listing.title},  # Ваше бронирование для "%(title)s" отменено.
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[instance.tenant.email],
-                fail_silently=False,
-            )
-            # Notify landlord: "Booking cancelled"
-            send_mail(
-                subject=_("Booking cancelled"),  # Бронирование отменено
-                message=_("The booking for your listing \"%(title)s\" has been cancelled.") % {"title": instance.listing.title},  # Бронирование для вашего объявления "%(title)s" отменено.
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[instance.listing.owner.email],
-                fail_silently=False,
-            )
-
+            messages = booking_cancelled_messages(instance)
+        else:
+            return
     except Exception as e:
-        logger.error(f"Failed to send booking notification email: {e}", exc_info=True)
+        logger.error(f"Failed to build booking notification email: {e}", exc_info=True)
+        return
+    enqueue_emails(messages)
 
 
 @receiver(post_save, sender=Review)
 def send_review_notification(sender: Any, instance: Review, created: bool, **kwargs: Any) -> None:
-    """Send email to landlord when a new review is posted."""
-    # Отправляет email арендодателю при появлении нового отзыва
+    """Queue an email to the landlord when a new review is posted."""
+    # Ставит в очередь email арендодателю при появлении нового отзыва
 
     if created:
         try:
-            send_mail(
-                subject=_("New review — %(title)s") % {"title": instance.listing.title},  # Новый отзыв — %(title)s
-                message=_("Hello, %(first_name)s!\n\n"
-                          "A tenant has left a review for your listing \"%(title)s\":\n\n"
-                          "Rating: %(rating)s ★\n"
-                          "Comment: %(comment)s\n\n"
-                          "Thank you for your work!") % {
-                    "first_name": instance.listing.owner.first_name,
-                    "title": instance.listing.title,
-                    "rating": instance.rating,
-                    "comment": instance.comment,
-                },
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[instance.listing.owner.email],
-                fail_silently=False,
-            )
+            messages = review_created_messages(instance)
         except Exception as e:
-            logger.error(f"Failed to send review notification email: {e}", exc_info=True)
\ No newline at end of file
+            logger.error(f"Failed to build review notification email: {e}", exc_info=True)
+            return
+        enqueue_emails(messages)
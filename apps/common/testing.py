@@ -0,0 +1,32 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountAssertionsMixin:
+    """TestCase mixin for catching N+1 queries."""
+    # Миксин для TestCase, выявляющий N+1 запросы
+
+    def assertConstantQueryCount(self, add_rows, request, sizes=(1, 10)):
+        """Assert ``request()`` runs the same number of queries whatever the dataset size.
+
+        ``add_rows(n)`` must add ``n`` more rows to the data the request returns;
+        it is called so that the dataset grows to each of ``sizes`` in turn.
+        Returns the (constant) query count.
+        """
+        # Проверяет, что request() выполняет одинаковое число запросов при любом объёме данных
+        counts = {}
+        captured = {}
+        current = 0
+        for size in sizes:
+            add_rows(size - current)
+            current = size
+            with CaptureQueriesContext(connection) as ctx:
+                request()
+            counts[size] = len(ctx.captured_queries)
+            captured[size] = [query['sql'] for query in ctx.captured_queries]
+
+        if len(set(counts.values())) > 1:
+            smallest, largest = sizes[0], sizes[-1]
+            extra = "\n".join(captured[largest][counts[smallest]:][:5])
+            self.fail(f"Query count grows with the number of rows {counts}. Extra queries:\n{extra}")
+        return counts[sizes[0]]
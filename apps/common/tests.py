@@ -1,3 +1,309 @@
-from django.test import TestCase
+from io import StringIO
+
+from django.contrib.auth.models import Group
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.bookings.models import BookedNight, Booking, BookingArchive
+from apps.listings.models import Listing, ListingArchive
+from apps.reviews.models import Review, ReviewArchive
+from apps.users.models import User
+from .models import OutboxEmail
+from .testing import QueryCountAssertionsMixin
+from .outbox import deliver_batch
+from .roles import LANDLORD, TENANT, get_role_group_id, get_user_roles, user_roles_cache_key
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    """Email backend whose every send fails, for retry tests."""
+
+    def send_messages(self, email_messages):
+        raise ConnectionError("SMTP unavailable")
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        self.tenant.groups.add(Group.objects.get_or_create(name='Tenants')[0])
+        self.listing = Listing.objects.create(
+            owner=landlord, title="Уютная квартира", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+
+    def book(self):
+        start = timezone.now().date() + timezone.timedelta(days=10)
+        booking = Booking(
+            listing=self.listing, tenant=self.tenant,
+            start_date=start, end_date=start + timezone.timedelta(days=2),
+        )
+        booking.save()
+        return booking
+
+    def test_booking_queues_emails_without_sending(self):
+        self.book()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            sorted(r for e in OutboxEmail.objects.all() for r in e.recipients),
+            ["landlord@test.com", "tenant@test.com"],
+        )
+
+    def test_command_delivers_pending_emails(self):
+        self.book()
+        call_command('send_outbox_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(OutboxEmail.objects.exclude(status='sent').exists())
+        # Nothing left to send on a second run
+        call_command('send_outbox_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+
+    @override_settings(EMAIL_BACKEND='apps.common.tests.FailingEmailBackend')
+    def test_failed_emails_are_retried_then_given_up(self):
+        self.book()
+        self.assertEqual(deliver_batch(max_attempts=2), (0, 2))
+        email = OutboxEmail.objects.first()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertGreater(email.available_at, timezone.now())
+        self.assertIn("SMTP unavailable", email.last_error)
+
+        # Not due yet: the backoff keeps it out of the next batch
+        self.assertEqual(deliver_batch(max_attempts=2), (0, 0))
+        OutboxEmail.objects.update(available_at=timezone.now())
+        self.assertEqual(deliver_batch(max_attempts=2), (0, 2))
+        self.assertEqual(set(OutboxEmail.objects.values_list('status', flat=True)), {'failed'})
+
+
+class RoleCacheTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.user = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.user.groups.add(get_role_group_id(LANDLORD))
+
+    def test_roles_are_cached_per_user(self):
+        self.assertEqual(get_user_roles(User.objects.get(pk=self.user.pk)), {LANDLORD})
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_roles(user), {LANDLORD})
+
+    def test_membership_change_invalidates_cache(self):
+        get_user_roles(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        user.groups.add(get_role_group_id(TENANT))
+        self.assertEqual(get_user_roles(User.objects.get(pk=self.user.pk)), {LANDLORD, TENANT})
+
+        Group.objects.get(name="Landlords").user_set.remove(user)
+        self.assertEqual(get_user_roles(User.objects.get(pk=self.user.pk)), {TENANT})
+
+    def test_revocation_reaches_other_workers(self):
+        get_user_roles(self.user)
+        # Another worker process: its own client on the same cache backend
+        # Другой воркер: свой клиент на том же бэкенде кэша
+        other_worker = caches.create_connection('shared')
+        self.assertEqual(other_worker.get(user_roles_cache_key(self.user.pk)), [LANDLORD])
+
+        Group.objects.get(name="Landlords").user_set.remove(self.user)
+        self.assertIsNone(other_worker.get(user_roles_cache_key(self.user.pk)))
+
+    def test_token_claim_skips_group_query(self):
+        client = APIClient()
+        response = client.post(
+            reverse("login"), {"email": "landlord@test.com", "password": "securepassword123"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        caches['shared'].clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(reverse("listing-list"), {
+                "title": "Уютная квартира", "description": "Рядом с парком", "city": "Berlin",
+                "price": 100, "rooms": 2, "housing_type": "apartment",
+            }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse([q for q in queries if "auth_group" in q["sql"]])
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        self.listing = Listing.objects.create(
+            owner=self.landlord, title="Уютная квартира", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+        today = timezone.now().date()
+        self.booking = Booking.objects.bulk_create([Booking(
+            listing=self.listing, tenant=self.tenant, status='completed', total_price=300,
+            start_date=today - timezone.timedelta(days=10), end_date=today - timezone.timedelta(days=7),
+        )])[0]
+        self.review = Review.objects.create(booking=self.booking, rating=5, comment="Отлично")
+
+    def delete_long_ago(self, *objs):
+        deleted_at = timezone.now() - timezone.timedelta(days=365)
+        for obj in objs:
+            type(obj).all_objects.filter(pk=obj.pk).update(is_deleted=True, deleted_at=deleted_at)
+
+    def test_soft_delete_records_deletion_time(self):
+        before = Listing.all_objects.get(pk=self.listing.pk).updated_at
+        self.listing.delete()
+        listing = Listing.all_objects.get(pk=self.listing.pk)
+        self.assertGreater(listing.updated_at, before)
+        self.assertGreater(listing.deleted_at, before)
+
+        listing.is_deleted = False
+        listing.save()
+        self.assertIsNone(Listing.objects.get(pk=self.listing.pk).deleted_at)
+
+    def test_moves_long_deleted_rows_to_archive(self):
+        self.delete_long_ago(self.review, self.booking, self.listing)
+        call_command('archive_deleted', stdout=StringIO())
+
+        self.assertFalse(Listing._base_manager.filter(pk=self.listing.pk).exists())
+        self.assertTrue(ListingArchive.objects.filter(pk=self.listing.pk, owner=self.landlord).exists())
+        self.assertTrue(BookingArchive.objects.filter(pk=self.booking.pk).exists())
+        self.assertEqual(ReviewArchive.objects.get(pk=self.review.pk).comment, "Отлично")
+
+        archived = Listing.all_objects.get(pk=self.listing.pk)
+        self.assertIsInstance(archived, Listing)
+        self.assertTrue(archived.is_deleted)
+        self.assertEqual(archived.title, "Уютная квартира")
+        with self.assertRaises(Listing.DoesNotExist):
+            Listing.objects.get(pk=self.listing.pk)
+        self.assertEqual(
+            [booking.pk for booking in Booking.all_objects.filter(tenant=self.tenant).with_archived()],
+            [self.booking.pk],
+        )
+
+    def test_archived_instances_are_read_only(self):
+        upcoming = Booking(
+            listing=self.listing, tenant=self.tenant,
+            start_date=timezone.now().date() + timezone.timedelta(days=10),
+            end_date=timezone.now().date() + timezone.timedelta(days=12),
+        )
+        upcoming.save()
+        self.delete_long_ago(self.review, self.booking)
+        call_command('archive_deleted', stdout=StringIO())
+
+        rows = {b.pk: b.is_archived for b in Booking.all_objects.filter(tenant=self.tenant).with_archived()}
+        self.assertEqual(rows, {self.booking.pk: True, upcoming.pk: False})
+
+        archived = Booking.all_objects.get(pk=self.booking.pk)
+        self.assertTrue(archived.is_archived)
+        with self.assertRaises(ValueError):
+            archived.save(skip_validation=True)
+        with self.assertRaises(ValueError):
+            archived.delete()
+        self.assertFalse(Booking._base_manager.filter(pk=self.booking.pk).exists())
+
+    def test_keeps_recent_and_referenced_rows(self):
+        self.review.delete()
+        self.delete_long_ago(self.listing)
+        call_command('archive_deleted', stdout=StringIO())
+
+        # The review is deleted too recently, the listing still has a live booking
+        # Отзыв удалён недавно, у объявления ещё есть действующее бронирование
+        self.assertTrue(Review.all_objects.filter(pk=self.review.pk).exists())
+        self.assertTrue(Listing.all_objects.filter(pk=self.listing.pk).exists())
+        self.assertFalse(ListingArchive.objects.exists())
+        self.assertFalse(ReviewArchive.objects.exists())
+
+
+class SoftDeleteQuerySetTests(QueryCountAssertionsMixin, TestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.tenant = User.objects.create_user(
+            email="tenant@test.com", first_name="Tenant", password="securepassword123"
+        )
+        self.listing, self.past, self.review, self.upcoming = self.add_listing()
+
+    def add_listing(self):
+        """Create a listing with a reviewed past booking and an upcoming one."""
+        listing = Listing.objects.create(
+            owner=self.landlord, title="Уютная квартира", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+        today = timezone.now().date()
+        past = Booking.objects.bulk_create([Booking(
+            listing=listing, tenant=self.tenant, status='completed', total_price=300,
+            start_date=today - timezone.timedelta(days=10), end_date=today - timezone.timedelta(days=7),
+        )])[0]
+        review = Review.objects.create(booking=past, rating=4, comment="Хорошо")
+        upcoming = Booking(
+            listing=listing, tenant=self.tenant,
+            start_date=today + timezone.timedelta(days=10), end_date=today + timezone.timedelta(days=13),
+        )
+        upcoming.save()
+        return listing, past, review, upcoming
+
+    def test_statement_count_does_not_grow_with_rows(self):
+        def add_rows(n):
+            for _ in range(n):
+                self.add_listing()
+
+        def request():
+            Listing.objects.soft_delete()
+            Listing.all_objects.restore()
+
+        self.assertConstantQueryCount(add_rows, request, sizes=(2, 10))
+        self.assertEqual(Listing.objects.count(), 11)
+        self.assertEqual(BookedNight.objects.count(), 11 * 3)
+        self.assertEqual(set(Listing.objects.values_list('review_count', flat=True)), {1})
+
+    def test_cascades_to_dependents(self):
+        deleted = Listing.objects.filter(pk=self.listing.pk).soft_delete()
+        self.assertEqual(deleted, 1)
+
+        self.assertFalse(Listing.objects.exists())
+        self.assertFalse(Booking.objects.exists())
+        self.assertFalse(Review.objects.exists())
+        self.assertFalse(BookedNight.objects.exists())
+        self.assertEqual(Listing.all_objects.get(pk=self.listing.pk).review_count, 0)
+
+    def test_restore_brings_back_only_the_cascade(self):
+        Booking.objects.filter(pk=self.upcoming.pk).soft_delete()
+        Listing.objects.filter(pk=self.listing.pk).soft_delete()
+
+        restored = Listing.all_objects.filter(pk=self.listing.pk).restore()
+        self.assertEqual(restored, 1)
+        self.assertEqual(list(Booking.objects.values_list('pk', flat=True)), [self.past.pk])
+        self.assertTrue(Review.objects.filter(pk=self.review.pk).exists())
+        listing = Listing.objects.get(pk=self.listing.pk)
+        self.assertEqual((listing.review_count, listing.rating_avg), (1, 4))
+        # The booking deleted on its own earlier stays deleted and keeps its nights free
+        # Бронирование, удалённое раньше отдельно, остаётся удалённым, его ночи свободны
+        self.assertFalse(BookedNight.objects.exists())
+
+    def test_restore_cascade_survives_later_writes_to_the_parent(self):
+        Listing.objects.filter(pk=self.listing.pk).soft_delete()
+        # Touching the deleted listing afterwards must not detach its cascade
+        # Изменение удалённого объявления не должно отрывать от него каскад
+        Listing.all_objects.filter(pk=self.listing.pk).update(updated_at=timezone.now())
+        Listing.all_objects.filter(pk=self.listing.pk).restore()
+        self.assertEqual(Booking.objects.count(), 2)
+        self.assertTrue(Review.objects.filter(pk=self.review.pk).exists())
+
+    def test_restoring_active_booking_takes_its_nights_again(self):
+        Booking.objects.filter(pk=self.upcoming.pk).soft_delete()
+        self.assertFalse(BookedNight.objects.exists())
+        Booking.all_objects.filter(pk=self.upcoming.pk).restore()
+        self.assertEqual(BookedNight.objects.filter(booking=self.upcoming).count(), 3)
 
-# Create your tests here.
@@ -55,18 +55,13 @@ def validate_booking_duration(start_date, end_date, min_nights=1, max_nights=365
 
 
 def validate_no_overlapping_booking(listing, start_date, end_date, exclude_id=None):
-    """Ensure no active overlapping bookings exist for the listing."""
-    # Проверяет, что нет пересекающихся активных бронирований
-    from apps.bookings.models import Booking
-    overlapping = Booking.objects.filter(
-        listing=listing,
-        status__in=['pending', 'confirmed'],
-        start_date__lt=end_date,
-        end_date__gt=start_date
-    )
-    if exclude_id:
-        overlapping = overlapping.exclude(pk=exclude_id)
-    if overlapping.exists():
+    """Ensure no active overlapping bookings exist for the listing.
+
+    Probes the booked-nights calendar (unique index on listing, night).
+    """
+    # Проверяет, что нет пересекающихся активных бронирований (по календарю занятых ночей)
+    from apps.bookings.availability import occupied_nights
+    if occupied_nights(listing, start_date, end_date, exclude_booking_id=exclude_id).exists():
         raise ValidationError(
             _("This property is already booked for the selected dates.")  # Это жильё уже забронировано на выбранные даты.
         )
@@ -75,7 +70,7 @@ def validate_no_overlapping_booking(listing, start_date, end_date, exclude_id=No
 def validate_not_own_listing(user, listing):
     """Prevent users from booking their own listings."""
     # Проверяет, что пользователь не бронирует своё жильё
-    if listing.owner == user:
+    if listing.owner_id == user.pk:
         raise ValidationError(
             _("You cannot book your own listing.")  # Вы не можете забронировать своё собственное жильё.
         )
@@ -1,3 +1,164 @@
-from django.shortcuts import render
+import json
+from hashlib import md5
 
-# Create your views here.
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_etags
+from django.utils.translation import get_language
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .cache import get_cache_versions
+
+
+def data_etag(data):
+    """Return a strong ETag for serialized response data."""
+    # Возвращает строгий ETag для сериализованных данных ответа
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True, ensure_ascii=False)
+    return quote_etag(md5(payload.encode()).hexdigest())
+
+
+def etag_matches(request, etag):
+    """Whether the request's If-None-Match already names ``etag``."""
+    # Совпадает ли If-None-Match запроса с etag
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in etags or etag in etags
+
+
+class CachedResponseMixin:
+    """Cache GET responses of anonymous visitors in the ``responses`` cache.
+
+    The key covers the host, path (with the language prefix), active
+    language, normalized query parameters and the current values of the
+    version stamps named by ``get_response_cache_versions()``; bumping any
+    of them makes every dependent entry unreachable. The stamps are kept in
+    the same cache alias as the entries, so every worker sharing that
+    backend sees an invalidation at once. Responses carry an
+    ETag, and a matching ``If-None-Match`` gets a 304 straight from the
+    cache, without touching the database or serializers.
+    """
+    # Кэширует GET-ответы для анонимных посетителей; инвалидация — через версии, ETag/304 без сериализации
+
+    response_cache_alias = "responses"
+    response_cache_timeout = None  # seconds; None uses RESPONSE_CACHE_TIMEOUT
+
+    def get_response_cache_versions(self):
+        """Names of the version stamps this response depends on."""
+        # Имена версий, от которых зависит ответ
+        return []
+
+    def get_response_cache_timeout(self):
+        return self.response_cache_timeout or settings.RESPONSE_CACHE_TIMEOUT
+
+    def get_response_cache_key(self, request):
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values if value != ""
+        )
+        versions = sorted(get_cache_versions(self.get_response_cache_versions(), self.response_cache_alias).items())
+        raw = json.dumps([request.get_host(), request.path, get_language(), params, versions])
+        return f"response:{type(self).__name__}:{md5(raw.encode()).hexdigest()}"
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+
+        cache = caches[self.response_cache_alias]
+        key = self.get_response_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            entry = (data_etag(response.data), response.data)
+            cache.set(key, entry, self.get_response_cache_timeout())
+        else:
+            response = Response(entry[1])
+
+        etag = entry[0]
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response["ETag"] = etag
+        return response
+
+
+class ConditionalGetMixin:
+    """Answer detail GETs with ``304 Not Modified`` based on ``updated_at``.
+
+    When the client sends ``If-None-Match`` or ``If-Modified-Since``, the
+    validators come from a one-column query run before the object is
+    loaded and serialized, and the view stops there if they still match.
+    Plain GETs cost nothing extra: ``ETag`` and ``Last-Modified`` are taken
+    from the loaded object. Views whose object permissions restrict reads
+    override ``get_conditional_queryset()`` with the same restriction, so
+    the shortcut never answers for inaccessible objects. Views that
+    serialize fields of related rows override ``get_last_modified_expression()``
+    and ``get_object_last_modified()`` so those rows change the validators too.
+    """
+    # Отвечает 304 на GET по updated_at; лёгкий запрос выполняется только для условных запросов
+
+    last_modified_field = "updated_at"
+
+    def get_conditional_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_last_modified_expression(self):
+        """Return the expression the single-column query selects."""
+        # Возвращает выражение, которое выбирает запрос по одному столбцу
+        return F(self.last_modified_field)
+
+    def get_object_last_modified(self, obj):
+        """Return the same value as ``get_last_modified_expression()`` for a loaded object."""
+        # Возвращает то же значение, что и get_last_modified_expression(), для загруженного объекта
+        return getattr(obj, self.last_modified_field)
+
+    def get_last_modified(self):
+        """Return the object's ``updated_at`` (single-column query), or None if it is not found."""
+        # Возвращает updated_at объекта одним запросом по одному столбцу (или None)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return (
+            self.get_conditional_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .order_by()
+            .annotate(conditional_last_modified=self.get_last_modified_expression())
+            .values_list("conditional_last_modified", flat=True)
+            .first()
+        )
+
+    def get_object(self):
+        self.object = obj = super().get_object()
+        return obj
+
+    def get_validators(self, last_modified):
+        """Return the ``(etag, last_modified)`` pair for ``updated_at``."""
+        # Возвращает пару (etag, last_modified) для значения updated_at
+        timestamp = last_modified.timestamp()
+        return quote_etag(f"{self.last_modified_field}-{timestamp:.6f}"), int(timestamp)
+
+    def get(self, request, *args, **kwargs):
+        last_modified = None
+        if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+            last_modified = self.get_last_modified()
+            if last_modified is not None:
+                etag, timestamp = self.get_validators(last_modified)
+                not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+                if not_modified is not None:
+                    return not_modified
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            obj = getattr(self, "object", None)
+            if obj is not None:
+                last_modified = self.get_object_last_modified(obj)
+            elif last_modified is None:
+                last_modified = self.get_last_modified()
+            if last_modified is not None:
+                etag, timestamp = self.get_validators(last_modified)
+                if not response.has_header("ETag"):
+                    response["ETag"] = etag
+                response["Last-Modified"] = http_date(timestamp)
+        return response
@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from .models import SearchQuery, ViewHistory
+from apps.common.admin import SoftDeleteAdminMixin
+from .models import SearchQuery, SearchQueryCount, ViewHistory
 
 
 @admin.register(SearchQuery)
-class SearchQueryAdmin(admin.ModelAdmin):
+class SearchQueryAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
     """Admin interface for search query history."""
     # Админка истории поисковых запросов
 
@@ -22,7 +23,7 @@ class SearchQueryAdmin(admin.ModelAdmin):
 
 
 @admin.register(ViewHistory)
-class ViewHistoryAdmin(admin.ModelAdmin):
+class ViewHistoryAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
     """Admin interface for listing view history."""
     # Админка истории просмотров объявлений
 
@@ -42,4 +43,18 @@ class ViewHistoryAdmin(admin.ModelAdmin):
     def listing_title(self, obj):
         """Display the title of the viewed listing."""
         # Отображает заголовок просмотренного объявления
-        return obj.listing.title if obj.listing else _('Deleted listing')  # Удалённое объявление
\ No newline at end of file
+        return obj.listing.title if obj.listing else _('Deleted listing')  # Удалённое объявление
+
+
+@admin.register(SearchQueryCount)
+class SearchQueryCountAdmin(admin.ModelAdmin):
+    """Read-only admin for daily search query counters."""
+    # Админка (только чтение) ежедневных счётчиков поисковых запросов
+
+    list_display = ('query', 'day', 'count')
+    list_filter = ('day',)
+    search_fields = ('query',)
+    readonly_fields = ('query', 'day', 'count')
+
+    def has_add_permission(self, request):
+        return False
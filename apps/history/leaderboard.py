@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.common.cache import invalidate_cache_versions
+from apps.listings.cache import LEADERBOARD_VERSION
+from .models import Leaderboard, ListingViewCount, ListingViewTotal
+
+# Supported leaderboard windows; None means all time
+# Поддерживаемые периоды рейтинга; None — за всё время
+WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "all": None,
+}
+DEFAULT_WINDOW = "all"
+
+
+def compute_top_listing_ids(window, size):
+    """Aggregate the view counters of visible listings into a top-N list of IDs."""
+    # Агрегирует счётчики просмотров видимых объявлений в топ-N список ID
+    visible = {"listing__is_active": True, "listing__is_deleted": False}
+    period = WINDOWS[window]
+    if period is None:
+        queryset = (
+            ListingViewTotal.objects.filter(**visible)
+            .order_by("-count", "listing_id")
+            .values_list("listing_id", flat=True)
+        )
+    else:
+        since = timezone.now().replace(minute=0, second=0, microsecond=0) - period
+        queryset = (
+            ListingViewCount.objects.filter(hour__gt=since, **visible)
+            .values("listing_id")
+            .annotate(total=Sum("count"))
+            .order_by("-total", "listing_id")
+            .values_list("listing_id", flat=True)
+        )
+    return list(queryset[:size])
+
+
+def refresh_leaderboard(window):
+    """Recompute a window's leaderboard and store it in the database."""
+    # Пересчитывает рейтинг за период и сохраняет его в БД
+    ids = compute_top_listing_ids(window, settings.LEADERBOARD_SIZE)
+    Leaderboard.objects.update_or_create(
+        window=window, defaults={"listing_ids": ids, "computed_at": timezone.now()}
+    )
+    invalidate_cache_versions(LEADERBOARD_VERSION)
+    return ids
+
+
+def get_top_listing_ids(window=DEFAULT_WINDOW, limit=10):
+    """Return up to ``limit`` most viewed listing IDs from the stored leaderboard.
+
+    A missing ranking, or one older than ``LEADERBOARD_MAX_AGE``, is
+    recomputed by the request itself; ``refresh_leaderboards`` run
+    periodically keeps requests from ever paying for it.
+    """
+    # Возвращает до limit самых просматриваемых ID из сохранённого рейтинга; устаревший пересчитывается
+    stored = Leaderboard.objects.filter(window=window).values_list("listing_ids", "computed_at").first()
+    fresh_since = timezone.now() - timedelta(seconds=settings.LEADERBOARD_MAX_AGE)
+    if stored is None or stored[1] < fresh_since:
+        ids = refresh_leaderboard(window)
+    else:
+        ids = stored[0]
+    return ids[:limit]
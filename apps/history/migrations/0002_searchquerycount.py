@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("history", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchQueryCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("query", models.CharField(max_length=255, verbose_name="Search query")),
+                ("day", models.DateField(verbose_name="Day")),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Count")),
+            ],
+            options={
+                "verbose_name": "Search query counter",
+                "verbose_name_plural": "Search query counters",
+                "ordering": ["-day", "-count"],
+                "indexes": [
+                    models.Index(fields=["day"], name="search_query_count_day_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("query", "day"), name="unique_search_query_day"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+
+
+def fill_view_counters(apps, schema_editor):
+    """Build hourly and all-time counters from the existing view history."""
+    # Заполняет почасовые и общие счётчики по существующей истории просмотров
+    ViewHistory = apps.get_model("history", "ViewHistory")
+    ListingViewCount = apps.get_model("history", "ListingViewCount")
+    ListingViewTotal = apps.get_model("history", "ListingViewTotal")
+
+    hourly = (
+        ViewHistory.objects.annotate(hour=TruncHour("created_at"))
+        .values("listing_id", "hour")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    ListingViewCount.objects.bulk_create(
+        [ListingViewCount(listing_id=row["listing_id"], hour=row["hour"], count=row["count"]) for row in hourly],
+        batch_size=1000,
+    )
+    totals = ViewHistory.objects.values("listing_id").annotate(count=Count("id")).order_by()
+    ListingViewTotal.objects.bulk_create(
+        [ListingViewTotal(listing_id=row["listing_id"], count=row["count"]) for row in totals],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("history", "0002_searchquerycount"),
+        ("listings", "0007_listing_city_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListingViewCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField(verbose_name="Hour")),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Count")),
+                (
+                    "listing",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_counts",
+                        to="listings.listing",
+                        verbose_name="Listing",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Hourly listing views",
+                "verbose_name_plural": "Hourly listing views",
+                "indexes": [
+                    models.Index(fields=["hour", "listing"], name="listing_view_count_hour_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("listing", "hour"), name="unique_listing_view_hour"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ListingViewTotal",
+            fields=[
+                (
+                    "listing",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="view_total",
+                        serialize=False,
+                        to="listings.listing",
+                        verbose_name="Listing",
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Count")),
+            ],
+            options={
+                "verbose_name": "Total listing views",
+                "verbose_name_plural": "Total listing views",
+                "indexes": [
+                    models.Index(fields=["-count"], name="listing_view_total_count_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(fill_view_counters, migrations.RunPython.noop),
+    ]
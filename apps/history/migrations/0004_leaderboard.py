@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("history", "0003_listing_view_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Leaderboard",
+            fields=[
+                ("window", models.CharField(max_length=10, primary_key=True, serialize=False, verbose_name="Window")),
+                ("listing_ids", models.JSONField(default=list, verbose_name="Listing IDs")),
+                ("computed_at", models.DateTimeField(verbose_name="Computed at")),
+            ],
+            options={
+                "verbose_name": "Leaderboard",
+                "verbose_name_plural": "Leaderboards",
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:15
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_deleted_at(apps, schema_editor):
+    """Take the deletion time of already deleted rows from their updated_at."""
+    # Заполняет время удаления уже удалённых строк из updated_at
+    for name in ("SearchQuery", "ViewHistory"):
+        model = apps.get_model("history", name)
+        model.objects.filter(is_deleted=True).update(deleted_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("history", "0004_leaderboard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="searchquery",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Deleted at"),
+        ),
+        migrations.AddField(
+            model_name="viewhistory",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Deleted at"),
+        ),
+        migrations.RunPython(fill_deleted_at, migrations.RunPython.noop),
+    ]
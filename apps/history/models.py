@@ -56,4 +56,127 @@ class ViewHistory(BaseModel):
     def __str__(self):
         user = self.user.email if self.user else _("Anonymous")  # Аноним
         listing_title = self.listing.title if self.listing else _("Deleted listing")  # Удалённое объявление
-        return f"{user} → {listing_title}"
\ No newline at end of file
+        return f"{user} → {listing_title}"
+
+
+class SearchQueryCount(models.Model):
+    """Daily counter of normalized search queries.
+
+    A compact aggregate (no timestamps or soft-delete) filled in bulk by the
+    search query aggregator; one row per (query, day).
+    """
+    # Ежедневный счётчик нормализованных поисковых запросов: одна строка на (запрос, день)
+
+    query = models.CharField(
+        _('Search query'),  # Поисковый запрос
+        max_length=255
+    )
+    day = models.DateField(
+        _('Day')  # День
+    )
+    count = models.PositiveIntegerField(
+        _('Count'),  # Количество
+        default=0
+    )
+
+    class Meta:
+        verbose_name = _('Search query counter')  # Счётчик поисковых запросов
+        verbose_name_plural = _('Search query counters')  # Счётчики поисковых запросов
+        ordering = ['-day', '-count']
+        constraints = [
+            models.UniqueConstraint(fields=['query', 'day'], name='unique_search_query_day'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='search_query_count_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day}: {self.query} × {self.count}"
+
+
+class ListingViewCount(models.Model):
+    """Hourly view counter per listing, used for time-windowed leaderboards."""
+    # Почасовой счётчик просмотров объявления для рейтингов за период
+
+    listing = models.ForeignKey(
+        Listing,
+        on_delete=models.CASCADE,
+        verbose_name=_('Listing'),  # Объявление
+        related_name='view_counts'
+    )
+    hour = models.DateTimeField(
+        _('Hour')  # Час
+    )
+    count = models.PositiveIntegerField(
+        _('Count'),  # Количество
+        default=0
+    )
+
+    class Meta:
+        verbose_name = _('Hourly listing views')  # Почасовые просмотры объявления
+        verbose_name_plural = _('Hourly listing views')  # Почасовые просмотры объявлений
+        constraints = [
+            models.UniqueConstraint(fields=['listing', 'hour'], name='unique_listing_view_hour'),
+        ]
+        indexes = [
+            models.Index(fields=['hour', 'listing'], name='listing_view_count_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.listing_id} @ {self.hour:%Y-%m-%d %H:00}: {self.count}"
+
+
+class ListingViewTotal(models.Model):
+    """All-time view counter per listing."""
+    # Общий счётчик просмотров объявления за всё время
+
+    listing = models.OneToOneField(
+        Listing,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name=_('Listing'),  # Объявление
+        related_name='view_total'
+    )
+    count = models.PositiveIntegerField(
+        _('Count'),  # Количество
+        default=0
+    )
+
+    class Meta:
+        verbose_name = _('Total listing views')  # Всего просмотров объявления
+        verbose_name_plural = _('Total listing views')  # Всего просмотров объявлений
+        indexes = [
+            models.Index(fields=['-count'], name='listing_view_total_count_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.listing_id}: {self.count}"
+
+
+class Leaderboard(models.Model):
+    """Stored top-N listing IDs of one time window.
+
+    Kept in the database so a ranking computed by any process (a request
+    or ``refresh_leaderboards``) is read by every worker.
+    """
+    # Сохранённый топ-N ID объявлений за период; хранится в БД, чтобы его видели все воркеры
+
+    window = models.CharField(
+        _('Window'),  # Период
+        max_length=10,
+        primary_key=True
+    )
+    listing_ids = models.JSONField(
+        _('Listing IDs'),  # ID объявлений
+        default=list
+    )
+    computed_at = models.DateTimeField(
+        _('Computed at')  # Дата расчёта
+    )
+
+    class Meta:
+        verbose_name = _('Leaderboard')  # Рейтинг
+        verbose_name_plural = _('Leaderboards')  # Рейтинги
+
+    def __str__(self):
+        return f"{self.window}: {len(self.listing_ids)} @ {self.computed_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,93 @@
+import random
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.buffers import WriteBehindBuffer
+from apps.common.counters import bulk_increment
+from .models import ListingViewCount, ListingViewTotal, SearchQuery, SearchQueryCount, ViewHistory
+
+# Queries this short are not counted (same rule as popular searches)
+# Запросы такой длины и короче не учитываются (как в популярных запросах)
+MIN_QUERY_LENGTH = 3
+
+
+def normalize_query(query):
+    """Lowercase a search query and collapse whitespace."""
+    # Приводит запрос к нижнему регистру и схлопывает пробелы
+    return " ".join(query.lower().split())[:255]
+
+
+class ViewHistoryBuffer(WriteBehindBuffer):
+    """Write-behind buffer turning listing view events into ViewHistory rows.
+
+    The same flush increments the hourly and all-time per-listing view
+    counters that back the popular-listings leaderboard.
+    """
+    # Буфер отложенной записи: события просмотров → строки ViewHistory и счётчики просмотров
+
+    settings_name = "VIEW_HISTORY_BUFFER"
+
+    def flush_batch(self, items):
+        # Raw rows and both counters are written together or not at all
+        # Сырые строки и оба счётчика записываются вместе или не записываются вовсе
+        with transaction.atomic():
+            ViewHistory.objects.bulk_create(
+                [ViewHistory(user_id=user_id, listing_id=listing_id) for user_id, listing_id, _hour in items]
+            )
+            bulk_increment(
+                ListingViewCount, ("listing", "hour"),
+                Counter((listing_id, hour) for _user_id, listing_id, hour in items),
+            )
+            bulk_increment(
+                ListingViewTotal, ("listing",),
+                Counter((listing_id,) for _user_id, listing_id, _hour in items),
+            )
+
+
+class SearchQueryAggregator(WriteBehindBuffer):
+    """Write-behind aggregator for search queries.
+
+    Each flush counts (query, day) pairs in memory and upserts them into
+    ``SearchQueryCount`` in bulk; sampled per-user events are stored as
+    ``SearchQuery`` detail rows.
+    """
+    # Агрегатор поисковых запросов: считает пары (запрос, день) и пакетно пишет счётчики
+
+    settings_name = "SEARCH_QUERY_BUFFER"
+
+    def flush_batch(self, items):
+        counts = Counter((query, day) for query, day, _user_id, _sampled in items)
+        with transaction.atomic():
+            bulk_increment(SearchQueryCount, ("query", "day"), counts)
+            SearchQuery.objects.bulk_create([
+                SearchQuery(user_id=user_id, query=query)
+                for query, _day, user_id, sampled in items if sampled
+            ])
+
+
+view_history_buffer = ViewHistoryBuffer()
+search_query_aggregator = SearchQueryAggregator()
+
+
+def record_view(user_id, listing_id):
+    """Queue a listing view off the request path; return False if it was dropped."""
+    # Ставит просмотр объявления в очередь вне пути запроса; False — если событие отброшено
+    hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+    return view_history_buffer.add((user_id, listing_id, hour))
+
+
+def record_search(query, user_id=None):
+    """Queue a search query for counting; return False if it was dropped or too short.
+
+    Detail rows are kept for authenticated users with probability
+    ``SEARCH_QUERY_DETAIL_SAMPLE_RATE``.
+    """
+    # Ставит поисковый запрос в очередь подсчёта; детальная строка сохраняется выборочно
+    query = normalize_query(query)
+    if len(query) < MIN_QUERY_LENGTH:
+        return False
+    sampled = user_id is not None and random.random() < settings.SEARCH_QUERY_DETAIL_SAMPLE_RATE
+    return search_query_aggregator.add((query, timezone.localdate(), user_id, sampled))
@@ -1,13 +1,23 @@
 # apps/history/tests.py
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth.models import Group
 from rest_framework.test import APITestCase
 from rest_framework import status
 from apps.users.models import User
 from apps.listings.models import Listing
-from .models import SearchQuery, ViewHistory
+from .models import Leaderboard, ListingViewCount, ListingViewTotal, SearchQuery, SearchQueryCount, ViewHistory
+from .recorders import record_view, search_query_aggregator, view_history_buffer
 
+SYNC_BUFFER = {"MAX_SIZE": 3, "BATCH_SIZE": 500, "FLUSH_INTERVAL": 2.0, "BACKGROUND": False}
 
+
+@override_settings(VIEW_HISTORY_BUFFER=SYNC_BUFFER, SEARCH_QUERY_BUFFER=SYNC_BUFFER)
 class HistoryTests(APITestCase):
     def setUp(self):
         Group.objects.get_or_create(name='Landlords')
@@ -23,6 +33,7 @@ class HistoryTests(APITestCase):
         self.client.force_authenticate(user=self.user)
         response = self.client.get('/api/v1/listings/?search=berlin')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        search_query_aggregator.drain()
         self.assertEqual(SearchQuery.objects.count(), 1)
         self.assertEqual(SearchQuery.objects.first().query, 'berlin')
 
@@ -30,5 +41,166 @@ class HistoryTests(APITestCase):
         self.client.force_authenticate(user=self.user)
         response = self.client.get(f'/api/v1/listings/{self.listing.id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        view_history_buffer.drain()
         self.assertEqual(ViewHistory.objects.count(), 1)
-        self.assertEqual(ViewHistory.objects.first().listing, self.listing)
\ No newline at end of file
+        self.assertEqual(ViewHistory.objects.first().listing, self.listing)
+
+
+@override_settings(VIEW_HISTORY_BUFFER=SYNC_BUFFER)
+class ViewHistoryBufferTests(APITestCase):
+    def setUp(self):
+        view_history_buffer.drain()
+        self.user = User.objects.create_user(email="u@test.com", first_name="U", password="pass123")
+        self.listing = Listing.objects.create(
+            owner=self.user, title="Apt", description="Nice", city="Berlin",
+            price=100, rooms=1, housing_type='apartment'
+        )
+        self.url = reverse('listing-detail', args=[self.listing.id])
+
+    def test_views_are_buffered_and_repeat_views_counted(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(ViewHistory.objects.count(), 0)
+        self.assertEqual(view_history_buffer.drain(), 2)
+        self.assertEqual(ViewHistory.objects.filter(user=self.user, listing=self.listing).count(), 2)
+
+    def test_full_buffer_drops_events(self):
+        self.client.force_authenticate(user=self.user)
+        dropped = view_history_buffer.dropped
+        for _ in range(SYNC_BUFFER["MAX_SIZE"] + 2):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(view_history_buffer.dropped - dropped, 2)
+        self.assertEqual(view_history_buffer.drain(), SYNC_BUFFER["MAX_SIZE"])
+
+    def test_failed_flush_writes_nothing(self):
+        # A view without an hour bucket makes the counter insert fail after the raw rows
+        view_history_buffer.add((self.user.id, self.listing.id, None))
+        with self.assertLogs("apps.common.buffers", level="ERROR"):
+            self.assertEqual(view_history_buffer.drain(), 0)
+        self.assertFalse(ViewHistory.objects.exists())
+        self.assertFalse(ListingViewTotal.objects.exists())
+
+
+@override_settings(SEARCH_QUERY_BUFFER=SYNC_BUFFER)
+class SearchQueryAggregatorTests(APITestCase):
+    def setUp(self):
+        search_query_aggregator.drain()
+        self.user = User.objects.create_user(email="u@test.com", first_name="U", password="pass123")
+
+    def search(self, query):
+        response = self.client.get(reverse('listing-list'), {'search': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_queries_counted_per_day(self):
+        self.client.force_authenticate(user=self.user)
+        self.search("Berlin")
+        self.search("  berlin ")
+        self.search("ab")
+        self.client.force_authenticate(user=None)
+        self.search("berlin")
+        search_query_aggregator.drain()
+        self.search("berlin")
+        search_query_aggregator.drain()
+
+        counter = SearchQueryCount.objects.get()
+        self.assertEqual((counter.query, counter.day, counter.count), ("berlin", timezone.localdate(), 4))
+        self.assertEqual(SearchQuery.objects.filter(user=self.user).count(), 2)
+
+    @override_settings(SEARCH_QUERY_DETAIL_SAMPLE_RATE=0.0)
+    def test_detail_rows_are_sampled(self):
+        self.client.force_authenticate(user=self.user)
+        self.search("hamburg")
+        search_query_aggregator.drain()
+        self.assertEqual(SearchQuery.objects.count(), 0)
+        self.assertEqual(SearchQueryCount.objects.get(query="hamburg").count, 1)
+
+
+@override_settings(VIEW_HISTORY_BUFFER=SYNC_BUFFER)
+class PopularListingsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        caches['responses'].clear()
+        view_history_buffer.drain()
+        self.user = User.objects.create_user(email="u@test.com", first_name="U", password="pass123")
+        self.old, self.new = [
+            Listing.objects.create(
+                owner=self.user, title=title, description="Nice", city="Berlin",
+                price=100, rooms=1, housing_type='apartment'
+            )
+            for title in ("Old favourite", "New hit")
+        ]
+
+    def popular(self, **params):
+        response = self.client.get(reverse('popular-listings'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data]
+
+    def test_leaderboard_windows(self):
+        for _ in range(2):
+            record_view(self.user.id, self.new.id)
+        view_history_buffer.drain()
+        ListingViewCount.objects.create(
+            listing=self.old, hour=timezone.now() - timedelta(days=3), count=5
+        )
+        ListingViewTotal.objects.create(listing=self.old, count=5)
+
+        self.assertEqual(ListingViewTotal.objects.get(listing=self.new).count, 2)
+        self.assertEqual(self.popular(window="24h"), [self.new.id])
+        self.assertEqual(self.popular(window="7d"), [self.old.id, self.new.id])
+        self.assertEqual(self.popular(limit=1), [self.old.id])
+
+    def test_stored_leaderboard_is_served_until_refreshed(self):
+        self.assertEqual(self.popular(window="24h"), [])
+        self.assertEqual(Leaderboard.objects.get(window="24h").listing_ids, [])
+        record_view(self.user.id, self.new.id)
+        view_history_buffer.drain()
+        self.assertEqual(self.popular(window="24h"), [])
+        call_command('refresh_leaderboards', stdout=StringIO())
+        self.assertEqual(Leaderboard.objects.get(window="24h").listing_ids, [self.new.id])
+        self.assertEqual(self.popular(window="24h"), [self.new.id])
+
+    @override_settings(LEADERBOARD_MAX_AGE=0)
+    def test_stale_leaderboard_is_recomputed_on_request(self):
+        Leaderboard.objects.create(
+            window="all", listing_ids=[self.old.id], computed_at=timezone.now() - timedelta(minutes=5)
+        )
+        ListingViewTotal.objects.create(listing=self.new, count=3)
+        self.assertEqual(self.popular(), [self.new.id])
+        self.assertEqual(Leaderboard.objects.get(window="all").listing_ids, [self.new.id])
+
+
+class PopularSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="u@test.com", first_name="U", password="pass123")
+        self.client.force_authenticate(user=self.user)
+        today = timezone.localdate()
+        SearchQueryCount.objects.bulk_create([
+            SearchQueryCount(query="berlin", day=today, count=3),
+            SearchQueryCount(query="berlin", day=today - timedelta(days=10), count=4),
+            SearchQueryCount(query="hamburg", day=today, count=5),
+        ])
+
+    def popular(self, **params):
+        response = self.client.get(reverse('popular-search'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item['query'], item['count']) for item in response.data]
+
+    def test_sums_daily_buckets_within_window(self):
+        self.assertEqual(self.popular(), [("berlin", 7), ("hamburg", 5)])
+        self.assertEqual(self.popular(days=7), [("hamburg", 5), ("berlin", 3)])
+        self.assertEqual(self.popular(days=7, limit=1), [("hamburg", 5)])
+
+    def test_rollup_backfills_days_without_counters(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        for query in ("Köln", "köln ", "ab"):
+            SearchQuery.objects.create(user=self.user, query=query)
+        SearchQuery.objects.update(created_at=yesterday)
+
+        call_command('rollup_search_queries', '--days', '2', stdout=StringIO())
+        call_command('rollup_search_queries', '--days', '2', stdout=StringIO())
+
+        counter = SearchQueryCount.objects.get(query="köln")
+        self.assertEqual((counter.day, counter.count), (timezone.localdate(yesterday), 2))
@@ -1,49 +1,63 @@
 from datetime import timedelta
 from typing import Any
-from django.db.models import Count
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import generics
 from rest_framework.response import Response
 
-from .models import SearchQuery
+from .models import SearchQueryCount
 from .serializers import PopularSearchSerializer
 
 
+def _bounded_int(value: Any, default: int, maximum: int) -> int:
+    """Parse a positive integer query parameter, clamped to ``maximum``."""
+    # Разбирает положительный целочисленный параметр запроса с ограничением сверху
+    try:
+        return min(max(int(value), 1), maximum)
+    except (TypeError, ValueError):
+        return default
+
+
 @extend_schema_view(
     get=extend_schema(
         summary=_("Popular search queries"),  # Популярные поисковые запросы
         description=_(
-            "Returns top 10 search queries from the last 30 days. "
+            "Returns top search queries from the last N days (default: 10 queries, 30 days). "
             "Only non-empty queries with length > 2 characters are included."
-        ),  # Возвращает топ-10 поисковых запросов за последние 30 дней. Учитываются только непустые запросы длиной > 2 символов.
+        ),  # Возвращает топ поисковых запросов за последние N дней (по умолчанию 10 запросов за 30 дней). Учитываются только непустые запросы длиной > 2 символов.
+        parameters=[
+            ("days", _("Window in days (default 30, max 365)"), "query", int, False),  # Период в днях (по умолчанию 30, не более 365)
+            ("limit", _("Number of queries (default 10, max 50)"), "query", int, False),  # Количество запросов (по умолчанию 10, не более 50)
+        ],
         responses={200: PopularSearchSerializer(many=True)},
     ),
 )
 class PopularSearchView(generics.GenericAPIView):
-    """Return top 10 popular search queries."""
-    # Возвращает топ-10 популярных поисковых запросов
+    """Return top popular search queries summed from daily counters."""
+    # Возвращает популярные поисковые запросы, суммируя ежедневные счётчики
 
     serializer_class = PopularSearchSerializer
 
     def get(self, request, *args: Any, **kwargs: Any) -> Response:
         """Handle GET request for popular search queries."""
         # Обрабатывает GET-запрос для популярных запросов
-        since = timezone.now() - timedelta(days=30)
-
-        queryset = (
-            SearchQuery.objects.filter(
-                is_deleted=False,
-                created_at__gte=since,
-                query__isnull=False,
-                query__length__gt=2,
+        days = _bounded_int(request.query_params.get("days"), 30, 365)
+        limit = _bounded_int(request.query_params.get("limit"), 10, 50)
+
+        cache_key = f"popular-search:{days}:{limit}"
+        data = cache.get(cache_key)
+        if data is None:
+            since = timezone.localdate() - timedelta(days=days - 1)
+            queryset = (
+                SearchQueryCount.objects.filter(day__gte=since)
+                .values("query")
+                .annotate(count=Sum("count"))
+                .order_by("-count", "query")[:limit]
             )
-            .exclude(query="")
-            .values("query")
-            .annotate(count=Count("query"))
-            .order_by("-count")[:10]
-        )
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+            data = self.get_serializer(queryset, many=True).data
+            cache.set(cache_key, data, settings.POPULAR_SEARCH_CACHE_TIMEOUT)
+        return Response(data)
@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+from apps.common.admin import SoftDeleteAdminMixin
 from .models import Listing
 
 
 @admin.register(Listing)
-class ListingAdmin(admin.ModelAdmin):
+class ListingAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
     """Admin interface for managing housing listings."""
     # Админка управления объявлениями о жилье
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ListingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.listings'
+
+    def ready(self):
+        import apps.listings.signals  # ← синхронизация поискового индекса
@@ -0,0 +1,19 @@
+from apps.common.cache import invalidate_cache_versions
+
+# Version stamps of cached listing responses
+# Версии закэшированных ответов по объявлениям
+LISTINGS_VERSION = "listings"  # any listing changed: feeds and popular listings
+DETAILS_VERSION = "listings:details"  # bulk changes: every detail page
+AVAILABILITY_VERSION = "listings:availability"  # booked nights changed: feeds filtered by dates
+LEADERBOARD_VERSION = "listings:leaderboard"  # popular ranking recomputed
+
+
+def listing_version_name(listing_id):
+    return f"listing:{listing_id}"
+
+
+def invalidate_listing_responses(*listing_ids):
+    """Drop cached responses that render the given listings, or all listings if none are given."""
+    # Сбрасывает закэшированные ответы с указанными объявлениями (или со всеми, если не указаны)
+    names = [listing_version_name(pk) for pk in listing_ids] if listing_ids else [DETAILS_VERSION]
+    invalidate_cache_versions(LISTINGS_VERSION, *names)
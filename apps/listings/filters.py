@@ -0,0 +1,51 @@
+from rest_framework import filters
+
+
+class ListingOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter aware of annotated ordering fields such as ``relevance``.
+
+    ``ordering=relevance`` returns the best matches first and is ignored
+    when the queryset carries no relevance annotation (i.e. without search).
+    ``ordering=rating`` returns the best rated listings first. Every
+    ordering ends with ``id``, so rows with equal values keep a stable order
+    across cursor pages.
+    """
+    # Фильтр сортировки с поддержкой аннотированных полей (например, relevance)
+
+    annotated_fields = {"relevance"}
+    ordering_aliases = {
+        "relevance": "-relevance",
+        "-relevance": "relevance",
+        "rating": "-rating_avg",
+        "-rating": "rating_avg",
+    }
+
+    @classmethod
+    def orders_by(cls, request, field):
+        """Return True if the request asks to order by ``field`` (either direction)."""
+        # Возвращает True, если запрос просит сортировку по полю field (в любом направлении)
+        params = request.query_params.get(cls.ordering_param, "")
+        return field in {term.strip().lstrip("-") for term in params.split(",")}
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        """Drop annotated fields the current queryset does not provide."""
+        # Убирает аннотированные поля, которых нет в текущем queryset
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        return [
+            term for term in valid
+            if term.lstrip("-") not in self.annotated_fields
+            or term.lstrip("-") in queryset.query.annotations
+        ]
+
+    def get_ordering(self, request, queryset, view):
+        """Translate ordering aliases into concrete order_by terms."""
+        # Преобразует псевдонимы сортировки в реальные поля order_by
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ordering = [self.ordering_aliases.get(term, term) for term in ordering]
+        # Ties (equal ratings, prices...) need a unique last key, or cursor pages repeat and skip rows
+        # При равных значениях нужен уникальный последний ключ, иначе курсорные страницы повторяют и теряют строки
+        if not {"id", "-id"}.intersection(ordering):
+            ordering.append("id")
+        return ordering
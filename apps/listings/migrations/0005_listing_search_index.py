@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:00
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """Create the vendor-specific full-text index and fill it with visible listings."""
+    # Создаёт полнотекстовый индекс для текущей СУБД и заполняет его видимыми объявлениями
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS listings_listing_fts "
+            "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            "INSERT INTO listings_listing_fts (rowid, title, description) "
+            "SELECT id, title, description FROM listings_listing "
+            "WHERE is_active = 1 AND is_deleted = 0"
+        )
+    elif vendor == "mysql":
+        schema_editor.execute(
+            "CREATE FULLTEXT INDEX listing_fulltext_idx ON listings_listing (title, description)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS listings_listing_fts")
+    elif vendor == "mysql":
+        schema_editor.execute("DROP INDEX listing_fulltext_idx ON listings_listing")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0004_alter_listing_price"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0005_listing_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                fields=["is_active", "is_deleted", "-created_at"],
+                name="listing_visible_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                fields=["is_active", "is_deleted", "price"],
+                name="listing_visible_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                fields=["is_active", "is_deleted", "rooms"],
+                name="listing_visible_rooms_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                fields=["is_active", "is_deleted", "housing_type", "price"],
+                name="listing_visible_type_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["-created_at", "id"],
+                name="listing_live_feed_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+from apps.listings.utils import normalize_city
+
+
+def fill_city_key(apps, schema_editor):
+    """Compute the normalized city key for existing listings."""
+    # Заполняет нормализованный ключ города для существующих объявлений
+    Listing = apps.get_model("listings", "Listing")
+    listings = list(Listing.objects.only("id", "city"))
+    for listing in listings:
+        listing.city_key = normalize_city(listing.city)
+    Listing.objects.bulk_update(listings, ["city_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0006_listing_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="listing",
+            name="city_key",
+            field=models.CharField(
+                default="", editable=False, max_length=100, verbose_name="Normalized city"
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_city_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                fields=["is_active", "is_deleted", "city_key"],
+                name="listing_visible_city_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:00
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    """Compute review aggregates for existing listings."""
+    # Заполняет агрегаты отзывов для существующих объявлений
+    Listing = apps.get_model("listings", "Listing")
+    Review = apps.get_model("reviews", "Review")
+    totals = (
+        Review.objects.filter(is_deleted=False)
+        .values("booking__listing_id")
+        .annotate(count=Count("id"), total=Sum("rating"))
+        .order_by()
+    )
+    listings = []
+    for row in totals:
+        listings.append(Listing(
+            id=row["booking__listing_id"],
+            review_count=row["count"],
+            rating_sum=row["total"],
+            rating_avg=round(row["total"] / row["count"], 2),
+        ))
+    Listing.objects.bulk_update(listings, ["review_count", "rating_sum", "rating_avg"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0007_listing_city_key"),
+        ("reviews", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="listing",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Number of reviews"),
+        ),
+        migrations.AddField(
+            model_name="listing",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Sum of ratings"),
+        ),
+        migrations.AddField(
+            model_name="listing",
+            name="rating_avg",
+            field=models.FloatField(default=0, editable=False, verbose_name="Average rating"),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                fields=["is_active", "is_deleted", "-rating_avg"],
+                name="listing_visible_rating_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                fields=["-rating_avg", "id"],
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                name="listing_live_rating_idx",
+            ),
+        ),
+    ]
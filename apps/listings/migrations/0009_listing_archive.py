@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:30
+
+import apps.common.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0008_listing_rating"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["updated_at"],
+                name="listing_deleted_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ListingArchive",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(verbose_name="Created at")),
+                ("updated_at", models.DateTimeField(verbose_name="Updated at")),
+                ("is_deleted", models.BooleanField(default=False, verbose_name="Soft deleted")),
+                ("title", models.CharField(max_length=255, verbose_name="Title")),
+                ("description", models.TextField(max_length=15000, verbose_name="Description")),
+                ("street", models.CharField(blank=True, max_length=255, verbose_name="Street and house number")),
+                ("city", models.CharField(max_length=100, verbose_name="City")),
+                ("city_key", models.CharField(editable=False, max_length=100, verbose_name="Normalized city")),
+                ("postal_code", models.CharField(blank=True, max_length=10, verbose_name="Postal code")),
+                ("price", models.DecimalField(decimal_places=2, max_digits=10, validators=[apps.common.validators.validate_price_range], verbose_name="Price")),
+                ("rooms", models.PositiveSmallIntegerField(validators=[apps.common.validators.validate_min_rooms], verbose_name="Number of rooms")),
+                ("housing_type", models.CharField(choices=[("apartment", "Apartment"), ("house", "House"), ("studio", "Studio")], max_length=20, verbose_name="Housing type")),
+                ("is_active", models.BooleanField(default=True, verbose_name="Active")),
+                ("owner", models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name="+", to=settings.AUTH_USER_MODEL, verbose_name="Owner")),
+                ("review_count", models.PositiveIntegerField(default=0, editable=False, verbose_name="Number of reviews")),
+                ("rating_sum", models.PositiveIntegerField(default=0, editable=False, verbose_name="Sum of ratings")),
+                ("rating_avg", models.FloatField(default=0, editable=False, verbose_name="Average rating")),
+            ],
+            options={
+                "db_table": "listings_listing_archive",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
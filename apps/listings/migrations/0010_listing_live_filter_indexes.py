@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0009_listing_archive"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="listing",
+            name="listing_visible_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="listing",
+            name="listing_visible_rooms_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="listing",
+            name="listing_visible_type_price_idx",
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["price", "id"],
+                name="listing_live_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["rooms", "id"],
+                name="listing_live_rooms_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["housing_type", "price", "id"],
+                name="listing_live_type_price_idx",
+            ),
+        ),
+    ]
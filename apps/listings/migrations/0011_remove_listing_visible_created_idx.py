@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0010_listing_live_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="listing",
+            name="listing_visible_created_idx",
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0012_deleted_at"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="listing",
+            name="listing_visible_rating_idx",
+        ),
+    ]
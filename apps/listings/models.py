@@ -4,9 +4,10 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
-from apps.common.models import BaseModel
+from apps.common.models import BaseModel, make_archive_model
 from .choices import HOUSING_TYPE_CHOICES
 from apps.common.validators import validate_price_range, validate_min_rooms
+from .utils import normalize_city
 
 
 class Listing(BaseModel):
@@ -30,6 +31,11 @@ class Listing(BaseModel):
         _('City'),  # Город
         max_length=100
     )
+    city_key = models.CharField(
+        _('Normalized city'),  # Нормализованный город
+        max_length=100,
+        editable=False
+    )
     postal_code = models.CharField(
         _('Postal code'),  # Почтовый индекс
         max_length=10,
@@ -60,11 +66,73 @@ class Listing(BaseModel):
         verbose_name=_('Owner'),  # Владелец
         related_name='listings'
     )
+    # Review aggregates, maintained incrementally by apps.reviews.ratings
+    # Агрегаты отзывов, обновляются инкрементально в apps.reviews.ratings
+    review_count = models.PositiveIntegerField(
+        _('Number of reviews'),  # Количество отзывов
+        default=0,
+        editable=False
+    )
+    rating_sum = models.PositiveIntegerField(
+        _('Sum of ratings'),  # Сумма оценок
+        default=0,
+        editable=False
+    )
+    rating_avg = models.FloatField(
+        _('Average rating'),  # Средний рейтинг
+        default=0,
+        editable=False
+    )
+
+    soft_delete_cascade = ('bookings',)
 
     class Meta:
         verbose_name = _('Listing')  # Объявление
         verbose_name_plural = _('Listings')  # Объявления
         ordering = ['-created_at']
+        # Indexes matched to the filter shapes of ListingListView / PopularListingsView
+        # Индексы под комбинации фильтров ListingListView / PopularListingsView
+        indexes = [
+            models.Index(
+                fields=['is_active', 'is_deleted', 'city_key'],
+                name='listing_visible_city_idx',
+            ),
+            # Partial index (SQLite/PostgreSQL) covering only visible listings in feed order
+            # Частичный индекс (SQLite/PostgreSQL) только по видимым объявлениям в порядке ленты
+            models.Index(
+                fields=['-created_at', 'id'],
+                condition=models.Q(is_active=True, is_deleted=False),
+                name='listing_live_feed_idx',
+            ),
+            models.Index(
+                fields=['-rating_avg', 'id'],
+                condition=models.Q(is_active=True, is_deleted=False),
+                name='listing_live_rating_idx',
+            ),
+            # Visibility is tested as bare booleans, which the planner cannot match against
+            # leading index columns, so price/rooms filters and ordering use partial indexes
+            # Видимость проверяется как булево выражение, поэтому для цены и комнат — частичные индексы
+            models.Index(
+                fields=['price', 'id'],
+                condition=models.Q(is_active=True, is_deleted=False),
+                name='listing_live_price_idx',
+            ),
+            models.Index(
+                fields=['rooms', 'id'],
+                condition=models.Q(is_active=True, is_deleted=False),
+                name='listing_live_rooms_idx',
+            ),
+            models.Index(
+                fields=['housing_type', 'price', 'id'],
+                condition=models.Q(is_active=True, is_deleted=False),
+                name='listing_live_type_price_idx',
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(is_deleted=True),
+                name='listing_deleted_idx',
+            ),
+        ]
 
     def clean(self):
         """Validate business rules specific to German housing listings."""
@@ -84,10 +152,19 @@ class Listing(BaseModel):
             })
 
     def save(self, *args, **kwargs):
-        """Ensure model validation is always performed before saving."""
-        # Гарантирует выполнение валидации перед сохранением
+        """Refresh the normalized city key and validate before saving."""
+        # Обновляет нормализованный ключ города и выполняет валидацию перед сохранением
+        self.city_key = normalize_city(self.city)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'city' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'city_key'}
         self.full_clean()
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.title} ({self.city}) — {self.price} €"
\ No newline at end of file
+        return f"{self.title} ({self.city}) — {self.price} €"
+
+
+# Long soft-deleted listings, moved out by the archive_deleted command
+# Давно мягко удалённые объявления, переносятся командой archive_deleted
+ListingArchive = make_archive_model(Listing)
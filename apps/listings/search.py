@@ -0,0 +1,179 @@
+import re
+from logging import getLogger
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+logger = getLogger(__name__)
+
+# SQLite FTS5 virtual table holding the searchable text of visible listings
+# Виртуальная таблица FTS5 с текстом видимых объявлений
+FTS_TABLE = "listings_listing_fts"
+
+# Fields whose change requires re-indexing a listing
+# Поля, изменение которых требует переиндексации объявления
+INDEXED_FIELDS = {"title", "description", "is_active", "is_deleted"}
+
+
+def tokenize(query):
+    """Split a raw search string into lowercase word tokens."""
+    # Разбивает строку поиска на слова в нижнем регистре
+    return re.findall(r"\w+", query.lower())
+
+
+class BaseSearchBackend:
+    """Interface for listing full-text search backends.
+
+    ``search`` must filter the queryset by the query. With ``rank=True`` it
+    also annotates each row with a ``relevance`` score (higher is better);
+    scoring may cost an extra lookup per row, so callers only ask for it
+    when they order by relevance.
+    """
+    # Интерфейс бэкендов полнотекстового поиска по объявлениям
+
+    def search(self, queryset, query, rank=False):
+        raise NotImplementedError
+
+    def index(self, listing):
+        """Add or refresh a listing in the index (no-op by default)."""
+        # Добавляет или обновляет объявление в индексе (по умолчанию ничего не делает)
+
+    def remove(self, listing_id):
+        """Remove a listing from the index (no-op by default)."""
+        # Удаляет объявление из индекса (по умолчанию ничего не делает)
+
+    def index_many(self, queryset):
+        """Add or refresh every listing of a queryset in the index (no-op by default)."""
+        # Добавляет или обновляет в индексе все объявления queryset (по умолчанию ничего не делает)
+
+    def remove_many(self, queryset):
+        """Remove every listing of a queryset from the index (no-op by default)."""
+        # Удаляет из индекса все объявления queryset (по умолчанию ничего не делает)
+
+    def rebuild(self):
+        """Rebuild the whole index from the listings table (no-op by default)."""
+        # Перестраивает индекс по таблице объявлений (по умолчанию ничего не делает)
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Fallback backend using ``icontains`` scans, without ranking."""
+    # Резервный бэкенд на основе icontains, без ранжирования
+
+    def search(self, queryset, query, rank=False):
+        queryset = queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+        if rank:
+            queryset = queryset.annotate(relevance=Value(0.0, output_field=FloatField()))
+        return queryset
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """SQLite FTS5 backend ranking matches with BM25 (title weighted higher)."""
+    # Бэкенд SQLite FTS5 с ранжированием BM25 (заголовок весит больше описания)
+
+    def build_match(self, query):
+        """Build an FTS5 MATCH expression: every token as a quoted prefix."""
+        # Строит выражение MATCH: каждое слово — как префикс в кавычках
+        return " ".join(f'"{token}"*' for token in tokenize(query))
+
+    def search(self, queryset, query, rank=False):
+        match = self.build_match(query)
+        if not match:
+            return queryset.none()
+        queryset = queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        )
+        if not rank:
+            return queryset
+        # BM25 is a correlated lookup per row, only paid for when ordering by it
+        # BM25 считается отдельным подзапросом для каждой строки — только при сортировке по нему
+        table = queryset.model._meta.db_table
+        return queryset.annotate(
+            relevance=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+    def index(self, listing):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [listing.pk])
+            if listing.is_active and not listing.is_deleted:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)",
+                    [listing.pk, listing.title, listing.description],
+                )
+
+    def remove(self, listing_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [listing_id])
+
+    def index_many(self, queryset):
+        self.remove_many(queryset)
+        visible = queryset.filter(is_active=True, is_deleted=False).order_by()
+        sql, params = visible.values_list("id", "title", "description").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, title, description) {sql}", params)
+
+    def remove_many(self, queryset):
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({sql})", params)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description) "
+                f"SELECT id, title, description FROM listings_listing "
+                f"WHERE is_active = 1 AND is_deleted = 0"
+            )
+
+
+class MySQLFullTextBackend(BaseSearchBackend):
+    """MySQL FULLTEXT backend; InnoDB keeps the index in sync by itself."""
+    # Бэкенд MySQL FULLTEXT; InnoDB сам поддерживает индекс в актуальном состоянии
+
+    def build_match(self, query):
+        """Build a boolean-mode expression requiring every token as a prefix."""
+        # Строит выражение BOOLEAN MODE: каждое слово обязательно, как префикс
+        return " ".join(f"+{token}*" for token in tokenize(query))
+
+    def search(self, queryset, query, rank=False):
+        match = self.build_match(query)
+        if not match:
+            return queryset.none()
+        table = queryset.model._meta.db_table
+        score = RawSQL(
+            f"MATCH ({table}.title, {table}.description) AGAINST (%s IN BOOLEAN MODE)",
+            [match],
+            output_field=FloatField(),
+        )
+        # alias() filters on the score without selecting it
+        # alias() фильтрует по оценке, не выбирая её в SELECT
+        if rank:
+            return queryset.annotate(relevance=score).filter(relevance__gt=0)
+        return queryset.alias(relevance=score).filter(relevance__gt=0)
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteFTSBackend,
+    "mysql": MySQLFullTextBackend,
+}
+
+
+def get_search_backend():
+    """Return the configured search backend or the one matching the database vendor.
+
+    ``settings.LISTING_SEARCH_BACKEND`` may hold a dotted path to a
+    ``BaseSearchBackend`` subclass to plug in a custom implementation.
+    """
+    # Возвращает бэкенд из настроек или подходящий для текущей СУБД
+    backend_path = getattr(settings, "LISTING_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+    return VENDOR_BACKENDS.get(connection.vendor, SimpleSearchBackend)()
@@ -15,14 +15,21 @@ class ListingSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'title', 'description', 'street', 'city', 'postal_code',
             'price', 'rooms', 'housing_type', 'is_active',
-            'created_at', 'updated_at', 'owner'
+            'created_at', 'updated_at', 'owner', 'review_count', 'rating_avg'
         )
-        read_only_fields = ('owner', 'is_active', 'created_at', 'updated_at')
+        read_only_fields = ('owner', 'is_active', 'created_at', 'updated_at', 'review_count', 'rating_avg')
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load exactly the columns and joins this serializer renders (no N+1 on owner)."""
+        # Загружает ровно те столбцы и связи, которые выводит сериализатор (без N+1 по owner)
+        return queryset.select_related('owner').only(*cls.Meta.fields, 'owner__email')
 
     def create(self, validated_data):
         """Create a new listing with the current user as owner and active status."""
         # Создаёт новое объявление с текущим пользователем как владельцем и статусом «активно»
-        validated_data['owner'] = self.context['request'].user
+        validated_data.pop('owner', None)
+        validated_data['owner_id'] = self.context['request'].user.pk
         validated_data['is_active'] = True
         return super().create(validated_data)
 
@@ -31,4 +38,13 @@ class ListingSerializer(serializers.ModelSerializer):
         # Обновляет объявление, защищая поля owner и is_active от изменения
         validated_data.pop('owner', None)
         validated_data.pop('is_active', None)
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return super().update(instance, validated_data)
+
+
+class CitySuggestionSerializer(serializers.Serializer):
+    """Serializer for city autocomplete suggestions."""
+    # Сериализатор подсказок городов для автодополнения
+
+    city = serializers.CharField(read_only=True)
+    city_key = serializers.CharField(read_only=True)
+    count = serializers.IntegerField(read_only=True)
@@ -0,0 +1,62 @@
+from logging import getLogger
+from typing import Any
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.models import soft_delete_changed
+from .cache import invalidate_listing_responses
+from .models import Listing
+from .search import INDEXED_FIELDS, get_search_backend
+
+logger = getLogger(__name__)
+
+
+@receiver(post_save, sender=Listing)
+def sync_search_index(sender: Any, instance: Listing, **kwargs: Any) -> None:
+    """Keep the full-text index in sync with listing saves and soft-deletes."""
+    # Синхронизирует полнотекстовый индекс при сохранении и мягком удалении объявления
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    try:
+        get_search_backend().index(instance)
+    except Exception as e:
+        logger.error(f"Failed to index listing {instance.pk}: {e}", exc_info=True)
+
+
+@receiver(post_delete, sender=Listing)
+def remove_from_search_index(sender: Any, instance: Listing, **kwargs: Any) -> None:
+    """Drop a hard-deleted listing from the full-text index."""
+    # Удаляет физически удалённое объявление из полнотекстового индекса
+    try:
+        get_search_backend().remove(instance.pk)
+    except Exception as e:
+        logger.error(f"Failed to remove listing {instance.pk} from search index: {e}", exc_info=True)
+
+
+@receiver(post_save, sender=Listing)
+@receiver(post_delete, sender=Listing)
+def invalidate_cached_responses(sender: Any, instance: Listing, **kwargs: Any) -> None:
+    """Drop cached API responses that render this listing (saves, soft and hard deletes)."""
+    # Сбрасывает закэшированные ответы API с этим объявлением (сохранение, мягкое и физическое удаление)
+    invalidate_listing_responses(instance.pk)
+
+
+@receiver(soft_delete_changed, sender=Listing)
+def sync_bulk_soft_delete(sender: Any, queryset: QuerySet, deleted: bool, **kwargs: Any) -> None:
+    """Apply a bulk soft delete or restore to the full-text index and cached responses.
+
+    The index is updated with one statement per step, and every cached
+    detail page is dropped at once instead of bumping one stamp per listing.
+    """
+    # Применяет массовое мягкое удаление или восстановление к поисковому индексу и кэшу ответов
+    backend = get_search_backend()
+    try:
+        if deleted:
+            backend.remove_many(queryset)
+        else:
+            backend.index_many(queryset)
+    except Exception as e:
+        logger.error(f"Failed to sync search index after a bulk soft delete: {e}", exc_info=True)
+    invalidate_listing_responses()
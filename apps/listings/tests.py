@@ -1,9 +1,26 @@
-from django.test import TestCase
+import tempfile
+import warnings
+from io import StringIO
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import CacheKeyWarning
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from django.contrib.auth.models import Group
 from rest_framework.test import APITestCase
 from rest_framework import status
+from apps.common.cache import version_key
+from apps.common.testing import QueryCountAssertionsMixin
+from apps.history.models import Leaderboard, ListingViewTotal
+from apps.history.recorders import search_query_aggregator, view_history_buffer
 from apps.users.models import User
+from utils.management.commands.explain_listing_queries import find_full_scans, find_sorts
+from .cache import listing_version_name
 from .models import Listing
+from .utils import normalize_city
 
 
 class ListingTests(APITestCase):
@@ -26,7 +43,7 @@ class ListingTests(APITestCase):
         )
         response = self.client.get('/api/v1/listings/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_create_listing_landlord(self):
         self.client.force_authenticate(user=self.landlord)
@@ -47,4 +64,339 @@ class ListingTests(APITestCase):
         self.client.force_authenticate(user=self.tenant)
         data = {"title": "X", "city": "B", "price": 1000, "rooms": 1, "housing_type": "apartment"}
         response = self.client.post('/api/v1/listings/', data)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(SEARCH_QUERY_BUFFER={"BACKGROUND": False})
+class ListingSearchTests(APITestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="L", password="pass123"
+        )
+        self.loft = Listing.objects.create(
+            owner=self.landlord, title="Sunny loft", description="Bright loft near the park",
+            city="Berlin", price=1000, rooms=1, housing_type='apartment'
+        )
+        self.house = Listing.objects.create(
+            owner=self.landlord, title="Family house", description="Garden and a small loft",
+            city="Hamburg", price=2000, rooms=4, housing_type='house'
+        )
+
+    def tearDown(self):
+        # Flush queued events inside the test transaction so nothing leaks into later tests
+        search_query_aggregator.drain()
+
+    def search(self, **params):
+        response = self.client.get(reverse('listing-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+
+    def test_search_matches_word_prefix(self):
+        self.assertEqual(set(self.search(search="gard")), {self.house.id})
+        self.assertEqual(set(self.search(search="loft")), {self.loft.id, self.house.id})
+
+    def test_ordering_by_relevance(self):
+        self.assertEqual(self.search(search="loft", ordering="relevance"), [self.loft.id, self.house.id])
+
+    def test_relevance_is_only_scored_when_ordering_by_it(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.search(search="loft")
+        self.assertNotIn("bm25", " ".join(q['sql'] for q in ctx.captured_queries))
+        with CaptureQueriesContext(connection) as ctx:
+            self.search(search="loft", ordering="-price,relevance")
+        self.assertIn("bm25", " ".join(q['sql'] for q in ctx.captured_queries))
+
+    def test_index_follows_updates_and_soft_delete(self):
+        self.loft.title = "Quiet studio"
+        self.loft.save()
+        self.assertEqual(self.search(search="quiet"), [self.loft.id])
+        self.loft.delete()
+        self.assertEqual(self.search(search="quiet"), [])
+
+    def test_index_follows_bulk_soft_delete_and_restore(self):
+        Listing.objects.soft_delete()
+        self.assertEqual(self.search(search="loft"), [])
+        Listing.all_objects.filter(pk=self.house.pk).restore()
+        self.assertEqual(self.search(search="loft"), [self.house.id])
+
+
+class ListingPaginationTests(APITestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="L", password="pass123"
+        )
+        self.listings = [
+            Listing.objects.create(
+                owner=self.landlord, title=f"Apt {i}", description="Nice",
+                city="Berlin", price=1000, rooms=1, housing_type='apartment'
+            )
+            for i in range(5)
+        ]
+
+    def test_cursor_pages_are_stable_under_inserts(self):
+        response = self.client.get(reverse('listing-list'), {'page_size': 2})
+        seen = [item['id'] for item in response.data['results']]
+        self.assertNotIn('count', response.data)
+        Listing.objects.create(
+            owner=self.landlord, title="Fresh", description="New",
+            city="Berlin", price=1000, rooms=1, housing_type='apartment'
+        )
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += [item['id'] for item in response.data['results']]
+        self.assertEqual(seen, [listing.id for listing in reversed(self.listings)])
+
+    def test_rating_pages_are_complete_across_ties(self):
+        Listing.objects.filter(pk=self.listings[0].pk).update(rating_avg=5)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('listing-list'), {'ordering': 'rating', 'page_size': 2})
+        self.assertIn('"rating_avg" DESC, "listings_listing"."id" ASC', ctx.captured_queries[-1]['sql'])
+        ids = [item['id'] for item in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            ids += [item['id'] for item in response.data['results']]
+        tied = sorted(listing.id for listing in self.listings[1:])
+        self.assertEqual(ids, [self.listings[0].id] + tied)
+
+    def test_no_count_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('listing-list'), {'page_size': 2})
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in ctx.captured_queries))
+
+
+class ListingQueryPlanTests(TestCase):
+    def test_listing_queries_use_indexes(self):
+        call_command('explain_listing_queries', '--fail-on-scan', stdout=StringIO())
+
+    def test_unconstrained_index_scan_with_sort_is_flagged(self):
+        sorted_scan = (
+            "6 0 0 SCAN listings_listing USING INDEX listing_visible_created_idx\n"
+            "40 0 0 USE TEMP B-TREE FOR ORDER BY"
+        )
+        self.assertEqual(len(find_full_scans(sorted_scan, 'sqlite')), 2)
+        self.assertTrue(find_full_scans("5 0 0 SCAN listings_listing", 'sqlite'))
+        # An index walk that yields the ORDER BY, or a bounded search, is not a full scan
+        self.assertEqual(find_full_scans(
+            "6 0 0 SCAN listings_listing USING INDEX listing_live_price_idx", 'sqlite'
+        ), [])
+        searched = (
+            "6 0 0 SEARCH listings_listing USING INDEX listing_live_price_idx (price>? AND price<?)\n"
+            "45 0 0 USE TEMP B-TREE FOR ORDER BY"
+        )
+        self.assertEqual(find_full_scans(searched, 'sqlite'), [])
+        self.assertEqual(find_sorts(searched, 'sqlite'), ["45 0 0 USE TEMP B-TREE FOR ORDER BY"])
+
+
+class CityLookupTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="L", password="pass123"
+        )
+        for city in ("München", "Muenchen", "Frankfurt am Main", "Berlin"):
+            Listing.objects.create(
+                owner=self.landlord, title="Apt", description="Nice",
+                city=city, price=1000, rooms=1, housing_type='apartment'
+            )
+
+    def test_normalize_city(self):
+        self.assertEqual(normalize_city("  MÜNCHEN "), "muenchen")
+        self.assertEqual(normalize_city("Frankfurt-am-Main"), "frankfurt am main")
+        self.assertEqual(normalize_city("Düsseldorf"), normalize_city("Duesseldorf"))
+
+    def test_city_filter_is_case_and_umlaut_insensitive(self):
+        for query in ("münchen", "MUENCHEN", "Mün"):
+            response = self.client.get(reverse('listing-list'), {'city': query})
+            self.assertEqual(len(response.data['results']), 2, query)
+        response = self.client.get(reverse('listing-list'), {'city': 'frankfurt'})
+        self.assertEqual(response.data['results'][0]['city'], "Frankfurt am Main")
+
+    def test_city_autocomplete_counts(self):
+        response = self.client.get(reverse('listing-cities'), {'q': 'mu'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['city_key'], "muenchen")
+        self.assertEqual(response.data[0]['count'], 2)
+
+    def test_city_autocomplete_clamps_limit(self):
+        for limit, expected in (("-1", 1), ("0", 1), ("2", 2), ("abc", 3)):
+            response = self.client.get(reverse('listing-cities'), {'limit': limit})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, limit)
+            self.assertEqual(len(response.data), expected, limit)
+
+    def test_city_autocomplete_accepts_long_prefix(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CacheKeyWarning)
+            response = self.client.get(reverse('listing-cities'), {'q': "m ü " * 200})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+
+@override_settings(VIEW_HISTORY_BUFFER={"BACKGROUND": False})
+class ListingQueryCountTests(QueryCountAssertionsMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.created = 0
+
+    def tearDown(self):
+        view_history_buffer.drain()
+
+    def add_listings(self, n):
+        for _ in range(n):
+            self.created += 1
+            owner = User.objects.create_user(
+                email=f"owner{self.created}@test.com", first_name="O", password="pass123"
+            )
+            listing = Listing.objects.create(
+                owner=owner, title=f"Apt {self.created}", description="Nice",
+                city="Berlin", price=1000, rooms=1, housing_type='apartment'
+            )
+            ListingViewTotal.objects.create(listing=listing, count=self.created)
+        Leaderboard.objects.all().delete()
+        cache.clear()
+
+    def test_list_query_count_is_constant(self):
+        def request():
+            response = self.client.get(reverse('listing-list'), {'page_size': 50})
+            self.assertEqual(len(response.data['results']), self.created)
+            self.assertTrue(response.data['results'][0]['owner'].endswith("@test.com"))
+        self.assertConstantQueryCount(self.add_listings, request)
+
+    def test_popular_query_count_is_constant(self):
+        def request():
+            response = self.client.get(reverse('popular-listings'))
+            self.assertEqual(len(response.data), self.created)
+        self.assertConstantQueryCount(self.add_listings, request)
+
+    def test_detail_loads_owner_in_one_query(self):
+        self.add_listings(1)
+        listing = Listing.objects.get()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('listing-detail', args=[listing.id]))
+        self.assertEqual(response.data['owner'], listing.owner.email)
+
+
+@override_settings(VIEW_HISTORY_BUFFER={"BACKGROUND": False})
+class StatelessAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.landlord = User.objects.create_user(
+            email="landlord@test.com", first_name="Landlord", password="securepassword123"
+        )
+        self.landlord.groups.add(Group.objects.get_or_create(name='Landlords')[0])
+        self.listing = Listing.objects.create(
+            owner=self.landlord, title="Уютная квартира", description="Рядом с парком",
+            city="Berlin", price=100, rooms=2, housing_type='apartment'
+        )
+        response = self.client.post(
+            reverse('login'), {"email": "landlord@test.com", "password": "securepassword123"}, format='json'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def tearDown(self):
+        view_history_buffer.drain()
+
+    def test_detail_does_not_select_user(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('listing-detail', args=[self.listing.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_owner_can_update_with_token_user(self):
+        response = self.client.patch(
+            reverse('listing-detail', args=[self.listing.id]), {"price": 150}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.listing.refresh_from_db()
+        self.assertEqual(self.listing.price, 150)
+
+    def test_create_assigns_token_user_as_owner(self):
+        response = self.client.post(reverse('listing-list'), {
+            "title": "Студия", "description": "У вокзала", "city": "Hamburg",
+            "price": 80, "rooms": 1, "housing_type": "apartment",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['owner'], "landlord@test.com")
+        self.assertEqual(Listing.objects.get(pk=response.data['id']).owner, self.landlord)
+
+    def test_writes_check_that_the_user_is_active(self):
+        User.objects.filter(pk=self.landlord.pk).update(is_active=False)
+        response = self.client.get(reverse('listing-detail', args=[self.listing.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.patch(
+            reverse('listing-detail', args=[self.listing.id]), {"price": 150}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('listing-list'), {
+            "title": "Студия", "description": "У вокзала", "city": "Hamburg",
+            "price": 80, "rooms": 1, "housing_type": "apartment",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(VIEW_HISTORY_BUFFER={"BACKGROUND": False})
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        caches['responses'].clear()
+        self.owner = User.objects.create_user(email="owner@test.com", first_name="O", password="pass123")
+        self.listing = Listing.objects.create(
+            owner=self.owner, title="Apt", description="Nice",
+            city="Berlin", price=1000, rooms=1, housing_type='apartment'
+        )
+        self.url = reverse('listing-detail', args=[self.listing.id])
+
+    def tearDown(self):
+        view_history_buffer.drain()
+
+    def test_anonymous_detail_is_cached_until_listing_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['title'], "Apt")
+
+        self.listing.title = "Loft"
+        self.listing.save()
+        self.assertEqual(self.client.get(self.url).data['title'], "Loft")
+
+    def test_invalidation_by_another_worker_is_seen(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={
+            **settings.CACHES,
+            'responses': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }):
+            self.assertEqual(self.client.get(self.url).data['title'], "Apt")
+
+            # Another worker renames the listing: its own cache client on the shared backend
+            # Другой воркер переименовывает объявление: свой клиент кэша на общем бэкенде
+            Listing.objects.filter(pk=self.listing.pk).update(title="Loft")
+            other_worker = caches.create_connection('responses')
+            other_worker.incr(version_key(listing_version_name(self.listing.pk)))
+
+            self.assertEqual(self.client.get(self.url).data['title'], "Loft")
+            self.assertIsNone(cache.get(version_key(listing_version_name(self.listing.pk))))
+
+    def test_feed_key_ignores_parameter_order_and_blanks(self):
+        self.client.get(reverse('listing-list'), {'rooms_min': 1, 'price_max': 2000})
+        with self.assertNumQueries(0):
+            self.client.get(reverse('listing-list') + '?price_max=2000&price_min=&rooms_min=1')
+
+        self.listing.delete()
+        response = self.client.get(reverse('listing-list'), {'rooms_min': 1, 'price_max': 2000})
+        self.assertEqual(response.data['results'], [])
+
+    def test_etag_answers_not_modified_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.listing.price = 1200
+        self.listing.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.owner)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import ListingListView, ListingDetailView,PopularListingsView
+from .views import ListingListView, ListingDetailView, PopularListingsView, CityAutocompleteView
 
 
 # URL patterns for listing management: list/create, detail, and popular listings
@@ -8,4 +8,5 @@ urlpatterns = [
     path("", ListingListView.as_view(), name="listing-list"),  # Список и создание объявлений
     path("<int:pk>/", ListingDetailView.as_view(), name="listing-detail"), # Получение, обновление или удаление объявления
     path("popular/", PopularListingsView.as_view(), name="popular-listings"),  # Получение популярных объявлений
+    path("cities/", CityAutocompleteView.as_view(), name="listing-cities"),  # Автодополнение городов
 ]
\ No newline at end of file
@@ -0,0 +1,30 @@
+import re
+import unicodedata
+
+# German umlaut transliteration (DIN 5007-2): "München" and "Muenchen" share one key
+# Транслитерация немецких умляутов (DIN 5007-2): «München» и «Muenchen» дают один ключ
+UMLAUT_MAP = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+
+
+def normalize_city(value):
+    """Return a case- and umlaut-folded key for a city name.
+
+    Accents are stripped, punctuation and hyphens become single spaces:
+    "Frankfurt-am-Main" -> "frankfurt am main", "München" -> "muenchen".
+    """
+    # Возвращает ключ города без учёта регистра, умляутов, диакритики и пунктуации
+    value = unicodedata.normalize('NFC', value or '').casefold().translate(UMLAUT_MAP)
+    value = ''.join(
+        char for char in unicodedata.normalize('NFKD', value)
+        if not unicodedata.combining(char)
+    )
+    return ' '.join(re.findall(r'\w+', value))
+
+
+def prefix_range(key):
+    """Return ``(lower, upper)`` bounds matching every string starting with ``key``.
+
+    A half-open range lets the prefix match use a plain B-tree index on any backend.
+    """
+    # Возвращает границы диапазона для поиска по префиксу через обычный B-tree индекс
+    return key, key[:-1] + chr(ord(key[-1]) + 1)
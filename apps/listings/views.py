@@ -1,14 +1,31 @@
+from hashlib import md5
 from logging import getLogger
-from django.db.models import Count, Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, Min, When
+from django.utils.dateparse import parse_date
 from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils.translation import gettext_lazy as _
 
+from .cache import (
+    AVAILABILITY_VERSION, DETAILS_VERSION, LEADERBOARD_VERSION, LISTINGS_VERSION, listing_version_name,
+)
+from .filters import ListingOrderingFilter
 from .models import Listing
-from .serializers import ListingSerializer
+from .search import get_search_backend
+from .serializers import CitySuggestionSerializer, ListingSerializer
+from .utils import normalize_city, prefix_range
+from apps.bookings.availability import exclude_occupied
+from apps.common.authentication import StatelessJWTAuthentication
+from apps.common.pagination import CreatedAtCursorPagination
 from apps.common.permissions import IsLandlord, IsOwner
-from apps.history.models import SearchQuery, ViewHistory
+from apps.common.views import CachedResponseMixin, ConditionalGetMixin
+from apps.history.leaderboard import DEFAULT_WINDOW, WINDOWS, get_top_listing_ids
+from apps.history.recorders import record_search, record_view
 
 logger = getLogger(__name__)
 
@@ -24,7 +41,10 @@ logger = getLogger(__name__)
             ("rooms_min", _("Minimum rooms"), "query", int, False),  # Минимум комнат
             ("rooms_max", _("Maximum rooms"), "query", int, False),  # Максимум комнат
             ("housing_type", _("Housing type"), "query", str, False),  # Тип жилья
-            ("city", _("City name"), "query", str, False),  # Название города
+            ("city", _("City name or prefix (case and umlaut insensitive)"), "query", str, False),  # Название города или его начало (без учёта регистра и умляутов)
+            ("start_date", _("Free from (check-in date, YYYY-MM-DD)"), "query", str, False),  # Свободно с (дата заезда, ГГГГ-ММ-ДД)
+            ("end_date", _("Free until (check-out date, YYYY-MM-DD)"), "query", str, False),  # Свободно до (дата выезда, ГГГГ-ММ-ДД)
+            ("ordering", _("Sort by price, created_at, rating (best first) or relevance (with search)"), "query", str, False),  # Сортировка по цене, дате, рейтингу (лучшие первыми) или релевантности (при поиске)
         ],
         responses={200: ListingSerializer(many=True)},
     ),
@@ -39,18 +59,26 @@ logger = getLogger(__name__)
         },
     ),
 )
-class ListingListView(generics.ListCreateAPIView):
+class ListingListView(CachedResponseMixin, generics.ListCreateAPIView):
     """List active listings publicly or create a new listing (landlords only).
 
-    Supports search, filtering by price/rooms/type/city, and ordering.
-    On search, saves query to history for authenticated users.
+    Supports full-text search, filtering by price/rooms/type/city and by
+    availability for a stay (``start_date``/``end_date``), ordering
+    (including ``ordering=rating`` and ``ordering=relevance`` for search
+    results) and cursor pagination.
+    On search, queues the query for the popular-search counters.
+    Anonymous pages are served from the response cache.
     """
     # Получение активных объявлений (публично) или создание (только арендодатели); поддержка поиска, фильтрации, сортировки
 
     serializer_class = ListingSerializer
-    filter_backends = [filters.OrderingFilter, DjangoFilterBackend]
-    ordering_fields = ["price", "created_at"]
-    ordering = ["-created_at"]
+    # The user is built from token claims, no SELECT on auth
+    # Пользователь строится из claims токена, без SELECT при аутентификации
+    authentication_classes = [StatelessJWTAuthentication]
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [ListingOrderingFilter, DjangoFilterBackend]
+    ordering_fields = ["price", "created_at", "rating", "relevance"]
+    ordering = ["-created_at", "id"]
 
     def get_permissions(self):
         """Allow anyone to list; restrict creation to landlords."""
@@ -62,20 +90,16 @@ class ListingListView(generics.ListCreateAPIView):
     def get_queryset(self):
         """Return active, non-deleted listings with optional search and filters."""
         # Возвращает активные, неудалённые объявления с опциональной фильтрацией
-        queryset = Listing.objects.filter(is_active=True, is_deleted=False)
+        queryset = ListingSerializer.setup_eager_loading(
+            Listing.objects.filter(is_active=True)
+        )
         params = self.request.query_params
 
         search = params.get("search")
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
+            queryset = get_search_backend().search(
+                queryset, search, rank=ListingOrderingFilter.orders_by(self.request, "relevance")
             )
-            if self.request.user.is_authenticated:
-                try:
-                    SearchQuery.objects.get_or_create(user=self.request.user, query=search)
-                    logger.info(f"Saved search query '{search}' for user {self.request.user.id}")
-                except Exception as e:
-                    logger.error(f"Failed to save search query '{search}' for user {self.request.user.id}: {e}")
 
         price_min = params.get("price_min")
         if price_min:
@@ -99,14 +123,55 @@ class ListingListView(generics.ListCreateAPIView):
 
         city = params.get("city")
         if city:
-            queryset = queryset.filter(city__icontains=city)
+            city_key = normalize_city(city)
+            if city_key:
+                lower, upper = prefix_range(city_key)
+                queryset = queryset.filter(city_key__gte=lower, city_key__lt=upper)
+
+        start_date = params.get("start_date")
+        end_date = params.get("end_date")
+        if start_date or end_date:
+            start, end = self.parse_stay(start_date, end_date)
+            queryset = exclude_occupied(queryset, start, end)
 
         return queryset
 
+    def get(self, request, *args, **kwargs):
+        """Count the search, cached or not, then list listings."""
+        # Учитывает поисковый запрос (даже при ответе из кэша) и возвращает список
+        search = request.query_params.get("search")
+        if search:
+            # Counted in memory and upserted in bulk off the request path
+            # Подсчитывается в памяти и записывается пакетно вне пути запроса
+            record_search(search, request.user.id if request.user.is_authenticated else None)
+        return super().get(request, *args, **kwargs)
+
+    def get_response_cache_versions(self):
+        params = self.request.query_params
+        if params.get("start_date") or params.get("end_date"):
+            return [LISTINGS_VERSION, AVAILABILITY_VERSION]
+        return [LISTINGS_VERSION]
+
+    @staticmethod
+    def parse_stay(start_date, end_date):
+        """Parse and validate the requested stay dates."""
+        # Разбирает и проверяет даты запрошенного проживания
+        try:
+            start, end = parse_date(start_date or ""), parse_date(end_date or "")
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            raise ValidationError(
+                {"dates": _("Both start_date and end_date are required in YYYY-MM-DD format.")}  # Нужны обе даты start_date и end_date в формате ГГГГ-ММ-ДД.
+            )
+        if end <= start:
+            raise ValidationError({"end_date": _("End date must be after start date.")})  # Дата окончания должна быть позже даты начала.
+        return start, end
+
     def perform_create(self, serializer):
         """Assign the current user as the listing owner and log the event."""
         # Назначает текущего пользователя владельцем объявления и логирует событие
-        listing = serializer.save(owner=self.request.user)
+        listing = serializer.save()
         logger.info(f"Listing {listing.id} created by landlord {self.request.user.id}")
 
 
@@ -140,12 +205,17 @@ class ListingListView(generics.ListCreateAPIView):
         responses={204: None, 403: OpenApiResponse(description=_("Only owner can delete"))},  # Только владелец может удалять
     ),
 )
-class ListingDetailView(generics.RetrieveUpdateDestroyAPIView):
-    """Retrieve, update, or soft-delete a listing with ownership validation."""
+class ListingDetailView(CachedResponseMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    """Retrieve, update, or soft-delete a listing with ownership validation.
+
+    Anonymous reads are served from the response cache; other reads
+    answer conditional requests on ``updated_at``.
+    """
     # Получение, обновление или мягкое удаление объявления с проверкой прав
 
-    queryset = Listing.objects.filter(is_deleted=False)
+    queryset = Listing.objects.all()
     serializer_class = ListingSerializer
+    authentication_classes = [StatelessJWTAuthentication]
 
     def get_permissions(self):
         """Allow public read; restrict write operations to the owner."""
@@ -154,38 +224,116 @@ class ListingDetailView(generics.RetrieveUpdateDestroyAPIView):
             return [IsOwner()]
         return [permissions.AllowAny()]
 
+    def get_response_cache_versions(self):
+        return [DETAILS_VERSION, listing_version_name(self.kwargs["pk"])]
+
+    def get_queryset(self):
+        """Load only the rendered columns for reads; writes need the full row for validation."""
+        # Для чтения загружает только выводимые столбцы; для записи нужна вся строка (валидация)
+        queryset = super().get_queryset()
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = ListingSerializer.setup_eager_loading(queryset)
+        return queryset
+
     def retrieve(self, request, *args, **kwargs):
-        """Record view in history for authenticated users."""
+        """Return the listing and queue a view-history event for authenticated users."""
         # Записывает просмотр в историю для авторизованных пользователей
         instance = self.get_object()
         if request.user.is_authenticated:
-            try:
-                ViewHistory.objects.get_or_create(user=request.user, listing=instance)
-                logger.info(f"User {request.user.id} viewed listing {instance.id}")
-            except Exception as e:
-                logger.error(f"Failed to record view for user {request.user.id}, listing {instance.id}: {e}")
-        return super().retrieve(request, *args, **kwargs)
+            # Buffered and written in batches off the request path
+            # Буферизуется и записывается пакетами вне пути запроса
+            if not record_view(request.user.id, instance.id):
+                logger.warning(f"View history buffer full, dropped view of listing {instance.id} by user {request.user.id}")
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
 
 
 @extend_schema_view(
     get=extend_schema(
         summary=_("Popular listings"),  # Популярные объявления
-        description=_("Get top 10 most viewed listings."),  # Получение топ-10 самых просматриваемых объявлений
+        description=_("Get the most viewed listings from a precomputed leaderboard."),  # Получение самых просматриваемых объявлений из заранее рассчитанного рейтинга
+        parameters=[
+            ("window", _("Time window: 24h, 7d or all (default)"), "query", str, False),  # Период: 24h, 7d или all (по умолчанию)
+            ("limit", _("Number of listings (default 10, max 100)"), "query", int, False),  # Количество объявлений (по умолчанию 10, не более 100)
+        ],
         responses={200: ListingSerializer(many=True)},
     )
 )
-class PopularListingsView(generics.ListAPIView):
-    """Return the 10 most viewed active listings."""
-    # Возвращает 10 самых популярных активных объявлений по количеству просмотров
+class PopularListingsView(CachedResponseMixin, generics.ListAPIView):
+    """Return the most viewed active listings for a time window (cached for anonymous visitors)."""
+    # Возвращает самые просматриваемые активные объявления за период
 
     serializer_class = ListingSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [permissions.AllowAny]
+    default_limit = 10
+
+    def get_response_cache_versions(self):
+        return [LISTINGS_VERSION, LEADERBOARD_VERSION]
 
     def get_queryset(self):
-        """Annotate and order listings by view count, limit to top 10."""
-        # Аннотирует и сортирует объявления по количеству просмотров, ограничивает до 10
-        return (
-            Listing.objects.filter(is_active=True, is_deleted=False)
-            .annotate(views_count=Count("viewhistory"))
-            .order_by("-views_count")[:10]
-        )
\ No newline at end of file
+        """Read top listing IDs from the leaderboard and load them in rank order."""
+        # Берёт топ ID из рейтинга и загружает объявления в порядке рейтинга
+        params = self.request.query_params
+        window = params.get("window", DEFAULT_WINDOW)
+        if window not in WINDOWS:
+            window = DEFAULT_WINDOW
+        try:
+            limit = min(max(int(params.get("limit", self.default_limit)), 1), settings.LEADERBOARD_SIZE)
+        except ValueError:
+            limit = self.default_limit
+
+        ids = get_top_listing_ids(window, limit)
+        if not ids:
+            return Listing.objects.none()
+        rank = Case(*[When(id=listing_id, then=position) for position, listing_id in enumerate(ids)])
+        return ListingSerializer.setup_eager_loading(
+            Listing.objects.filter(id__in=ids, is_active=True)
+        ).order_by(rank)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary=_("City autocomplete"),  # Автодополнение городов
+        description=_("Distinct cities of active listings with listing counts, matched by prefix."),  # Города активных объявлений с количеством объявлений, поиск по началу названия
+        parameters=[
+            ("q", _("City name prefix"), "query", str, False),  # Начало названия города
+            ("limit", _("Maximum number of cities (default 10, max 50)"), "query", int, False),  # Максимум городов (по умолчанию 10, не более 50)
+        ],
+        responses={200: CitySuggestionSerializer(many=True)},
+    )
+)
+class CityAutocompleteView(generics.GenericAPIView):
+    """Return distinct cities with listing counts, cached per normalized prefix."""
+    # Возвращает список городов с количеством объявлений, кэшируется по нормализованному префиксу
+
+    serializer_class = CitySuggestionSerializer
+    permission_classes = [permissions.AllowAny]
+    max_limit = 50
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET request for city suggestions."""
+        # Обрабатывает GET-запрос подсказок городов
+        prefix = normalize_city(request.query_params.get("q", ""))
+        try:
+            limit = max(min(int(request.query_params.get("limit", 10)), self.max_limit), 1)
+        except ValueError:
+            limit = 10
+
+        # The prefix is user input of any length and alphabet: hash it into a fixed-size key
+        # Префикс — ввод пользователя любой длины и алфавита: хэшируем его в ключ фиксированной длины
+        cache_key = f"listings:cities:{md5(prefix.encode()).hexdigest()}:{limit}"
+        data = cache.get(cache_key)
+        if data is None:
+            queryset = Listing.objects.filter(is_active=True)
+            if prefix:
+                lower, upper = prefix_range(prefix)
+                queryset = queryset.filter(city_key__gte=lower, city_key__lt=upper)
+            queryset = (
+                queryset.values("city_key")
+                .annotate(city=Min("city"), count=Count("id"))
+                .order_by("-count", "city_key")[:limit]
+            )
+            data = self.get_serializer(queryset, many=True).data
+            cache.set(cache_key, data, settings.CITY_AUTOCOMPLETE_CACHE_TIMEOUT)
+        return Response(data)
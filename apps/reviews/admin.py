@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+from apps.common.admin import SoftDeleteAdminMixin
 from .models import Review
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
     """Admin interface for managing user reviews on listings."""
     # Админка управления отзывами пользователей на объявления
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reviews'
+
+    def ready(self):
+        import apps.reviews.signals  # ← агрегаты рейтинга объявлений
@@ -0,0 +1,49 @@
+import json
+from hashlib import md5
+
+from django.utils.translation import get_language
+
+from apps.common.cache import get_cache_version, invalidate_cache_versions
+from apps.common.pagination import CreatedAtCursorPagination
+
+# Query parameters that select a feed page; requests with any other
+# parameter are served but not cached (DRF copies them into the next/previous links)
+# Параметры, выбирающие страницу ленты; запросы с другими параметрами не кэшируются
+FEED_PAGE_PARAMS = ("cursor", "page_size")
+
+
+def normalize_page_size(value):
+    """Map every spelling of a page size to the size the paginator will use."""
+    # Приводит page_size к размеру, который фактически использует пагинатор
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return None
+    return min(size, CreatedAtCursorPagination.max_page_size) if size > 0 else None
+
+
+def review_feed_version_name(listing_id):
+    return f"reviews:feed:{listing_id}"
+
+
+def review_feed_cache_key(listing_id, request):
+    """Cache key of one feed page, or None if the request must not be cached.
+
+    The key covers the listing's feed version, host, language and the
+    normalized ``cursor``/``page_size`` parameters, so arbitrary query
+    strings cannot fill the cache with copies of the same page.
+    """
+    # Ключ кэша страницы отзывов (версия, хост, язык, cursor/page_size) или None, если кэшировать нельзя
+    params = request.query_params
+    if any(name not in FEED_PAGE_PARAMS for name in params):
+        return None
+    version = get_cache_version(review_feed_version_name(listing_id))
+    page = [params.get("cursor", ""), normalize_page_size(params.get("page_size"))]
+    raw = json.dumps([request.get_host(), get_language(), page])
+    return f"reviews:feed:{listing_id}:{version}:{md5(raw.encode()).hexdigest()}"
+
+
+def invalidate_review_feed(listing_id):
+    """Drop every cached page of the listing's review feed."""
+    # Сбрасывает все закэшированные страницы отзывов объявления
+    invalidate_cache_versions(review_feed_version_name(listing_id))
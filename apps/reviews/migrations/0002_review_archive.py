@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:30
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0001_initial"),
+        ("bookings", "0008_booking_archive"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-created_at", "id"],
+                name="review_live_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["updated_at"],
+                name="review_deleted_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ReviewArchive",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(verbose_name="Created at")),
+                ("updated_at", models.DateTimeField(verbose_name="Updated at")),
+                ("is_deleted", models.BooleanField(default=False, verbose_name="Soft deleted")),
+                ("booking", models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name="+", to="bookings.booking", verbose_name="Booking")),
+                ("rating", models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1, message="Rating must be between 1 and 5."), django.core.validators.MaxValueValidator(5, message="Rating must be between 1 and 5.")], verbose_name="Rating")),
+                ("comment", models.TextField(verbose_name="Comment")),
+            ],
+            options={
+                "db_table": "reviews_review_archive",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -1,8 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
 
-from apps.common.models import BaseModel
+from apps.common.models import BaseModel, make_archive_model
 from apps.bookings.models import Booking
 from apps.common.validators import validate_booking_for_review
 
@@ -47,17 +47,39 @@ class Review(BaseModel):
             validate_booking_for_review(self.booking)
 
     def save(self, *args, **kwargs):
-        """Ensure model validation is performed before saving."""
-        # Гарантирует выполнение валидации перед сохранением
+        """Ensure model validation is performed before saving.
+
+        The insert and the side effects of post_save (e.g. the queued
+        notification email) share one transaction.
+        """
+        # Гарантирует выполнение валидации перед сохранением; запись и побочные эффекты — в одной транзакции
         self.full_clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     class Meta:
         verbose_name = _('Review')  # Отзыв
         verbose_name_plural = _('Reviews')  # Отзывы
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at', 'id'],
+                condition=models.Q(is_deleted=False),
+                name='review_live_created_idx',
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(is_deleted=True),
+                name='review_deleted_idx',
+            ),
+        ]
 
     def __str__(self):
         if self.booking and self.booking.tenant and self.booking.listing:
             return f"Review by {self.booking.tenant.email} on “{self.booking.listing.title}” ({self.rating})"
-        return f"Review (ID: {self.pk}) – orphaned"
\ No newline at end of file
+        return f"Review (ID: {self.pk}) – orphaned"
+
+
+# Long soft-deleted reviews, moved out by the archive_deleted command
+# Давно мягко удалённые отзывы, переносятся командой archive_deleted
+ReviewArchive = make_archive_model(Review)
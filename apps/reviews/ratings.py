@@ -0,0 +1,62 @@
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Round
+from django.utils import timezone
+
+from apps.listings.cache import invalidate_listing_responses
+from apps.listings.models import Listing
+from .models import Review
+
+
+def review_contribution(rating, is_deleted):
+    """Return the (count, rating sum) a review adds to its listing's aggregates."""
+    # Возвращает вклад отзыва в агрегаты объявления: (количество, сумма оценок)
+    if is_deleted or rating is None:
+        return 0, 0
+    return 1, rating
+
+
+def average_rating():
+    """Expression for the rounded average of a listing's ratings (0 without reviews)."""
+    # Выражение для округлённой средней оценки объявления (0, если отзывов нет)
+    return Case(
+        When(review_count=0, then=Value(0.0)),
+        default=Round(Cast(F("rating_sum"), FloatField()) / F("review_count"), 2),
+        output_field=FloatField(),
+    )
+
+
+def apply_rating_delta(listing_id, count_delta, rating_delta):
+    """Shift a listing's review aggregates by the given deltas.
+
+    Counters move with F() expressions, so concurrent reviews never lose
+    updates; the average is recomputed from the new counters in a second
+    statement of the same transaction.
+    """
+    # Инкрементально сдвигает агрегаты отзывов объявления и пересчитывает среднюю оценку
+    if not count_delta and not rating_delta:
+        return
+    listings = Listing.all_objects.filter(pk=listing_id)
+    listings.update(
+        review_count=F("review_count") + count_delta,
+        rating_sum=F("rating_sum") + rating_delta,
+        updated_at=timezone.now(),
+    )
+    listings.update(rating_avg=average_rating())
+    invalidate_listing_responses(listing_id)
+
+
+def recompute_listing_ratings(listing_ids=None):
+    """Rebuild review aggregates from scratch (after bulk loads that skip signals)."""
+    # Полностью пересчитывает агрегаты отзывов (после массовой загрузки без сигналов)
+    reviews = Review.objects.filter(booking__listing=OuterRef("pk")).order_by().values("booking__listing")
+    listings = Listing.all_objects.all()
+    if listing_ids is not None:
+        listings = listings.filter(pk__in=listing_ids)
+    listings.update(
+        review_count=Coalesce(Subquery(reviews.annotate(n=Count("id")).values("n")), 0),
+        rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0,
+                            output_field=IntegerField()),
+        updated_at=timezone.now(),
+    )
+    listings.update(rating_avg=average_rating())
+    invalidate_listing_responses(*(listing_ids or ()))
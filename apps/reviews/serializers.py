@@ -32,7 +32,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             raise serializers.ValidationError(_("Authentication required."))  # Требуется авторизация.
 
-        if value.tenant != request.user:
+        if value.tenant_id != request.user.pk:
             raise serializers.ValidationError(
                 _("You can only review your own bookings.")  # Вы можете оставить отзыв только на своё бронирование.
             )
@@ -0,0 +1,73 @@
+from typing import Any
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.bookings.models import Booking
+from apps.common.models import soft_delete_changed
+from apps.listings.models import Listing
+from .feed import invalidate_review_feed
+from .models import Review
+from .ratings import apply_rating_delta, recompute_listing_ratings, review_contribution
+
+
+@receiver(pre_save, sender=Review)
+def remember_rating_state(sender: Any, instance: Review, **kwargs: Any) -> None:
+    """Remember what the stored review contributed before this save."""
+    # Запоминает вклад сохранённого отзыва до изменения
+    previous = None
+    if instance.pk and not instance._state.adding:
+        previous = Review.all_objects.filter(pk=instance.pk).values_list("rating", "is_deleted").first()
+    instance._rating_before = review_contribution(*previous) if previous else (0, 0)
+
+
+@receiver(post_save, sender=Review)
+def update_listing_rating(sender: Any, instance: Review, **kwargs: Any) -> None:
+    """Apply the change in the review's contribution to its listing's aggregates.
+
+    Also drops the listing's cached review feed.
+    """
+    # Применяет изменение вклада отзыва к агрегатам объявления и сбрасывает кэш ленты отзывов
+    count, total = review_contribution(instance.rating, instance.is_deleted)
+    count_before, total_before = getattr(instance, "_rating_before", (0, 0))
+    apply_rating_delta(instance.booking.listing_id, count - count_before, total - total_before)
+    invalidate_review_feed(instance.booking.listing_id)
+
+
+@receiver(post_delete, sender=Review)
+def remove_listing_rating(sender: Any, instance: Review, **kwargs: Any) -> None:
+    """Subtract a hard-deleted review from its listing's aggregates."""
+    # Вычитает физически удалённый отзыв из агрегатов объявления
+    count, total = review_contribution(instance.rating, instance.is_deleted)
+    if not count:
+        return
+    try:
+        listing_id = instance.booking.listing_id
+    except Booking.DoesNotExist:
+        # The whole booking is gone, cascading from the listing itself
+        # Бронирование удалено вместе с объявлением
+        return
+    apply_rating_delta(listing_id, -count, -total)
+    invalidate_review_feed(listing_id)
+
+
+@receiver(soft_delete_changed, sender=Review)
+def recompute_ratings_on_bulk_soft_delete(sender: Any, queryset: QuerySet, deleted: bool, **kwargs: Any) -> None:
+    """Recompute the aggregates and drop the review feeds of listings with bulk-changed reviews."""
+    # Пересчитывает агрегаты и сбрасывает ленты отзывов объявлений с массово изменёнными отзывами
+    listing_ids = list(
+        Booking._base_manager.filter(review__in=queryset.values("pk"))
+        .order_by().values_list("listing_id", flat=True).distinct()
+    )
+    recompute_listing_ratings(listing_ids)
+    for listing_id in listing_ids:
+        invalidate_review_feed(listing_id)
+
+
+@receiver(post_save, sender=Listing)
+def invalidate_feed_on_listing_change(sender: Any, instance: Listing, created: bool, **kwargs: Any) -> None:
+    """Cached review pages embed the listing title, drop them when it changes."""
+    # Закэшированные отзывы содержат заголовок объявления, сбрасываем их при его изменении
+    update_fields = kwargs.get("update_fields")
+    if not created and (update_fields is None or "title" in update_fields):
+        invalidate_review_feed(instance.pk)
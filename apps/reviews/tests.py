@@ -1,4 +1,6 @@
+from django.core.cache import cache, caches
 from django.test import TestCase, override_settings
+from django.urls import reverse
 from django.contrib.auth.models import Group
 from django.utils import timezone
 from rest_framework.test import APITestCase
@@ -6,6 +8,8 @@ from rest_framework import status
 from apps.users.models import User
 from apps.listings.models import Listing
 from apps.bookings.models import Booking
+from .models import Review
+from .ratings import recompute_listing_ratings
 
 
 class ReviewTests(APITestCase):
@@ -53,4 +57,127 @@ class ReviewTests(APITestCase):
         self.client.force_authenticate(user=self.tenant)
         data = {"booking": booking2.id, "rating": 5, "comment": "No!"}
         response = self.client.post(f'/api/v1/listings/{self.listing.id}/reviews/', data)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ListingRatingTests(APITestCase):
+    def setUp(self):
+        landlord = User.objects.create_user(email="landlord@test.com", first_name="L", password="pass123")
+        self.tenant = User.objects.create_user(email="tenant@test.com", first_name="T", password="pass123")
+        self.listing = Listing.objects.create(
+            owner=landlord, title="Apt", description="Nice", city="Berlin",
+            price=100, rooms=1, housing_type='apartment'
+        )
+        self.other = Listing.objects.create(
+            owner=landlord, title="House", description="Quiet", city="Berlin",
+            price=200, rooms=3, housing_type='house'
+        )
+
+    def review(self, listing, rating):
+        # bulk_create skips the past-date validation of bookings
+        start = timezone.now().date() - timezone.timedelta(days=20)
+        booking = Booking.objects.bulk_create([Booking(
+            listing=listing, tenant=self.tenant, start_date=start,
+            end_date=start + timezone.timedelta(days=3), total_price=300, status='completed'
+        )])[0]
+        return Review.objects.create(booking=booking, rating=rating, comment="Ok")
+
+    def test_aggregates_follow_create_update_and_soft_delete(self):
+        first = self.review(self.listing, 5)
+        self.review(self.listing, 2)
+        self.listing.refresh_from_db()
+        self.assertEqual((self.listing.review_count, self.listing.rating_avg), (2, 3.5))
+
+        first.rating = 4
+        first.save()
+        self.listing.refresh_from_db()
+        self.assertEqual(self.listing.rating_avg, 3.0)
+
+        first.delete()
+        self.listing.refresh_from_db()
+        self.assertEqual((self.listing.review_count, self.listing.rating_sum, self.listing.rating_avg), (1, 2, 2.0))
+
+    def test_recompute_matches_incremental_aggregates(self):
+        self.review(self.listing, 4)
+        self.review(self.listing, 3)
+        Listing.all_objects.update(review_count=0, rating_sum=0, rating_avg=0)
+        stale = Listing.all_objects.get(pk=self.listing.pk).updated_at
+        recompute_listing_ratings()
+        self.listing.refresh_from_db()
+        self.assertEqual((self.listing.review_count, self.listing.rating_avg), (2, 3.5))
+        # Conditional GET validators must move with the recomputed aggregates
+        self.assertGreater(self.listing.updated_at, stale)
+
+    def test_order_listings_by_rating(self):
+        self.review(self.listing, 3)
+        self.review(self.other, 5)
+        response = self.client.get(reverse('listing-list'), {'ordering': 'rating'})
+        self.assertEqual([item['id'] for item in response.data['results']], [self.other.id, self.listing.id])
+        self.assertEqual(response.data['results'][0]['rating_avg'], 5.0)
+        self.assertEqual(response.data['results'][0]['review_count'], 1)
+
+
+class ReviewFeedCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        caches['responses'].clear()
+        landlord = User.objects.create_user(email="landlord@test.com", first_name="L", password="pass123")
+        self.tenant = User.objects.create_user(email="tenant@test.com", first_name="T", password="pass123")
+        self.tenant.groups.add(Group.objects.get_or_create(name='Tenants')[0])
+        self.listing = Listing.objects.create(
+            owner=landlord, title="Apt", description="Nice", city="Berlin",
+            price=100, rooms=1, housing_type='apartment'
+        )
+        self.url = reverse('review-list', kwargs={'listing_id': self.listing.id})
+
+    def completed_booking(self):
+        start = timezone.now().date() - timezone.timedelta(days=20)
+        return Booking.objects.bulk_create([Booking(
+            listing=self.listing, tenant=self.tenant, start_date=start,
+            end_date=start + timezone.timedelta(days=3), total_price=300, status='completed'
+        )])[0]
+
+    def feed_ids(self):
+        return [item['id'] for item in self.client.get(self.url).data['results']]
+
+    def test_repeated_page_is_served_from_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(booking=self.completed_booking(), rating=5, comment="Great")
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_unknown_parameters_bypass_cache(self):
+        self.client.get(self.url, {'x': 1})
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'x': 1})
+
+    def test_page_size_is_part_of_key(self):
+        self.client.get(self.url, {'page_size': 5})
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'page_size': 5})
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'page_size': '05'})
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'page_size': 10})
+
+    def test_new_and_deleted_reviews_invalidate_feed(self):
+        self.assertEqual(self.feed_ids(), [])
+
+        self.client.force_authenticate(user=self.tenant)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {"booking": self.completed_booking().id, "rating": 4, "comment": "Ok"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.feed_ids(), [response.data['id']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.get(pk=response.data['id']).delete()
+        self.assertEqual(self.feed_ids(), [])
+
+    def test_pages_are_bounded(self):
+        for _ in range(3):
+            Review.objects.create(booking=self.completed_booking(), rating=3, comment="Fine")
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(len(self.client.get(response.data['next']).data['results']), 1)
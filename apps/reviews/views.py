@@ -1,10 +1,16 @@
 from logging import getLogger
+from django.conf import settings
+from django.core.cache import caches
 from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
 from rest_framework import generics, permissions
+from rest_framework.response import Response
 from django.utils.translation import gettext_lazy as _
 
+from .feed import review_feed_cache_key
 from .models import Review
 from .serializers import ReviewSerializer
+from apps.common.cache import VERSION_CACHE_ALIAS
+from apps.common.pagination import CreatedAtCursorPagination
 from apps.common.permissions import IsTenant
 
 logger = getLogger(__name__)
@@ -31,10 +37,15 @@ logger = getLogger(__name__)
     ),
 )
 class ReviewListView(generics.ListCreateAPIView):
-    """List and create reviews for a listing."""
-    # Получение и создание отзывов для объявления
+    """List (cursor-paginated) and create reviews for a listing.
+
+    Feed pages are cached per listing and URL; any review change for the
+    listing bumps its cache version, so the next GET reads fresh data.
+    """
+    # Получение (с курсорной пагинацией, с кэшем по объявлению) и создание отзывов для объявления
 
     serializer_class = ReviewSerializer
+    pagination_class = CreatedAtCursorPagination
 
     def get_permissions(self):
         """Set permissions: POST → IsTenant, GET → AllowAny."""
@@ -48,9 +59,26 @@ class ReviewListView(generics.ListCreateAPIView):
         # Возвращает неудалённые отзывы для указанного объявления
         return Review.objects.filter(
             booking__listing_id=self.kwargs["listing_id"],
-            is_deleted=False,
         ).select_related("booking__listing", "booking__tenant")
 
+    def list(self, request, *args, **kwargs):
+        """Serve the page from the per-listing cache, rendering it on a miss.
+
+        Pages live in the shared ``responses`` cache alias, next to their
+        version stamps.
+        """
+        # Отдаёт страницу из кэша объявления, при промахе формирует её заново
+        cache_key = review_feed_cache_key(self.kwargs["listing_id"], request)
+        if cache_key is None:
+            return super().list(request, *args, **kwargs)
+        cache = caches[VERSION_CACHE_ALIAS]
+        data = cache.get(cache_key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(cache_key, response.data, settings.REVIEW_FEED_CACHE_TIMEOUT)
+            return response
+        return Response(data)
+
     def perform_create(self, serializer):
         """Save review and log creation event."""
         # Сохраняет отзыв и логирует событие создания
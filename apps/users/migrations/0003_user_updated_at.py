@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_user_managers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now, verbose_name="Updated at"
+            ),
+            preserve_default=False,
+        ),
+    ]
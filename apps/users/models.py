@@ -54,6 +54,10 @@ class User(AbstractUser):
         max_length=50,
         blank=True
     )
+    updated_at = models.DateTimeField(
+        _('Updated at'),  # Дата обновления
+        auto_now=True
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name']
@@ -1,8 +1,11 @@
-from django.contrib.auth.models import Group
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from apps.common.roles import get_role_group_id
 from .models import User
+from .tokens import RoleRefreshToken
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -15,7 +18,9 @@ class RegisterSerializer(serializers.ModelSerializer):
         validators=[validate_password]
     )
     password2 = serializers.CharField(write_only=True, required=True)
-    role = serializers.ChoiceField(choices=[
+    # Write-only: the role is stored as a group, User has no "role" attribute to serialize back
+    # Только для записи: роль хранится как группа, у User нет атрибута role для ответа
+    role = serializers.ChoiceField(write_only=True, choices=[
         ('tenant', _('Tenant')),        # Арендатор
         ('landlord', _('Landlord'))     # Арендодатель
     ])
@@ -44,12 +49,30 @@ class RegisterSerializer(serializers.ModelSerializer):
         validated_data.pop('password2')
         user = User.objects.create_user(**validated_data)
 
-        group_name = 'Landlords' if role == 'landlord' else 'Tenants'
-        group, _ = Group.objects.get_or_create(name=group_name)
-        user.groups.add(group)
+        # The group id is cached, signup does not look the group up every time
+        # id группы кэшируется, регистрация не ищет группу каждый раз
+        user.groups.add(get_role_group_id(role))
         return user
 
 
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issue JWT pairs carrying the user's email; the access token also carries the roles."""
+    # Выдаёт JWT-токены с email пользователя; access-токен содержит ещё и роли
+    token_class = RoleRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['email'] = user.email
+        return token
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Issue a new access token with the user's current roles, not those at login."""
+    # Выдаёт новый access-токен с текущими ролями пользователя, а не ролями на момент входа
+    token_class = RoleRefreshToken
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for public user profile data (without sensitive fields)."""
     # Сериализатор для публичных данных профиля (без чувствительной информации)
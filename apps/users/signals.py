@@ -1,7 +1,10 @@
-from django.db.models.signals import post_migrate
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import Group
+
+from apps.common.roles import invalidate_role_groups, invalidate_user_roles
 from .apps import UsersConfig
+from .models import User
 
 
 @receiver(post_migrate, sender=UsersConfig)
@@ -9,4 +12,44 @@ def create_groups(sender, **kwargs):
     """Create default user groups after migrations."""
     # Создаёт группы арендодателей и арендаторов после миграций
     Group.objects.get_or_create(name='Landlords')
-    Group.objects.get_or_create(name='Tenants')
\ No newline at end of file
+    Group.objects.get_or_create(name='Tenants')
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop cached roles of users whose group membership changed."""
+    # Сбрасывает кэш ролей пользователей, у которых изменился состав групп
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_user_roles([instance.pk])
+    elif action == 'pre_clear':
+        # pk_set is empty for clear(), remember the members before they are removed
+        # Для clear() pk_set пуст, запоминаем участников до удаления
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        invalidate_user_roles(getattr(instance, '_cleared_user_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_user_roles(pk_set)
+
+
+@receiver(post_save, sender=User)
+def reset_roles_of_new_user(sender, instance, created, **kwargs):
+    """Make sure a new account never inherits cached roles of a reused id."""
+    # Новый пользователь не должен получить закэшированные роли с тем же id
+    if created:
+        invalidate_user_roles([instance.pk])
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_roles_of_group_members(sender, instance, **kwargs):
+    """Drop cached roles of the members of a group being deleted."""
+    # Сбрасывает кэш ролей участников удаляемой группы
+    invalidate_user_roles(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_ids(sender, **kwargs):
+    """Drop cached role group ids when groups change."""
+    # Сбрасывает закэшированные id групп при их изменении
+    invalidate_role_groups()
@@ -1,7 +1,11 @@
 from django.test import TestCase
+from django.core.cache import caches
+from django.urls import reverse
 from django.contrib.auth.models import Group
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from apps.common.roles import LANDLORD, ROLES_CLAIM, TENANT, get_role_group_id
 from .models import User
 
 
@@ -37,6 +41,17 @@ class AuthTests(APITestCase):
         user = User.objects.get(email="landlord@example.com")
         self.assertTrue(user.groups.filter(name='Landlords').exists())
 
+    def test_register_returns_created_user(self):
+        data = {
+            "email": "new@example.com", "first_name": "Nina",
+            "password": "secure123!", "password2": "secure123!", "role": "landlord",
+        }
+        response = self.client.post(reverse('register'), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['email'], "new@example.com")
+        self.assertNotIn('password', response.data)
+        self.assertTrue(User.objects.get(email="new@example.com").groups.filter(name='Landlords').exists())
+
     def test_current_user(self):
         user = User.objects.create_user(
             email="test@example.com", first_name="Test", password="pass123"
@@ -44,4 +59,39 @@ class AuthTests(APITestCase):
         self.client.force_authenticate(user=user)
         response = self.client.get('/api/v1/users/me/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['email'], "test@example.com")
\ No newline at end of file
+        self.assertEqual(response.data['email'], "test@example.com")
+
+
+class CurrentUserConditionalGetTests(APITestCase):
+    def test_if_modified_since_without_queries(self):
+        user = User.objects.create_user(email="me@test.com", first_name="Me", password="securepassword123")
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('current-user'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('current-user'), HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class RoleClaimTests(APITestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.user = User.objects.create_user(email="landlord@test.com", first_name="L", password="securepassword123")
+        self.user.groups.add(get_role_group_id(LANDLORD))
+
+    def test_roles_are_only_in_access_tokens_and_resolved_on_refresh(self):
+        response = self.client.post(
+            reverse('login'), {"email": "landlord@test.com", "password": "securepassword123"}, format='json'
+        )
+        self.assertEqual(AccessToken(response.data['access'])[ROLES_CLAIM], [LANDLORD])
+        refresh = response.data['refresh']
+        self.assertNotIn(ROLES_CLAIM, RefreshToken(refresh).payload)
+
+        Group.objects.get(name="Landlords").user_set.remove(self.user)
+        self.user.groups.add(get_role_group_id(TENANT))
+        response = self.client.post(reverse('token-refresh'), {"refresh": refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.data['access'])[ROLES_CLAIM], [TENANT])
@@ -0,0 +1,24 @@
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.common.roles import ROLES_CLAIM, get_user_roles
+from .models import User
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user's roles as a claim.
+
+    The roles are resolved each time an access token is issued (login and
+    refresh) and are not stored in the refresh token itself, so a role
+    revoked after login is gone from the next access token.
+    """
+    # Refresh-токен, выдающий access-токены с актуальными ролями пользователя
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        # The primary key is enough to read the (cached) group membership
+        # Для чтения (кэшированного) членства в группах достаточно первичного ключа
+        user = User(pk=self[api_settings.USER_ID_CLAIM])
+        access[ROLES_CLAIM] = sorted(get_user_roles(user))
+        return access
@@ -4,6 +4,7 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
+from apps.common.views import ConditionalGetMixin
 from .serializers import RegisterSerializer, UserSerializer
 
 
@@ -41,12 +42,17 @@ class RegisterView(generics.CreateAPIView):
         responses={200: UserSerializer},
     ),
 )
-class CurrentUserView(generics.RetrieveAPIView):
-    """Retrieve current user details."""
-    # Получение данных текущего пользователя
+class CurrentUserView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """Retrieve current user details (conditional GET on ``updated_at``)."""
+    # Получение данных текущего пользователя (условный GET по updated_at)
 
     serializer_class = UserSerializer
 
+    def get_last_modified(self):
+        """The authenticated user is already loaded, no query needed."""
+        # Пользователь уже загружен аутентификацией, запрос не нужен
+        return self.request.user.updated_at
+
     def get_object(self):
         """Return the currently authenticated user."""
         # Возвращает текущего авторизованного пользователя
@@ -58,6 +58,7 @@ INSTALLED_APPS = [
     "apps.reviews",
     "apps.history",
     "apps.common",
+    "utils",
 
     # Third-party
     "rest_framework",
@@ -137,6 +138,18 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "OPTIONS": {
+                # SQLite has no row locks: take the write lock at BEGIN so concurrent
+                # writers (e.g. bookings) wait their turn instead of failing mid-transaction.
+                # This costs no concurrency: SQLite allows one writer at a time anyway, every
+                # atomic() block in the project writes, and reads outside atomic() (all API
+                # GETs, ATOMIC_REQUESTS is off) do not open a transaction and never wait.
+                # Only applies to the local SQLite setup; MySQL keeps its row locks.
+                # В SQLite нет блокировок строк: блокировка записи берётся в начале транзакции.
+                # Параллельность не страдает: писатель в SQLite всегда один, все блоки atomic()
+                # в проекте пишут, а чтение вне atomic() транзакцию не открывает и не ждёт
+                "transaction_mode": "IMMEDIATE",
+            },
         }
     }
 
@@ -210,8 +223,15 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # Default page size for paginated list endpoints (can be overridden via ?page_size=)
+    # Размер страницы по умолчанию для списков с пагинацией (можно изменить через ?page_size=)
+    "PAGE_SIZE": env.int("API_PAGE_SIZE", default=20),
 }
 
+# Pagination is enabled per view, PAGE_SIZE only provides the default size
+# Пагинация включается в каждом представлении отдельно, PAGE_SIZE задаёт лишь размер
+SILENCED_SYSTEM_CHECKS = ["rest_framework.W001"]
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -220,9 +240,117 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Access tokens carry the user's roles, so permission checks skip the groups query;
+    # the roles are looked up again on every refresh
+    # Access-токен содержит роли пользователя, проверка прав обходится без запроса к группам;
+    # при обновлении токена роли определяются заново
+    "TOKEN_OBTAIN_SERIALIZER": "apps.users.serializers.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.users.serializers.RoleTokenRefreshSerializer",
+}
+
+
+# ----------------------------
+# CACHE
+# ----------------------------
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "rental-default",
+    },
+    # Rendered API responses for anonymous visitors. Swap the backend without code changes, e.g.
+    # django.core.cache.backends.filebased.FileBasedCache + /var/tmp/rental-responses or
+    # django.core.cache.backends.redis.RedisCache + redis://127.0.0.1:6379/1
+    # Готовые API-ответы для анонимных посетителей; бэкенд меняется через переменные окружения
+    "responses": {
+        "BACKEND": env("RESPONSE_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": env("RESPONSE_CACHE_LOCATION", default="rental-responses"),
+    },
+    # State every worker must see alike (cached user roles). Point it at Redis or a
+    # file cache when running several worker processes.
+    # Общее для всех воркеров состояние (роли пользователей); при нескольких процессах — Redis или файлы
+    "shared": {
+        "BACKEND": env("SHARED_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": env("SHARED_CACHE_LOCATION", default="rental-shared"),
+    },
+}
+
+# Upper bound for cached responses; they are normally invalidated by version stamps (seconds)
+# Верхняя граница жизни закэшированных ответов; обычно они сбрасываются сменой версий (секунды)
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=300)
+
+# Cities change rarely, autocomplete results may be a few minutes stale
+# Города меняются редко, подсказки могут отставать на несколько минут
+CITY_AUTOCOMPLETE_CACHE_TIMEOUT = env.int("CITY_AUTOCOMPLETE_CACHE_TIMEOUT", default=300)
+
+# User roles (and role group ids) are cached in the "shared" alias; roles are dropped when
+# group membership changes, the timeout bounds staleness if an invalidation is missed
+# Роли пользователя (и id групп ролей) кэшируются в алиасе "shared"; таймаут ограничивает устаревание
+ROLE_CACHE_TIMEOUT = env.int("ROLE_CACHE_TIMEOUT", default=3600)
+
+
+# ----------------------------
+# HISTORY (write-behind buffers)
+# ----------------------------
+
+# Listing views are buffered in-process and written with bulk_create by a background thread.
+# Each worker process flushes its own buffer (periodically and at exit); other processes cannot drain it.
+# Просмотры объявлений буферизуются в процессе и пишутся через bulk_create фоновым потоком.
+# Каждый процесс записывает свой буфер сам (периодически и при завершении); другие процессы его не видят.
+VIEW_HISTORY_BUFFER = {
+    "MAX_SIZE": env.int("VIEW_HISTORY_BUFFER_MAX_SIZE", default=10000),  # above this, events are dropped
+    "BATCH_SIZE": env.int("VIEW_HISTORY_BUFFER_BATCH_SIZE", default=500),
+    "FLUSH_INTERVAL": env.float("VIEW_HISTORY_FLUSH_INTERVAL", default=2.0),  # seconds
+    "BACKGROUND": env.bool("VIEW_HISTORY_BACKGROUND_FLUSH", default=True),
 }
 
 
+# Search queries are counted per (query, day) in memory and upserted in bulk
+# Поисковые запросы считаются по (запрос, день) в памяти и пакетно записываются
+SEARCH_QUERY_BUFFER = {
+    "MAX_SIZE": env.int("SEARCH_QUERY_BUFFER_MAX_SIZE", default=10000),
+    "BATCH_SIZE": env.int("SEARCH_QUERY_BUFFER_BATCH_SIZE", default=500),
+    "FLUSH_INTERVAL": env.float("SEARCH_QUERY_FLUSH_INTERVAL", default=5.0),
+    "BACKGROUND": env.bool("SEARCH_QUERY_BACKGROUND_FLUSH", default=True),
+}
+
+# Share of authenticated searches also stored as per-user SearchQuery rows (0.0–1.0)
+# Доля поисков авторизованных пользователей, сохраняемых как строки SearchQuery (0.0–1.0)
+SEARCH_QUERY_DETAIL_SAMPLE_RATE = env.float("SEARCH_QUERY_DETAIL_SAMPLE_RATE", default=1.0)
+
+# Popular searches are summed from daily counters and cached briefly (seconds)
+# Популярные запросы суммируются по дневным счётчикам и кэшируются ненадолго (секунды)
+POPULAR_SEARCH_CACHE_TIMEOUT = env.int("POPULAR_SEARCH_CACHE_TIMEOUT", default=60)
+
+# Review feed pages are cached per listing until a review changes (seconds, upper bound)
+# Страницы отзывов кэшируются по объявлению до изменения отзыва (секунды, верхняя граница)
+REVIEW_FEED_CACHE_TIMEOUT = env.int("REVIEW_FEED_CACHE_TIMEOUT", default=600)
+
+
+# Popular listings: leaderboard length kept per window, and how old a stored ranking may get
+# before a request recomputes it (seconds)
+# Популярные объявления: длина рейтинга для каждого периода и допустимый возраст сохранённого рейтинга (секунды)
+LEADERBOARD_SIZE = env.int("LEADERBOARD_SIZE", default=100)
+LEADERBOARD_MAX_AGE = env.int("LEADERBOARD_MAX_AGE", default=60)
+
+# Hourly view counters older than this are pruned by refresh_leaderboards (days)
+# Почасовые счётчики старше этого срока удаляет refresh_leaderboards (дни)
+VIEW_COUNT_RETENTION_DAYS = env.int("VIEW_COUNT_RETENTION_DAYS", default=8)
+
+# Soft-deleted rows older than this are moved to archive tables by archive_deleted (days)
+# Мягко удалённые строки старше этого срока переносит в архивные таблицы archive_deleted (дни)
+SOFT_DELETE_ARCHIVE_AFTER_DAYS = env.int("SOFT_DELETE_ARCHIVE_AFTER_DAYS", default=90)
+
+
+# ----------------------------
+# LISTING SEARCH
+# ----------------------------
+
+# Dotted path to a search backend; empty = pick by database vendor (FTS5 / FULLTEXT)
+# Путь к бэкенду поиска; пусто — выбирается по СУБД (FTS5 / FULLTEXT)
+LISTING_SEARCH_BACKEND = env("LISTING_SEARCH_BACKEND", default=None)
+
+
 # ----------------------------
 # API DOCUMENTATION (Spectacular)
 # ----------------------------
@@ -0,0 +1,305 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.bookings.models import Booking
+from apps.common.cache import VERSION_CACHE_ALIAS
+from apps.listings.search import tokenize
+from apps.users.tokens import RoleRefreshToken
+from utils.management.commands.seed import PASSWORD as SEED_PASSWORD
+
+# Password of users created by the register endpoint
+# Пароль пользователей, создаваемых эндпоинтом регистрации
+PASSWORD = "benchmark-pass-123"
+
+# URL namespaces that are not part of the public API
+# Пространства имён URL, не входящие в публичный API
+SKIPPED_NAMESPACES = {"admin"}
+
+# Endpoints that cannot be replayed against the same data, with the reason
+# Эндпоинты, которые нельзя многократно повторять на одних данных, с причиной
+SKIPPED_ENDPOINTS = {
+    "logout": "blacklists the refresh token, so every call needs a fresh login",
+    "booking-action": "changes the booking status, so repeated calls are rejected",
+    "booking-bulk-action": "changes booking statuses, so repeated calls find nothing pending",
+}
+
+
+class Endpoint:
+    """One benchmarked request shape.
+
+    ``kwargs``, ``params`` and ``data`` are callables receiving the seeded
+    fixtures and the iteration number, so write endpoints can send unique
+    payloads on every call.
+    """
+    # Описание одного замеряемого запроса к эндпоинту
+
+    def __init__(self, method="get", user=None, kwargs=None, params=None, data=None):
+        self.method = method
+        self.user = user
+        self.kwargs = kwargs or (lambda fixtures, i: {})
+        self.params = params or (lambda fixtures, i: {})
+        self.data = data
+
+
+# Request shapes per URL name: {url_name: [(label, Endpoint), ...]}
+# Формы запросов для каждого имени URL
+ENDPOINTS = {
+    "schema": [("anonymous", Endpoint())],
+    "swagger-ui": [("anonymous", Endpoint())],
+    "register": [("tenant", Endpoint(method="post", data=lambda f, i: {
+        "email": f"bench-register-{i}@example.com", "first_name": "Bench",
+        "password": PASSWORD, "password2": PASSWORD, "role": "tenant",
+    }))],
+    "login": [("tenant", Endpoint(method="post", data=lambda f, i: {
+        "email": f["tenant"].email, "password": SEED_PASSWORD,
+    }))],
+    "token-refresh": [("tenant", Endpoint(method="post", data=lambda f, i: {"refresh": f["refresh"]}))],
+    "current-user": [("tenant", Endpoint(user="tenant"))],
+    "listing-list": [
+        ("feed", Endpoint()),
+        ("search", Endpoint(params=lambda f, i: {"search": f["search"]})),
+        ("city_price", Endpoint(params=lambda f, i: {"city": "münchen", "price_max": 2000})),
+        ("order_by_price", Endpoint(params=lambda f, i: {"ordering": "price"})),
+        ("available", Endpoint(params=lambda f, i: {"start_date": f["stay"][0], "end_date": f["stay"][1]})),
+    ],
+    "listing-detail": [
+        ("anonymous", Endpoint(kwargs=lambda f, i: {"pk": f["listing"].pk})),
+        ("tenant", Endpoint(user="tenant", kwargs=lambda f, i: {"pk": f["listing"].pk})),
+    ],
+    "popular-listings": [("all", Endpoint()), ("24h", Endpoint(params=lambda f, i: {"window": "24h"}))],
+    "listing-cities": [("prefix", Endpoint(params=lambda f, i: {"q": "mü"}))],
+    "booking-list": [("tenant", Endpoint(user="tenant")), ("landlord", Endpoint(user="landlord"))],
+    "booking-detail": [("tenant", Endpoint(user="tenant", kwargs=lambda f, i: {"pk": f["booking"].pk}))],
+    "review-list": [("anonymous", Endpoint(kwargs=lambda f, i: {"listing_id": f["listing"].pk}))],
+    "popular-search": [("tenant", Endpoint(user="tenant"))],
+}
+
+
+def iter_url_names(patterns=None, namespace=None):
+    """Yield the name of every named URL pattern in the project URLconf."""
+    # Перебирает имена всех именованных маршрутов проекта
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if (pattern.namespace or namespace) in SKIPPED_NAMESPACES:
+                continue
+            yield from iter_url_names(pattern.url_patterns, pattern.namespace or namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name
+
+
+def uncovered_url_names():
+    """Return URL names that have neither a benchmark spec nor a skip reason."""
+    # Возвращает имена маршрутов без описания замера и без причины пропуска
+    return sorted(
+        name for name in set(iter_url_names())
+        if name not in ENDPOINTS and name not in SKIPPED_ENDPOINTS
+    )
+
+
+def seed_benchmark_data(scale=1000, seed=0):
+    """Fill the database with the ``seed`` command (``scale`` listings); return request fixtures.
+
+    The benchmark reuses the regular seed, so it measures the same data
+    shape as a local demo database; one worker keeps it reproducible.
+    """
+    # Заполняет БД командой seed (scale объявлений) и возвращает фикстуры для запросов
+    call_command("seed", scale=scale, seed=seed, workers=1, stdout=StringIO())
+    booking = (
+        Booking.objects.filter(status="completed", review__isnull=False)
+        .select_related("listing__owner", "tenant")
+        .order_by("pk")
+        .first()
+    )
+    # Past the seed's upcoming stays (at most ~104 days ahead), so the filter finds free listings
+    # После будущих бронирований seed (не дальше ~104 дней), чтобы фильтр находил свободные объявления
+    stay_start = timezone.localdate() + timedelta(days=120)
+    return {
+        "tenant": booking.tenant,
+        "landlord": booking.listing.owner,
+        "listing": booking.listing,
+        "booking": booking,
+        "refresh": str(RoleRefreshToken.for_user(booking.tenant)),
+        "stay": (stay_start.isoformat(), (stay_start + timedelta(days=3)).isoformat()),
+        # A word of a real title, so the search matches whatever text the seed generated
+        # Слово из реального заголовка, чтобы поиск находил что-то при любом тексте seed
+        "search": max(tokenize(booking.listing.title), key=len),
+    }
+
+
+def percentile(samples, pct):
+    """Return the ``pct`` percentile (0-100) of the samples."""
+    # Возвращает перцентиль pct (0–100) выборки
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def count_rows(statements):
+    """Count the rows returned by recorded SELECT statements by re-running them as COUNT(*)."""
+    # Считает строки, возвращённые SELECT-запросами, повторно выполняя их как COUNT(*)
+    total = 0
+    with connection.cursor() as cursor:
+        for sql, params in statements:
+            cursor.execute(f"SELECT COUNT(*) FROM ({sql}) benchmark_rows", params)
+            total += cursor.fetchone()[0]
+    return total
+
+
+def clear_caches():
+    """Empty every configured cache (default, responses...)."""
+    # Очищает все настроенные кэши
+    for backend in caches.all(initialized_only=False):
+        backend.clear()
+
+
+def measure(client, fixtures, endpoint, url_name, iterations=20, warmup=2):
+    """Run one endpoint repeatedly and return its latency, query and row statistics.
+
+    Every iteration times two calls: a cold one after the response cache is
+    emptied, so cached endpoints still report the cost of the view itself
+    (``p50_ms``/``p95_ms``), and a warm one that may be a cache hit
+    (``warm_p50_ms``/``warm_p95_ms``). Queries and rows come from a separate
+    cold-cache call.
+    """
+    # Многократно вызывает эндпоинт и возвращает задержку (с пустым и прогретым кэшем ответов), число запросов и строк
+    user = fixtures[endpoint.user] if endpoint.user else None
+    client.force_authenticate(user=user)
+    clear_caches()
+    response_cache = caches[VERSION_CACHE_ALIAS]
+    counter = iter(range(10 ** 9))
+
+    def call():
+        i = next(counter)
+        url = reverse(url_name, kwargs=endpoint.kwargs(fixtures, i))
+        if endpoint.method == "get":
+            return client.get(url, endpoint.params(fixtures, i))
+        return getattr(client, endpoint.method)(url, endpoint.data(fixtures, i), format="json")
+
+    def timed_call():
+        started = time.perf_counter()
+        call()
+        return (time.perf_counter() - started) * 1000
+
+    for _ in range(warmup):
+        call()
+
+    timings, warm_timings = [], []
+    for _ in range(iterations):
+        response_cache.clear()
+        timings.append(timed_call())
+        warm_timings.append(timed_call())
+
+    # One more, instrumented, call with a cold cache for SQL statistics (kept out of the timings)
+    # Ещё один вызов с пустым кэшем и перехватом SQL — вне замеров времени
+    clear_caches()
+    statements = []
+
+    def record_select(execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith("SELECT"):
+            statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with CaptureQueriesContext(connection) as ctx, connection.execute_wrapper(record_select):
+        response = call()
+    client.force_authenticate(user=None)
+
+    return {
+        "status": response.status_code,
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "warm_p50_ms": round(percentile(warm_timings, 50), 2),
+        "warm_p95_ms": round(percentile(warm_timings, 95), 2),
+        "queries": len(ctx.captured_queries),
+        "rows": count_rows(statements),
+    }
+
+
+def run_benchmark(fixtures, iterations=20, warmup=2, only=None):
+    """Benchmark every configured endpoint; return ``{"url_name[label]": stats}``."""
+    # Замеряет все описанные эндпоинты; возвращает {"имя[метка]": статистика}
+    client = APIClient(raise_request_exception=False)
+    results = {}
+    for url_name, cases in ENDPOINTS.items():
+        for label, endpoint in cases:
+            key = f"{url_name}[{label}]"
+            if only and not any(part in key for part in only):
+                continue
+            results[key] = measure(client, fixtures, endpoint, url_name, iterations, warmup)
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=0.25):
+    """Return human-readable regressions of ``results`` against ``baseline``.
+
+    Only deterministic metrics are compared: a changed status code or any
+    extra SQL query is a regression, and rows read may grow by ``threshold``.
+    Latency depends on the machine and its load, see ``compare_latency()``.
+    """
+    # Возвращает список регрессий относительно базовых значений (только детерминированные метрики)
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if current["status"] != base["status"]:
+            regressions.append(f"{key}: status {base['status']} → {current['status']}")
+        if current["queries"] > base["queries"]:
+            regressions.append(f"{key}: queries {base['queries']} → {current['queries']}")
+        if current["rows"] > base["rows"] * (1 + threshold):
+            regressions.append(f"{key}: rows {base['rows']} → {current['rows']}")
+    return regressions
+
+
+def compare_latency(results, baseline, threshold=0.25, min_latency_delta_ms=1.0):
+    """Return latency changes beyond ``threshold`` against ``baseline``.
+
+    Cold latency is compared at p95, warm latency at p50; ``min_latency_delta_ms``
+    ignores noise on very fast endpoints. Wall-clock numbers are only
+    comparable with a baseline taken on the same machine, so callers report
+    these as warnings unless asked to fail on them.
+    """
+    # Возвращает изменения задержки сверх порога; сравнимы только с базовыми значениями той же машины
+    changes = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for field in ("p95_ms", "warm_p50_ms"):
+            if field not in base:
+                continue
+            latency_limit = max(base[field] * (1 + threshold), base[field] + min_latency_delta_ms)
+            if current[field] > latency_limit:
+                label = field.removesuffix("_ms").replace("_", " ")
+                changes.append(f"{key}: {label} {base[field]}ms → {current[field]}ms")
+    return changes
+
+
+def load_baseline(path):
+    """Return the stored baseline (``scale``, ``vendor``, ``results``), or None if there is none."""
+    # Возвращает сохранённые базовые значения или None, если файла нет
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_baseline(path, results, scale):
+    """Store results as the new baseline."""
+    # Сохраняет результаты как новые базовые значения
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(
+        {"scale": scale, "vendor": connection.vendor, "results": results},
+        indent=2, ensure_ascii=False, sort_keys=True,
+    ) + "\n")
@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.common.archive import archive_batch, archived_models
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит давно мягко удалённые строки (отзывы, бронирования, объявления) '
+        'в архивные таблицы пачками; all_objects по-прежнему их находит'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.SOFT_DELETE_ARCHIVE_AFTER_DAYS,
+            help='Переносить строки, удалённые больше указанного числа дней назад'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Размер пачки (одна транзакция)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        started = time.monotonic()
+        cutoff = timezone.now() - timedelta(days=options['days'])
+
+        total = 0
+        for model in archived_models():
+            moved = 0
+            while batch := archive_batch(model, cutoff, options['batch_size']):
+                moved += batch
+            total += moved
+            self.stdout.write(f'🗄️ {model._meta.label}: {moved} строк')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ В архив перенесено {total} строк ({time.monotonic() - started:.2f} с)')
+        )
@@ -0,0 +1,116 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from apps.history.recorders import search_query_aggregator, view_history_buffer
+from utils.benchmark import (
+    SKIPPED_ENDPOINTS, compare_latency, compare_to_baseline, load_baseline, run_benchmark, save_baseline,
+    seed_benchmark_data, uncovered_url_names,
+)
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'api_baseline.json'
+
+# History buffers flush synchronously so no worker thread outlives the test database
+# Буферы истории пишут синхронно, чтобы фоновый поток не пережил тестовую БД
+SYNC_BUFFER = {'BACKGROUND': False}
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку (p50/p95 с пустым и прогретым кэшем ответов), число SQL-запросов '
+        'и прочитанных строк для всех эндпоинтов API на отдельной тестовой БД и сравнивает с базовыми значениями'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1000, help='Количество объявлений в наборе данных')
+        parser.add_argument('--iterations', type=int, default=20, help='Замеров на эндпоинт')
+        parser.add_argument('--warmup', type=int, default=2, help='Прогревочных вызовов на эндпоинт')
+        parser.add_argument('--seed', type=int, default=0, help='Зерно генератора данных')
+        parser.add_argument(
+            '--only', action='append', default=[],
+            help='Замерять только эндпоинты, чьё имя содержит подстроку (можно повторять)'
+        )
+        parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Файл базовых значений (JSON)')
+        parser.add_argument('--update-baseline', action='store_true', help='Сохранить результаты как базовые')
+        parser.add_argument(
+            '--threshold', type=float, default=0.25,
+            help='Допустимый рост числа строк и задержки (0.25 = 25%%)'
+        )
+        parser.add_argument(
+            '--fail-on-latency', action='store_true',
+            help='Считать рост задержки регрессией (только с базовыми значениями, снятыми на этой же машине)'
+        )
+
+    def handle(self, *args, **options):
+        uncovered = uncovered_url_names()
+        if uncovered:
+            raise CommandError(
+                f'Нет описания замера для маршрутов: {", ".join(uncovered)}. '
+                f'Добавьте их в utils.benchmark.ENDPOINTS или SKIPPED_ENDPOINTS.'
+            )
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(VIEW_HISTORY_BUFFER=SYNC_BUFFER, SEARCH_QUERY_BUFFER=SYNC_BUFFER):
+                self.stdout.write(f'🌱 Заполнение тестовой БД ({options["scale"]} объявлений)...')
+                fixtures = seed_benchmark_data(options['scale'], options['seed'])
+                self.stdout.write('⏱️  Замеры...')
+                results = run_benchmark(
+                    fixtures, options['iterations'], options['warmup'], options['only']
+                )
+                view_history_buffer.drain()
+                search_query_aggregator.drain()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results)
+        for name, reason in SKIPPED_ENDPOINTS.items():
+            self.stdout.write(f'   ⏭️  {name}: {reason}')
+
+        baseline_path = options['baseline']
+        if options['update_baseline']:
+            save_baseline(baseline_path, results, options['scale'])
+            self.stdout.write(self.style.SUCCESS(f'\n💾 Базовые значения сохранены: {baseline_path}'))
+            return
+
+        baseline = load_baseline(baseline_path)
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(
+                f'\nФайл базовых значений {baseline_path} не найден — запустите с --update-baseline.'
+            ))
+            return
+        if baseline['scale'] != options['scale']:
+            raise CommandError(
+                f'Базовые значения сняты при --scale {baseline["scale"]}, а не {options["scale"]}.'
+            )
+
+        # Latency is wall-clock time: a warning unless the baseline comes from this machine
+        # Задержка зависит от машины: по умолчанию только предупреждение
+        latency = compare_latency(results, baseline['results'], options['threshold'])
+        for line in latency:
+            self.stdout.write(self.style.WARNING(f'   ⚠️  {line}'))
+
+        regressions = compare_to_baseline(results, baseline['results'], options['threshold'])
+        if options['fail_on_latency']:
+            regressions += latency
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(f'   ❌ {line}'))
+            raise CommandError(f'Найдено регрессий: {len(regressions)}.')
+        self.stdout.write(self.style.SUCCESS('\n✅ Регрессий относительно базовых значений нет.'))
+
+    def report(self, results):
+        self.stdout.write(
+            f'\n{"endpoint":<36}{"status":>7}{"p50 ms":>10}{"p95 ms":>10}{"warm p50":>10}{"queries":>9}{"rows":>9}'
+        )
+        for key, stats in results.items():
+            line = (
+                f'{key:<36}{stats["status"]:>7}{stats["p50_ms"]:>10.2f}{stats["p95_ms"]:>10.2f}'
+                f'{stats["warm_p50_ms"]:>10.2f}{stats["queries"]:>9}{stats["rows"]:>9}'
+            )
+            self.stdout.write(self.style.ERROR(line) if stats['status'] >= 400 else line)
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.bookings.availability import release_booked_nights
+from apps.bookings.models import Booking
+
+
+class Command(BaseCommand):
+    help = (
+        'Переводит подтверждённые бронирования с прошедшей датой выезда в статус «завершено» '
+        'пакетными UPDATE (без save() и сигналов); безопасно запускать повторно'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Бронирований в одном UPDATE')
+        parser.add_argument('--date', help='Завершить выезды раньше этой даты (ГГГГ-ММ-ДД), по умолчанию — сегодня')
+        parser.add_argument('--dry-run', action='store_true', help='Только посчитать, ничего не изменяя')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должен быть не меньше 1.')
+        today = timezone.now().date()
+        as_of = parse_date(options['date']) if options['date'] else today
+        if as_of is None:
+            raise CommandError('Неверный формат даты, используйте ГГГГ-ММ-ДД.')
+        # A future date would complete stays that are still in progress
+        # Дата в будущем завершила бы ещё не закончившиеся проживания
+        if as_of > today:
+            raise CommandError(f'Дата не может быть позже сегодняшней ({today}).')
+
+        # all_objects: soft-deleted bookings are completed too, so none stays "confirmed" forever
+        # all_objects: завершаем и мягко удалённые, чтобы ни одно не осталось «подтверждённым» навсегда
+        due = Booking.all_objects.filter(status='confirmed', end_date__lt=as_of)
+        if options['dry_run']:
+            self.stdout.write(f'🔎 К завершению: {due.count()} бронирований (выезд до {as_of})')
+            return
+
+        total = 0
+        started = time.monotonic()
+        while True:
+            with transaction.atomic():
+                ids = list(due.order_by('pk').values_list('pk', flat=True)[:options['chunk_size']])
+                if not ids:
+                    break
+                # Re-check the status in the UPDATE itself: a concurrent cancel wins
+                # Статус проверяется в самом UPDATE: параллельная отмена имеет приоритет
+                updated = due.filter(pk__in=ids).update(status='completed', updated_at=timezone.now())
+                # Past nights no longer matter for availability
+                # Прошедшие ночи больше не нужны для расчёта доступности
+                release_booked_nights(ids)
+            total += updated
+            self.stdout.write(f'   ✔️ {total} завершено...')
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Завершено бронирований: {total} за {elapsed:.2f} с ({rate:.0f} в секунду)'
+        ))
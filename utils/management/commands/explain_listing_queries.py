@@ -0,0 +1,116 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.listings.views import ListingListView, PopularListingsView
+
+# Query shapes produced by the listing endpoints: (name, view, query parameters)
+# Формы запросов эндпоинтов объявлений: (название, представление, параметры запроса)
+QUERY_SHAPES = [
+    ('feed', ListingListView, {}),
+    ('price_range', ListingListView, {'price_min': 500, 'price_max': 1500}),
+    ('rooms_range', ListingListView, {'rooms_min': 2, 'rooms_max': 4}),
+    ('housing_type', ListingListView, {'housing_type': 'apartment'}),
+    ('housing_type_price', ListingListView, {'housing_type': 'house', 'price_min': 1000}),
+    ('city_prefix', ListingListView, {'city': 'Frankfurt'}),
+    ('order_by_price', ListingListView, {'ordering': 'price'}),
+    ('order_by_rating', ListingListView, {'ordering': 'rating'}),
+    ('available', ListingListView, {'start_date': '2030-06-01', 'end_date': '2030-06-08'}),
+    ('popular', PopularListingsView, {}),
+]
+
+
+# Search constraint of an index access in a SQLite plan, e.g. "(price>? AND price<?)"
+# Условие поиска по индексу в плане SQLite, например "(price>? AND price<?)"
+SEARCH_CONSTRAINT = re.compile(r'\(.*[=<>]\?.*\)')
+
+
+def build_queryset(view_class, params):
+    """Build the queryset a view would run for an anonymous GET with the given params."""
+    # Строит queryset, который представление выполнит для анонимного GET с параметрами
+    request = Request(APIRequestFactory().get('/', params))
+    view = view_class()
+    view.setup(request)
+    view.format_kwarg = None
+    queryset = view.filter_queryset(view.get_queryset())
+    if queryset.query.is_sliced:
+        return queryset
+    return queryset[:api_settings.PAGE_SIZE]
+
+
+def find_sorts(plan, vendor):
+    """Return plan lines that sort the rows outside an index (filesort / TEMP B-TREE)."""
+    # Возвращает строки плана с сортировкой вне индекса (filesort / TEMP B-TREE)
+    if vendor == 'mysql':
+        return [line.strip() for line in plan.splitlines() if '"using_filesort": true' in line]
+    return [line.strip() for line in plan.splitlines() if 'USE TEMP B-TREE' in line]
+
+
+def find_full_scans(plan, vendor):
+    """Return plan lines that read a whole table or index instead of searching it.
+
+    On SQLite that is a plain ``SCAN``, and a ``SCAN ... USING INDEX`` without a search
+    constraint whose rows are sorted afterwards; the sort lines are returned with it.
+    An unconstrained index scan that already yields the ORDER BY is a walk cut short
+    by LIMIT and is fine.
+    """
+    # Возвращает строки плана, где таблица или индекс читаются целиком (вместе с их сортировкой)
+    if vendor == 'mysql':
+        return [line.strip() for line in plan.splitlines() if '"access_type": "ALL"' in line]
+    sorts = find_sorts(plan, vendor)
+    scans = []
+    for line in plan.splitlines():
+        line = line.strip()
+        if 'SCAN ' not in line or 'CONSTANT ROW' in line:
+            continue
+        if 'USING' not in line or (sorts and not SEARCH_CONSTRAINT.search(line)):
+            scans.append(line)
+    return scans + sorts if scans else []
+
+
+class Command(BaseCommand):
+    help = 'Выполняет EXPLAIN для запросов ленты объявлений и сообщает о полных сканированиях и сортировках'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Завершиться с ошибкой, если найдено полное сканирование таблицы'
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in ('sqlite', 'mysql'):
+            raise CommandError(f'Неподдерживаемая СУБД: {vendor}')
+
+        scans = {}
+        sorts = {}
+        for name, view_class, params in QUERY_SHAPES:
+            queryset = build_queryset(view_class, params)
+            plan = queryset.explain(format='json') if vendor == 'mysql' else queryset.explain()
+            full_scans = find_full_scans(plan, vendor)
+            plan_sorts = find_sorts(plan, vendor)
+            if full_scans:
+                marker = self.style.WARNING('⚠️ FULL SCAN')
+                scans[name] = full_scans
+            elif plan_sorts:
+                marker = self.style.WARNING('🔃 sort')
+                sorts[name] = plan_sorts
+            else:
+                marker = self.style.SUCCESS('✅ index')
+            self.stdout.write(f'\n{marker}  {name} {params}')
+            self.stdout.write(plan)
+
+        if sorts:
+            self.stdout.write(self.style.WARNING(
+                f'\nСортировка найденных по индексу строк вне индекса: {", ".join(sorts)}'
+            ))
+        if scans:
+            self.stdout.write(self.style.WARNING(f'\nПолные сканирования: {", ".join(scans)}'))
+            if options['fail_on_scan']:
+                raise CommandError('Найдены полные сканирования таблиц.')
+        else:
+            self.stdout.write(self.style.SUCCESS('\n✅ Все запросы используют индексы.'))
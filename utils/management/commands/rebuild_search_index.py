@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.listings.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс объявлений'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write(f'🔎 Перестроение индекса ({type(backend).__name__})...')
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS('✅ Поисковый индекс перестроен.'))
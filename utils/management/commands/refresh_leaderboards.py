@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.history.leaderboard import WINDOWS, refresh_leaderboard
+from apps.history.models import ListingViewCount
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает сохранённые в БД рейтинги популярных объявлений заранее, '
+        'чтобы запросы не считали их сами, и удаляет устаревшие почасовые счётчики'
+    )
+
+    def handle(self, *args, **options):
+        for window in WINDOWS:
+            ids = refresh_leaderboard(window)
+            self.stdout.write(f'🏆 {window}: {len(ids)} объявлений')
+
+        cutoff = timezone.now() - timedelta(days=settings.VIEW_COUNT_RETENTION_DAYS)
+        deleted, _ = ListingViewCount.objects.filter(hour__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'✅ Рейтинги обновлены, удалено старых счётчиков: {deleted}'))
@@ -1,145 +1,289 @@
+import multiprocessing
+import os
 import random
+import time
+from collections import Counter
 from datetime import timedelta
-from django.core.management.base import BaseCommand
-from django.utils import timezone
+from decimal import Decimal
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import Group
-from faker import Faker
+from django.db import connection, connections, transaction
+from django.utils import timezone
 from apps.users.models import User
 from apps.listings.models import Listing
-from apps.bookings.models import Booking
+from apps.listings.search import get_search_backend
+from apps.listings.utils import normalize_city
+from apps.bookings.availability import booking_nights
+from apps.bookings.models import BookedNight, Booking
 from apps.reviews.models import Review
-from apps.history.models import SearchQuery, ViewHistory
+from apps.reviews.ratings import recompute_listing_ratings
+from apps.history.models import ListingViewCount, ListingViewTotal, SearchQuery, SearchQueryCount, ViewHistory
+from utils.seeding import generate_chunk, iter_tasks
 
-# Немецкая локализация
-fake = Faker('de_DE')
+PASSWORD = 'securepassword123'
 
 
 class Command(BaseCommand):
-    help = 'Заполняет базу данных реалистичными данными по Германии'
+    help = (
+        'Заполняет базу данных реалистичными данными по Германии. '
+        'Строки вставляются пачками через bulk_create без валидации и сигналов, '
+        'тексты Faker генерируются в нескольких процессах.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, default=15,
+            help='Количество объявлений; пользователи, бронирования, отзывы и история растут пропорционально'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Seed генератора: одинаковый seed даёт одинаковые данные'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=min(4, os.cpu_count() or 1),
+            help='Количество процессов для генерации данных Faker'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=5000,
+            help='Размер пачки при генерации и вставке'
+        )
 
     def handle(self, *args, **options):
+        scale = options['scale']
+        if scale < 1:
+            raise CommandError('--scale должен быть положительным.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должен быть положительным.')
+        self.chunk_size = options['chunk_size']
+        self.seed = options['seed'] if options['seed'] is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.total_rows = 0
+        self.stdout.write(f'🎲 Seed: {self.seed}')
+
         self.stdout.write('🧹 Очистка старых данных...')
-        Review.objects.all().delete()
-        Booking.objects.all().delete()
-        Listing.objects.all().delete()
-        SearchQuery.objects.all().delete()
-        ViewHistory.objects.all().delete()
-        User.objects.all().delete()
-        Group.objects.all().delete()
-
-        # === Группы ===
-        self.stdout.write('👥 Создание групп...')
-        landlord_group, _ = Group.objects.get_or_create(name='Landlords')
-        tenant_group, _ = Group.objects.get_or_create(name='Tenants')
+        # flush also recreates the default groups through post_migrate
+        # flush заново создаёт группы по умолчанию через post_migrate
+        call_command('flush', interactive=False, verbosity=0)
+        cache.clear()
 
-        # === Пользователи ===
-        self.stdout.write('👤 Создание пользователей (Германия)...')
-        landlords = []
-        tenants = []
-
-        for _ in range(5):
-            user = User.objects.create_user(
-                email=fake.unique.email(),
-                first_name=fake.first_name(),
-                last_name=fake.last_name(),
-                password='securepassword123'
-            )
-            user.groups.add(landlord_group)
-            landlords.append(user)
-
-        for _ in range(12):
-            user = User.objects.create_user(
-                email=fake.unique.email(),
-                first_name=fake.first_name(),
-                last_name=fake.last_name(),
-                password='securepassword123'
+        self.pool = None
+        if options['workers'] > 1:
+            # Workers only generate text; the connection must not be shared with forked processes
+            # Воркеры только генерируют тексты; соединение с БД не должно наследоваться процессами
+            connections.close_all()
+            self.pool = multiprocessing.Pool(options['workers'])
+        started = time.monotonic()
+        try:
+            landlord_ids, tenant_ids = self.create_users(max(5, scale // 3), max(12, scale * 4 // 5))
+            listings = self.create_listings(scale, landlord_ids)
+            reviewable = self.create_bookings(listings, tenant_ids)
+            self.create_reviews(reviewable)
+            self.create_history(listings, tenant_ids)
+        finally:
+            if self.pool is not None:
+                self.pool.terminate()
+
+        self.stdout.write('🔎 Перестроение поискового индекса и рейтингов...')
+        recompute_listing_ratings()
+        get_search_backend().rebuild()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ База данных успешно заполнена данными по Германии!\n'
+                f'   👥 Арендодатели: {len(landlord_ids)}\n'
+                f'   👤 Арендаторы: {len(tenant_ids)}\n'
+                f'   🏠 Объявлений: {len(listings)}\n'
+                f'   📅 Бронирований: {Booking.objects.count()}\n'
+                f'   ⭐ Отзывов: {Review.objects.count()}\n'
+                f'   ⏱️ {self.total_rows} строк за {elapsed:.1f} с ({self.total_rows / elapsed:.0f} строк/с)\n'
+                f'   🔑 Пароль всех пользователей: {PASSWORD}'
             )
-            user.groups.add(tenant_group)
-            tenants.append(user)
+        )
+
+    def generate(self, kind, total):
+        """Yield generated chunks in order, in worker processes when available."""
+        # Возвращает сгенерированные пачки по порядку, в процессах-воркерах, если они есть
+        tasks = iter_tasks(kind, total, self.chunk_size, self.seed)
+        if self.pool is None:
+            return map(generate_chunk, tasks)
+        return self.pool.imap(generate_chunk, tasks)
+
+    def insert(self, model, objs):
+        """Bulk-insert one chunk in a transaction and return the new primary keys."""
+        # Вставляет пачку в одной транзакции и возвращает новые первичные ключи
+        if not objs:
+            return []
+        with transaction.atomic():
+            created = model.objects.bulk_create(objs)
+        self.total_rows += len(objs)
+        if connection.features.can_return_rows_from_bulk_insert:
+            return [obj.pk for obj in created]
+        # Without RETURNING the ids are read back; the seed is the only writer of a flushed database
+        # Без RETURNING id читаются обратно: seed — единственный, кто пишет в очищенную БД
+        return list(model._base_manager.order_by('-pk').values_list('pk', flat=True)[:len(objs)])[::-1]
 
-        # === Объявления ===
+    def insert_chunked(self, model, objs):
+        """Insert a prepared list of rows chunk by chunk."""
+        # Вставляет подготовленный список строк пачками
+        for start in range(0, len(objs), self.chunk_size):
+            self.insert(model, objs[start:start + self.chunk_size])
+        return len(objs)
+
+    def report(self, label, rows, started):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(f'   {label}: {rows} строк за {elapsed:.1f} с ({rows / elapsed:.0f} строк/с)')
+
+    # === Пользователи ===
+    def create_users(self, landlord_count, tenant_count):
+        self.stdout.write('👤 Создание пользователей (Германия)...')
+        started = time.monotonic()
+        password = make_password(PASSWORD)
+        user_ids = []
+        for chunk in self.generate('users', landlord_count + tenant_count):
+            user_ids += self.insert(User, [
+                User(email=email.lower(), first_name=first_name, last_name=last_name, password=password)
+                for first_name, last_name, email in chunk
+            ])
+        landlord_ids, tenant_ids = user_ids[:landlord_count], user_ids[landlord_count:]
+
+        landlord_group, _ = Group.objects.get_or_create(name='Landlords')
+        tenant_group, _ = Group.objects.get_or_create(name='Tenants')
+        Membership = User.groups.through
+        memberships = (
+            [Membership(user_id=pk, group_id=landlord_group.pk) for pk in landlord_ids]
+            + [Membership(user_id=pk, group_id=tenant_group.pk) for pk in tenant_ids]
+        )
+        self.insert_chunked(Membership, memberships)
+        self.report('Пользователи и группы', len(user_ids) + len(memberships), started)
+        return landlord_ids, tenant_ids
+
+    # === Объявления ===
+    def create_listings(self, count, landlord_ids):
+        """Insert listings and return ``(id, price)`` pairs."""
         self.stdout.write('🏠 Создание объявлений (Германия)...')
+        started = time.monotonic()
         listings = []
-        HOUSING_TYPES = ['apartment', 'house', 'studio']
-        GERMAN_CITIES = [
-            'Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt am Main',
-            'Stuttgart', 'Düsseldorf', 'Leipzig', 'Dortmund', 'Essen'
-        ]
-
-        for landlord in landlords:
-            for _ in range(random.randint(2, 4)):
-                listing = Listing.objects.create(
-                    title=fake.sentence(nb_words=4)[:-1],
-                    description=fake.text(max_nb_chars=300),
-                    city=random.choice(GERMAN_CITIES),
-                    street=fake.street_address(),
-                    postal_code=fake.postcode(),
-                    price=round(random.uniform(600, 3500), 2),  # €/месяц
-                    rooms=random.randint(1, 4),
-                    housing_type=random.choice(HOUSING_TYPES),
+        for chunk in self.generate('listings', count):
+            objs = [
+                Listing(
+                    title=title,
+                    description=description,
+                    city=city,
+                    city_key=normalize_city(city),
+                    street=street,
+                    postal_code=postal_code,
+                    price=Decimal(str(price)),
+                    rooms=rooms,
+                    housing_type=housing_type,
                     is_active=True,
-                    owner=landlord
+                    owner_id=self.rng.choice(landlord_ids),
                 )
-                listings.append(listing)
+                for title, description, city, street, postal_code, price, rooms, housing_type in chunk
+            ]
+            listings += zip(self.insert(Listing, objs), (obj.price for obj in objs))
+        self.report('Объявления', len(listings), started)
+        return listings
 
-        # === Бронирования ===
-        self.stdout.write('📅 Создание бронирований (с временем заезда/выезда)...')
-        bookings = []
+    # === Бронирования ===
+    def create_bookings(self, listings, tenant_ids):
+        """Insert past and upcoming bookings; return ``(booking_id, rating)`` pairs to review."""
+        self.stdout.write('📅 Создание бронирований (с календарём занятых ночей)...')
+        started = time.monotonic()
+        rows = 0
         today = timezone.now().date()
+        reviewable = []
+        for start in range(0, len(listings), self.chunk_size):
+            bookings = []
+            for listing_id, price in listings[start:start + self.chunk_size]:
+                # Past stays go back in time one after another, so they never overlap
+                # Прошлые проживания идут назад во времени одно за другим и не пересекаются
+                end_date = today - timedelta(days=self.rng.randint(1, 30))
+                for _ in range(self.rng.randint(1, 3)):
+                    nights = self.rng.randint(3, 21)
+                    bookings.append(Booking(
+                        listing_id=listing_id, tenant_id=self.rng.choice(tenant_ids),
+                        start_date=end_date - timedelta(days=nights), end_date=end_date,
+                        total_price=price * nights, status='completed',
+                    ))
+                    end_date -= timedelta(days=nights + self.rng.randint(0, 30))
+                if self.rng.random() < 0.3:
+                    stay_start = today + timedelta(days=self.rng.randint(1, 90))
+                    nights = self.rng.randint(2, 14)
+                    bookings.append(Booking(
+                        listing_id=listing_id, tenant_id=self.rng.choice(tenant_ids),
+                        start_date=stay_start, end_date=stay_start + timedelta(days=nights),
+                        total_price=price * nights, status=self.rng.choice(['pending', 'confirmed']),
+                    ))
+            ids = self.insert(Booking, bookings)
+            rows += len(ids)
 
-        for tenant in tenants:
-            num_bookings = random.randint(1, 3)
-            sampled_listings = random.sample(listings, k=min(num_bookings, len(listings)))
-            for listing in sampled_listings:
-                # Для сиида временно разрешаем прошлые даты
-                start_date = today - timedelta(days=random.randint(1, 60))
-                nights = random.randint(3, 21)
-                end_date = start_date + timedelta(days=nights)
-
-                booking = Booking(
-                    listing=listing,
-                    tenant=tenant,
-                    start_date=start_date,
-                    end_date=end_date,
-                    status='completed'
-                )
-                booking.save(skip_past_check=True)  # обходим проверку
-                bookings.append(booking)
+            nights = []
+            for booking_id, booking in zip(ids, bookings):
+                if booking.status == 'completed':
+                    if self.rng.random() < 0.6:
+                        reviewable.append((booking_id, self.rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 2, 4, 6])[0]))
+                else:
+                    nights += [
+                        BookedNight(listing_id=booking.listing_id, night=night, booking_id=booking_id)
+                        for night in booking_nights(booking.start_date, booking.end_date)
+                    ]
+            self.insert(BookedNight, nights)
+            rows += len(nights)
+        self.report('Бронирования и занятые ночи', rows, started)
+        return reviewable
 
-        # === Отзывы ===
+    # === Отзывы ===
+    def create_reviews(self, reviewable):
         self.stdout.write('⭐ Создание отзывов...')
-        reviewable_bookings = [b for b in bookings if b.status in ['confirmed', 'completed']]
-        for booking in random.sample(reviewable_bookings, k=min(18, len(reviewable_bookings))):
-            Review(
-                booking=booking,
-                rating=random.randint(4, 5),
-                comment=fake.text(max_nb_chars=220)
-            ).save(skip_booking_check=True)
-
-        # === История ===
+        started = time.monotonic()
+        offset = 0
+        for comments in self.generate('comments', len(reviewable)):
+            self.insert(Review, [
+                Review(booking_id=booking_id, rating=rating, comment=comment)
+                for (booking_id, rating), comment in zip(reviewable[offset:offset + len(comments)], comments)
+            ])
+            offset += len(comments)
+        self.report('Отзывы', len(reviewable), started)
+
+    # === История ===
+    def create_history(self, listings, tenant_ids):
         self.stdout.write('🔍 Создание истории поиска и просмотров...')
-        for tenant in tenants:
-            # Поисковые запросы на немецком
-            for _ in range(random.randint(4, 7)):
-                SearchQuery.objects.create(
-                    user=tenant,
-                    query=fake.word().lower()
-                )
-            # Просмотры
-            for listing in random.sample(listings, k=min(6, len(listings))):
-                ViewHistory.objects.create(
-                    user=tenant,
-                    listing=listing
-                )
+        started = time.monotonic()
+        rows = 0
+        words = [word for chunk in self.generate('words', 500) for word in chunk]
+        listing_ids = [listing_id for listing_id, _ in listings]
+        view_counts = Counter()
+        query_counts = Counter()
+        for start in range(0, len(tenant_ids), self.chunk_size):
+            searches, views = [], []
+            for tenant_id in tenant_ids[start:start + self.chunk_size]:
+                # Поисковые запросы на немецком
+                for word in self.rng.choices(words, k=self.rng.randint(4, 7)):
+                    searches.append(SearchQuery(user_id=tenant_id, query=word))
+                    query_counts[word] += 1
+                # Просмотры
+                for listing_id in self.rng.sample(listing_ids, k=min(6, len(listing_ids))):
+                    views.append(ViewHistory(user_id=tenant_id, listing_id=listing_id))
+                    view_counts[listing_id] += 1
+            self.insert(SearchQuery, searches)
+            self.insert(ViewHistory, views)
+            rows += len(searches) + len(views)
 
-        self.stdout.write(
-            self.style.SUCCESS(
-                f'\n✅ База данных успешно заполнена данными по Германии!\n'
-                f'   👥 Арендодатели: {len(landlords)}\n'
-                f'   👤 Арендаторы: {len(tenants)}\n'
-                f'   🏠 Объявлений: {len(listings)}\n'
-                f'   📅 Бронирований: {len(bookings)}\n'
-                f'   ⭐ Отзывов: {Review.objects.count()}\n'
-                f'   💡 Все бронирования имеют время заезда (14:00) и выезда (12:00) по умолчанию.'
-            )
-        )
\ No newline at end of file
+        # Counters behind popular listings and searches, matching the raw history
+        # Счётчики популярных объявлений и запросов, согласованные с историей
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        today = timezone.localdate()
+        rows += self.insert_chunked(
+            ListingViewTotal, [ListingViewTotal(listing_id=pk, count=count) for pk, count in view_counts.items()]
+        )
+        rows += self.insert_chunked(
+            ListingViewCount, [ListingViewCount(listing_id=pk, hour=hour, count=count) for pk, count in view_counts.items()]
+        )
+        rows += self.insert_chunked(
+            SearchQueryCount, [SearchQueryCount(query=query, day=today, count=count) for query, count in query_counts.items()]
+        )
+        self.report('История и счётчики', rows, started)
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.common.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пачками через одно SMTP-соединение с повторными попытками'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Писем за одно соединение')
+        parser.add_argument('--max-attempts', type=int, default=5, help='Попыток до пометки письма как неотправленного')
+        parser.add_argument('--loop', action='store_true', help='Работать постоянно, проверяя очередь')
+        parser.add_argument('--interval', type=float, default=5.0, help='Пауза между проверками пустой очереди (сек)')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        started = time.monotonic()
+        while True:
+            try:
+                sent, failed = deliver_batch(options['batch_size'], options['max_attempts'])
+            except Exception as e:
+                # Mail server unreachable: claimed emails return to the queue when their lease expires
+                # Почтовый сервер недоступен: захваченные письма вернутся в очередь по истечении аренды
+                self.stderr.write(self.style.ERROR(f'❌ Ошибка отправки пачки: {e}'))
+                if not options['loop']:
+                    raise
+                time.sleep(options['interval'])
+                continue
+
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f'📧 Отправлено: {sent}, с ошибкой: {failed}')
+            elif options['loop']:
+                time.sleep(options['interval'])
+            else:
+                break
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Готово: отправлено {total_sent}, с ошибкой {total_failed} за {elapsed:.1f} с'
+        ))
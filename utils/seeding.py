@@ -0,0 +1,86 @@
+import random
+
+from faker import Faker
+
+# Faker text generation for the seed command. Runs in worker processes,
+# so this module must not import Django models.
+# Генерация текстов Faker для команды seed; выполняется в процессах-воркерах, без импорта моделей Django
+
+HOUSING_TYPES = ['apartment', 'house', 'studio']
+GERMAN_CITIES = [
+    'Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt am Main',
+    'Stuttgart', 'Düsseldorf', 'Leipzig', 'Dortmund', 'Essen'
+]
+
+_fake = None
+
+
+def get_fake():
+    """Return this process's Faker instance (created once per worker)."""
+    # Возвращает экземпляр Faker текущего процесса (один на воркер)
+    global _fake
+    if _fake is None:
+        _fake = Faker('de_DE')
+    return _fake
+
+
+def chunk_seed(seed, kind, chunk_no):
+    """Derive the seed of one chunk, so output does not depend on the number of workers."""
+    # Вычисляет seed отдельной пачки: результат не зависит от числа воркеров
+    return f'{seed}:{kind}:{chunk_no}'
+
+
+def generate_users(fake, rng, start, count):
+    return [
+        (fake.first_name(), fake.last_name(), f'{fake.user_name()}.{start + i}@{fake.free_email_domain()}')
+        for i in range(count)
+    ]
+
+
+def generate_listings(fake, rng, start, count):
+    return [
+        (
+            fake.sentence(nb_words=4)[:-1],
+            fake.text(max_nb_chars=300),
+            rng.choice(GERMAN_CITIES),
+            fake.street_address(),
+            fake.postcode(),
+            round(rng.uniform(600, 3500), 2),  # €/месяц
+            rng.randint(1, 4),
+            rng.choice(HOUSING_TYPES),
+        )
+        for _ in range(count)
+    ]
+
+
+def generate_comments(fake, rng, start, count):
+    return [fake.text(max_nb_chars=220) for _ in range(count)]
+
+
+def generate_words(fake, rng, start, count):
+    return [fake.word().lower() for _ in range(count)]
+
+
+GENERATORS = {
+    'users': generate_users,
+    'listings': generate_listings,
+    'comments': generate_comments,
+    'words': generate_words,
+}
+
+
+def generate_chunk(task):
+    """Generate one chunk of rows; ``task`` is ``(kind, chunk_no, start, count, seed)``."""
+    # Генерирует одну пачку строк; task = (вид, номер пачки, начало, количество, seed)
+    kind, chunk_no, start, count, seed = task
+    fake = get_fake()
+    fake.seed_instance(chunk_seed(seed, kind, chunk_no))
+    rng = random.Random(chunk_seed(seed, kind, chunk_no))
+    return GENERATORS[kind](fake, rng, start, count)
+
+
+def iter_tasks(kind, total, chunk_size, seed):
+    """Split ``total`` rows of ``kind`` into generation tasks."""
+    # Делит total строк вида kind на задачи генерации
+    for chunk_no, start in enumerate(range(0, total, chunk_size)):
+        yield kind, chunk_no, start, min(chunk_size, total - start), seed
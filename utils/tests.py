@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.bookings.models import BookedNight, Booking
+from apps.listings.models import Listing
+from apps.reviews.models import Review
+from apps.users.models import User
+
+from utils.benchmark import compare_latency, compare_to_baseline, run_benchmark, seed_benchmark_data, uncovered_url_names
+
+SYNC_BUFFER = {"BACKGROUND": False}
+
+
+@override_settings(VIEW_HISTORY_BUFFER=SYNC_BUFFER, SEARCH_QUERY_BUFFER=SYNC_BUFFER)
+class BenchmarkTests(TestCase):
+    def test_every_url_is_benchmarked_or_skipped(self):
+        self.assertEqual(uncovered_url_names(), [])
+
+    def test_run_benchmark_collects_stats(self):
+        fixtures = seed_benchmark_data(scale=20)
+        results = run_benchmark(fixtures, iterations=1, warmup=0, only=["listing-list[feed]", "booking-list"])
+        self.assertEqual(
+            set(results), {"listing-list[feed]", "booking-list[tenant]", "booking-list[landlord]"}
+        )
+        feed = results["listing-list[feed]"]
+        self.assertEqual(feed["status"], 200)
+        self.assertGreater(feed["queries"], 0)
+        self.assertGreater(feed["rows"], 0)
+        self.assertLessEqual(feed["p50_ms"], feed["p95_ms"])
+        self.assertLessEqual(feed["warm_p50_ms"], feed["warm_p95_ms"])
+
+    def test_compare_to_baseline_gates_deterministic_metrics_only(self):
+        base = {"status": 200, "p50_ms": 5.0, "p95_ms": 10.0, "warm_p50_ms": 1.0, "queries": 2, "rows": 20}
+        slower = dict(base, p95_ms=50.0, warm_p50_ms=5.0)
+        self.assertEqual(compare_to_baseline({"x": slower}, {"x": base}), [])
+        self.assertEqual(len(compare_latency({"x": slower}, {"x": base})), 2)
+        regressions = compare_to_baseline(
+            {"x": dict(base, queries=3, rows=30), "new": base}, {"x": base}
+        )
+        self.assertEqual(len(regressions), 2)
+
+
+class SeedCommandTests(TestCase):
+    def seed(self, **options):
+        call_command('seed', scale=30, seed=5, chunk_size=7, stdout=StringIO(), **options)
+        return list(Listing.objects.order_by('pk').values_list('title', 'city', 'price', 'owner__email'))
+
+    def test_seed_is_reproducible_across_worker_counts(self):
+        single = self.seed(workers=1)
+        self.assertEqual(len(single), 30)
+        self.assertEqual(self.seed(workers=2), single)
+
+    def test_seed_builds_consistent_dataset(self):
+        self.seed(workers=1)
+        self.assertTrue(User.objects.filter(groups__name='Landlords').exists())
+        self.assertTrue(Review.objects.exists())
+        upcoming = Booking.objects.exclude(status='completed')
+        self.assertEqual(
+            BookedNight.objects.count(), sum((b.end_date - b.start_date).days for b in upcoming)
+        )
+        listing = Listing.objects.filter(review_count__gt=0).first()
+        self.assertEqual(listing.review_count, Review.objects.filter(booking__listing=listing).count())